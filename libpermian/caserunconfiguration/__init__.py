@@ -1,5 +1,8 @@
 import logging
-from functools import lru_cache
+import threading
+import weakref
+from types import MappingProxyType
+from collections import Counter
 from hashlib import sha1
 import os
 import shutil
@@ -24,34 +27,122 @@ class CaseRunConfiguration():
     :param testplans: List of testplan ids for which the case-run-configuration executed.
     :type testplans: list
     """
+    __slots__ = ('testrun', 'testcase', 'configuration', '_running_for', 'workflow', '_lists', '_result', 'readOnly', 'logs', '_id')
+
+    _runningForVersion = 0
+    """Counter of changes of testplans in running_for of any instance, used to invalidate testplan grouping in CaseRunConfigurationsList"""
+
     def __init__(self, testcase, configuration, testplans):
+        self._result = None
         self.testrun = None
         self.testcase = testcase
         """TestCase handled by this run"""
         self.configuration = configuration
         """Configuration of the TestCase"""
-        self.running_for = { testplan.id : True for testplan in testplans }
-        """Mapping of plans for which this configuration shoud be executed"""
+        self._running_for = { testplan.id : True for testplan in testplans }
         self.workflow = None
         """Workflow instance handling execution of this configuration"""
+        self._lists = None
+        """Collections which count results of this instance, see ResultsHistogram"""
         self.result = Result('not started')
-        """TODO"""
         self.readOnly = False
         """If set to true, the object is meant to be used as read-only copy and some methods which have side effects are forbidden and raise exception."""
         self.logs = dict()
         """Paths or URLs to logs associated to the caseRunConfiguration with specific names"""
+        self._id = None
 
     @property
-    @lru_cache(maxsize=None)
     def id(self):
         """ Return string ID made from hash """
-        return sha1(f'{self.testcase.id}:{sorted(self.configuration.items())}'.encode()).hexdigest()
+        if self._id is None:
+            self._id = sha1(f'{self.testcase.id}:{sorted(self.configuration.items())}'.encode()).hexdigest()
+        return self._id
 
-    def copy(self):
-        caserun = CaseRunConfiguration(self.testcase, self.configuration, [])
+    @property
+    def running_for(self):
+        """
+        Mapping of plans for which this configuration shoud be executed.
+
+        The mapping should not be changed in place, assign new mapping instead
+        so that the change of testplans is noticed by the lists grouping
+        caseRunConfigurations by testplans.
+        """
+        return self._running_for
+
+    @running_for.setter
+    def running_for(self, running_for):
+        if running_for.keys() != self._running_for.keys():
+            CaseRunConfiguration._runningForVersion += 1
+        self._running_for = running_for
+
+    @property
+    def result(self):
+        """Result of this caseRunConfiguration"""
+        return self._result
+
+    @result.setter
+    def result(self, result):
+        if self._result is not None:
+            self._result.setOwner(None)
+        result.setOwner(self)
+        self._result = result
+        self._resultChanged()
+
+    def _resultChanged(self):
+        """
+        Called by the result when any of its summary fields changes. Notify
+        CaseRunConfigurationsLists counting the results about the change.
+        """
+        if not self._lists:
+            return
+        for crcListRef in list(self._lists.values()):
+            crcList = crcListRef()
+            if crcList is not None:
+                crcList._resultChanged(self)
+
+    def _addList(self, crcList):
+        # lists are not hashable, so WeakSet can't be used, keep weak
+        # references under id of the list instead
+        if self._lists is None:
+            self._lists = {}
+        key = id(crcList)
+        if key not in self._lists:
+            lists = self._lists
+            self._lists[key] = weakref.ref(crcList, lambda ref: lists.pop(key, None))
+
+    def _removeList(self, crcList):
+        if self._lists is not None:
+            self._lists.pop(id(crcList), None)
+
+    def detachLists(self):
+        """
+        Stop notifying CaseRunConfigurationsLists counting the results about
+        changes of the result. This is used in forked workflow process where
+        the lists (and their locks) are shared with threads of the parent
+        process.
+        """
+        self._lists = None
+
+    def _clone(self):
+        """
+        Create new instance of the same testcase and configuration sharing
+        testplans, workflow and testrun with this instance. Result and logs
+        are not set.
+        """
+        caserun = CaseRunConfiguration.__new__(CaseRunConfiguration)
         caserun.testrun = self.testrun
-        caserun.running_for = self.running_for
+        caserun.testcase = self.testcase
+        caserun.configuration = self.configuration
+        caserun._id = self._id
+        caserun._running_for = self._running_for
         caserun.workflow = self.workflow
+        caserun._lists = None
+        caserun._result = None
+        caserun.readOnly = False
+        return caserun
+
+    def copy(self):
+        caserun = self._clone()
         caserun.result = self.result.copy()
         # logs are on purpose shared
         caserun.logs = self.logs
@@ -62,14 +153,14 @@ class CaseRunConfiguration():
         Provide read-only copy of this instance. This is meant to be used when
         one copy is provided to multiple destinations and the destinations
         should not have ability to change state of the shared instance.
+
+        The copy holds immutable snapshot of the result and logs, so the
+        destinations can share the snapshots by reference instead of copying
+        them.
         """
-        caserun = CaseRunConfiguration(self.testcase, self.configuration, [])
-        caserun.testrun = self.testrun
-        caserun.running_for = self.running_for
-        caserun.workflow = self.workflow
-        caserun.result = self.result.copy()
-        # logs are on purpose shared
-        caserun.logs = self.logs
+        caserun = self._clone()
+        caserun.result = self.result.snapshot()
+        caserun.logs = MappingProxyType(dict(self.logs))
         caserun.readOnly = True
         return caserun
 
@@ -166,22 +257,30 @@ class CaseRunConfiguration():
             raise LocalLogExistsError(self.id, name, self.logs[name], logfile)
         self.logs[name] = logfile
 
-    def openLogfile(self, name, mode="r", autoadd=False, filename=None):
+    def logPath(self, name, filename=None):
         """
-        Create (if doesn't exist) and open a logfile of given name related to
-        the crcId. If autoadd is true, add the computed log path (from workflows
-        settings and optional filename argument) to the related crcId.
-
-        Raise RemoteLogError if the crc already has remote log assigned.
+        Path or URL of log of given name related to the crcId. If the log is
+        not associated to the crc yet, provide path to which the log would be
+        stored by openLogfile.
         """
         try:
-            log_path = self.logs[name]
+            return self.logs[name]
         except KeyError:
-            log_path = os.path.join(
+            return os.path.join(
                 self.testrun.settings.get('workflows', 'local_logs_dir'),
                 self.id,
                 filename or name
             )
+
+    def openLogfile(self, name, mode="r", autoadd=False, filename=None):
+        """
+        Create (if doesn't exist) and open a logfile of given name related to
+        the crcId. If autoadd is true, add the computed log path (from workflows
+        settings and optional filename argument) to the related crcId.
+
+        Raise RemoteLogError if the crc already has remote log assigned.
+        """
+        log_path = self.logPath(name, filename)
         if log_path.startswith('file://'):
             log_path = log_path[7:] # trim the file://
         elif URL_RE.match(log_path):
@@ -212,6 +311,8 @@ class CaseRunConfiguration():
             raise ValueError("Cannot merge different CaseRunConfigurations")
         if self.readOnly:
             raise ReadOnlyChangeError(f'Cannot change state of read-only result: {self}')
+        if not other.running_for.keys() <= self.running_for.keys():
+            CaseRunConfiguration._runningForVersion += 1
         self.running_for.update(other.running_for)
         return self
 
@@ -240,14 +341,206 @@ class CaseRunConfiguration():
     def __repr__(self):
         return f"<CaseRunConfiguration({self.testcase.name}:{self.configuration})>"
 
+class ResultsHistogram():
+    """
+    Counts of states, results, final and dirty results of a collection of
+    caseRunConfigurations. The counts are updated whenever result of any of the
+    counted caseRunConfigurations changes so that aggregated status and result
+    of the collection can be provided without scanning all the
+    caseRunConfigurations.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._crcs = {}
+        """Mapping id(crc) -> [order, crc, summary of the counted result]"""
+        self.states = Counter()
+        self.results = Counter()
+        self.final = 0
+        self._dirty = {}
+
+    def add(self, crc):
+        with self._lock:
+            if id(crc) in self._crcs:
+                return
+            summary = crc.result.summary
+            self._crcs[id(crc)] = [len(self._crcs), crc, summary]
+            self._count(crc, summary, 1)
+
+    def refresh(self, crc):
+        """
+        Update the counts based on the current result of the crc.
+        """
+        with self._lock:
+            try:
+                record = self._crcs[id(crc)]
+            except KeyError:
+                return
+            summary = crc.result.summary
+            if summary == record[2]:
+                return
+            self._count(crc, record[2], -1)
+            self._count(crc, summary, 1)
+            record[2] = summary
+
+    def _count(self, crc, summary, change):
+        state, result, final, dirty = summary
+        self.states[state] += change
+        self.results[result] += change
+        if final:
+            self.final += change
+        if dirty:
+            if change > 0:
+                self._dirty[id(crc)] = crc
+            else:
+                del self._dirty[id(crc)]
+
+    @property
+    def crcs(self):
+        return [crc for _, crc, _ in self._crcs.values()]
+
+    @property
+    def total(self):
+        return len(self._crcs)
+
+    @property
+    def dirty(self):
+        """Counted caseRunConfigurations with dirty result in order they were added"""
+        with self._lock:
+            return sorted(self._dirty.values(), key=lambda crc: self._crcs[id(crc)][0])
+
+    @property
+    def dirtyCount(self):
+        return len(self._dirty)
+
 class CaseRunConfigurationsList(list):
-    """ Special list object with modified behaviour of append method for use with CaseRunConfigurations """
+    """
+    Special list object with modified behaviour of append method for use with
+    CaseRunConfigurations.
+
+    The list keeps hash index of the stored items (by the item itself and by
+    the CaseRunConfiguration id) so that append with merge, membership test
+    and lookup by crcId don't need to scan the whole list. The index is kept
+    up to date by all the list methods changing content of the list.
+
+    Groupings provided by the by_testcase, by_workflowType, by_configuration
+    and by_testplan methods are built on the first call and then maintained
+    when new items are appended, so the lists of the groups are shared between
+    calls and should not be modified by the callers.
+
+    Similarly, the aggregated status and result properties are served from
+    ResultsHistogram built on the first use and updated when results of the
+    caseRunConfigurations change.
+    """
+    _histogramLock = threading.Lock()
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self._reindex()
+
+    def _reindex(self):
+        """
+        Rebuild the hash indexes from scratch. If the list contains the same
+        item multiple times, the first occurrence is the indexed one.
+        """
+        self._items = {}
+        self._ids = {}
+        self._groupings = {}
+        self._testplansVersion = CaseRunConfiguration._runningForVersion
+        histogram = getattr(self, '_histogram', None)
+        if histogram is not None:
+            for crc in histogram.crcs:
+                crc._removeList(self)
+        self._histogram = None
+        for item in self:
+            self._index(item)
+
+    def _index(self, item):
+        try:
+            self._items.setdefault(item, item)
+        except TypeError:
+            pass # unhashable item can't be indexed, it's found by linear scan
+        if isinstance(item, CaseRunConfiguration):
+            self._ids.setdefault(item.id, item)
+
+    def _find(self, item):
+        """
+        Provide the item of this list equal to the provided one.
+
+        :raises KeyError: when there's no such item
+        """
+        try:
+            return self._items[item]
+        except TypeError:
+            # unhashable item (e.g. configuration with list value)
+            for existing in self:
+                if existing == item:
+                    return existing
+            raise KeyError(item) from None
+
     def append(self, other_caserun):
         # If CaseRunConfiguration already created add current testplan to its running_for
-        if other_caserun in self:
-            self[self.index(other_caserun)] += other_caserun
-        else:
+        try:
+            caserun = self._find(other_caserun)
+        except KeyError:
             super().append(other_caserun)
+            self._index(other_caserun)
+            for keys_func, groups in self._groupings.values():
+                self._addToGroups(groups, keys_func, other_caserun)
+            if self._histogram is not None:
+                self._count(self._histogram, other_caserun)
+            return
+        merged = caserun
+        merged += other_caserun
+        if merged is not caserun:
+            # the item doesn't support in-place merge (e.g. immutable values)
+            self[self.index(caserun)] = merged
+
+    def extend(self, iterable):
+        super().extend(iterable)
+        self._reindex()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        # order of items in groups and in the histogram would not match
+        self._reindex()
+
+    def remove(self, item):
+        super().remove(item)
+        self._reindex()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._reindex()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._reindex()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+    def __iadd__(self, other):
+        super().__iadd__(other)
+        self._reindex()
+        return self
+
+    def __contains__(self, item):
+        try:
+            return item in self._items
+        except TypeError:
+            # unhashable item can't be in the index
+            return super().__contains__(item)
+
+    def __reduce_ex__(self, protocol):
+        # rebuild the list (and its index) using the constructor instead of
+        # the default list reconstruction calling append on the items
+        return (type(self), (list(self),))
 
     def copy(self):
         """
@@ -274,46 +567,130 @@ class CaseRunConfigurationsList(list):
                 result[key] = CaseRunConfigurationsList([crc])
         return result
 
+    def _grouped(self, grouping, keys_func):
+        """
+        Group caseRunConfigurations into groups identified by keys provided by
+        keys_func. The groups are built on the first use under the grouping
+        name and then kept up to date when new items are appended.
+
+        :param grouping: Name under which the groups are maintained.
+        :type grouping: hashable
+        :param keys_func: Function returning keys of all groups the caseRunConfiguration belongs to.
+        :type keys_func: callable
+        :return:
+        :rtype dict:
+        """
+        return dict(self._groups(grouping, keys_func))
+
+    def _groups(self, grouping, keys_func):
+        """
+        Provide the maintained groups of _grouped without copying them, the
+        mapping must not be modified by the caller.
+        """
+        try:
+            _, groups = self._groupings[grouping]
+        except KeyError:
+            groups = {}
+            for crc in self:
+                self._addToGroups(groups, keys_func, crc)
+            self._groupings[grouping] = (keys_func, groups)
+        return groups
+
+    @staticmethod
+    def _addToGroups(groups, keys_func, crc):
+        for key in keys_func(crc):
+            try:
+                groups[key].append(crc)
+            except KeyError:
+                groups[key] = CaseRunConfigurationsList([crc])
+
+    @staticmethod
+    def _testcaseKeys(crc):
+        return (crc.testcase.id,)
+
     def by_testcase(self):
-        return self.by_key(lambda crc: crc.testcase.id)
+        return self._grouped('testcase', self._testcaseKeys)
+
+    def group_for_testcase(self, testcase_id):
+        """
+        Provide group of by_testcase for single testcase without copying the
+        whole grouping.
+
+        :param testcase_id: Id of the testcase
+        :type testcase_id: str
+        :raises KeyError: When there's no caseRunConfiguration of the testcase
+        :rtype: CaseRunConfigurationsList
+        """
+        return self._groups('testcase', self._testcaseKeys)[testcase_id]
 
     def by_workflowType(self):
-        return self.by_key(lambda crc: crc.testcase.execution.type)
+        return self._grouped(
+            'workflowType',
+            lambda crc: (crc.testcase.execution.type,)
+        )
 
     def by_configuration(self, *keys):
-        return self.by_key(
-            lambda crc: tuple([crc.configuration.get(key) for key in keys])
+        return self._grouped(
+            ('configuration', keys),
+            lambda crc: (tuple([crc.configuration.get(key) for key in keys]),)
         )
 
     def by_testplan(self):
-        result = {}
-        for crc in self:
-            for testplan in crc.running_for:
-                try:
-                    result[testplan].append(crc)
-                except KeyError:
-                    result[testplan] = CaseRunConfigurationsList([crc])
-        return result
+        # testplans of the caseRunConfigurations may change after the grouping
+        # was built, rebuild it in such case
+        if self._testplansVersion != CaseRunConfiguration._runningForVersion:
+            self._groupings.pop('testplan', None)
+            self._testplansVersion = CaseRunConfiguration._runningForVersion
+        return self._grouped(
+            'testplan',
+            lambda crc: crc.running_for
+        )
+
+    @property
+    def histogram(self):
+        """
+        ResultsHistogram of the caseRunConfigurations in this list. The
+        histogram is made on the first access and then updated on changes of
+        the results or the list.
+        """
+        with self._histogramLock:
+            if self._histogram is None:
+                histogram = ResultsHistogram()
+                for crc in self:
+                    self._count(histogram, crc)
+                self._histogram = histogram
+            return self._histogram
+
+    def _count(self, histogram, crc):
+        # register first so that no change is missed while counting
+        crc._addList(self)
+        histogram.add(crc)
+
+    def _resultChanged(self, crc):
+        histogram = self._histogram
+        if histogram is not None:
+            histogram.refresh(crc)
 
     @property
     def status(self):
         """Return lowest state present in the caseRunConfigurations"""
-        states = { state:i for i, state in enumerate(STATES) }
-        return list(STATES)[min([states[crc.result.state] for crc in self])]
+        states = self.histogram.states
+        return list(STATES)[min([i for i, state in enumerate(STATES) if states[state] > 0])]
 
     @property
     def result(self):
         """Return highest result present in the caseRunConfigurations"""
-        results = { result:i for i, result in enumerate(RESULTS) }
-        return list(RESULTS)[max([results[crc.result.result] for crc in self])]
+        results = self.histogram.results
+        return list(RESULTS)[max([i for i, result in enumerate(RESULTS) if results[result] > 0])]
 
     @property
     def hasDirtyResult(self):
-        return any([crc.result.dirty for crc in self])
+        return self.histogram.dirtyCount > 0
 
     @property
     def allResultsFinal(self):
-        return all([crc.result.final for crc in self])
+        histogram = self.histogram
+        return histogram.final == histogram.total
 
     @property
     def ids(self):
@@ -321,19 +698,19 @@ class CaseRunConfigurationsList(list):
 
     @property
     def withDirtyResult(self):
-        try:
-            return self.by_key(lambda crc: crc.result.dirty)[True]
-        except KeyError:
+        histogram = self.histogram
+        if not histogram.dirtyCount:
             return CaseRunConfigurationsList([])
+        return CaseRunConfigurationsList(histogram.dirty)
 
     def __getitem__(self, index):
         if isinstance(index, int):
             return super().__getitem__(index)
         crcId = index
-        for crc in self:
-            if crc.id == crcId:
-                return crc
-        raise KeyError(f'No caseRunConfiguration of id "{crcId}" found.')
+        try:
+            return self._ids[crcId]
+        except KeyError:
+            raise KeyError(f'No caseRunConfiguration of id "{crcId}" found.') from None
 
 
 class ConfigurationDictHybrid(dict):
@@ -366,10 +743,121 @@ class ConfigurationDictStrict(dict):
         """
         return self == other
 
+class StrictConfigurationsIndex():
+    """
+    Index of configurations by their key-value pairs used to find
+    configurations equal to given configuration without comparing it to all
+    the configurations.
+
+    :param configurations: Indexed configurations
+    :type configurations: list of dicts
+    """
+    def __init__(self, configurations):
+        self.configurations = configurations
+        self._positions = {}
+        # positions of configurations with unhashable values
+        self._unindexed = []
+        for position, config in enumerate(configurations):
+            try:
+                self._positions.setdefault(frozenset(config.items()), []).append(position)
+            except TypeError:
+                self._unindexed.append(position)
+
+    def compatible(self, other):
+        """
+        :param other: Configuration to be compared with the indexed configurations
+        :type other: dict
+        :return: Positions of configurations equal to other in ascending order
+        :rtype: list of int
+        """
+        try:
+            positions = self._positions.get(frozenset(other.items()), [])
+        except TypeError:
+            positions = []
+        if self._unindexed:
+            positions = sorted(positions + [
+                position for position in self._unindexed
+                if self.configurations[position] == other
+            ])
+        return positions
+
+class HybridConfigurationsIndex():
+    """
+    Index of configurations by their keys and values used to find
+    configurations which have the same values for all keys shared with given
+    configuration without comparing it to all the configurations.
+
+    For each key, the index holds bit masks of positions of configurations
+    having the key with specific value and of configurations without the key.
+    The compatible configurations are then found by intersecting the masks
+    for the keys of the other configuration.
+
+    :param configurations: Indexed configurations
+    :type configurations: list of dicts
+    """
+    def __init__(self, configurations):
+        self.configurations = configurations
+        self._all = (1 << len(configurations)) - 1
+        self._present = {}
+        self._byValue = {}
+        # masks of configurations with unhashable value of the key
+        self._unindexed = {}
+        for position, config in enumerate(configurations):
+            bit = 1 << position
+            for key, value in config.items():
+                self._present[key] = self._present.get(key, 0) | bit
+                byValue = self._byValue.setdefault(key, {})
+                try:
+                    byValue[value] = byValue.get(value, 0) | bit
+                except TypeError:
+                    self._unindexed[key] = self._unindexed.get(key, 0) | bit
+        self._missing = { key:self._all ^ present for key, present in self._present.items() }
+
+    def _matching(self, key, value):
+        """Mask of configurations having the key with the value"""
+        try:
+            matching = self._byValue[key].get(value, 0)
+            candidates = self._unindexed.get(key, 0)
+        except TypeError:
+            # unhashable value, it has to be compared to all the values
+            matching = 0
+            candidates = self._present[key]
+        for position in self._positions(candidates):
+            if self.configurations[position][key] == value:
+                matching |= 1 << position
+        return matching
+
+    def compatible(self, other):
+        """
+        :param other: Configuration to be compared with the indexed configurations
+        :type other: dict
+        :return: Positions of configurations compatible with other in ascending order
+        :rtype: list of int
+        """
+        candidates = self._all
+        for key, value in other.items():
+            if key not in self._present:
+                continue
+            candidates &= self._missing[key] | self._matching(key, value)
+            if not candidates:
+                break
+        return list(self._positions(candidates))
+
+    @staticmethod
+    def _positions(mask):
+        while mask:
+            lowest = mask & -mask
+            yield lowest.bit_length() - 1
+            mask ^= lowest
+
 class ConfigurationsList(list):
     def __init__(self, clist, merge_method):
         """ List of configurations used for testplan that then extends and/or limits testcase configurations during merge
 
+        The configurations are indexed when the list is created so that merge
+        compares only compatible configurations, the list is not meant to be
+        changed afterwards.
+
         :param clist: (Testplan) Configurations
         :type clist: list of dicts, None
         :param merge_method: name of merge method - determines the type of configurations
@@ -381,17 +869,24 @@ class ConfigurationsList(list):
         # Conver configurations to particular ConfigurationDict based on merge_method
         if merge_method == 'intersection':
             clist = [ ConfigurationDictStrict(item) for item in clist ]
+            index_class = StrictConfigurationsIndex
         elif merge_method == 'extension':
             clist = [ ConfigurationDictHybrid(item) for item in clist ]
+            index_class = HybridConfigurationsIndex
         else:
             raise UnknownTestConfigurationMergeMethod(merge_method)
         super().__init__(clist)
+        self._index = index_class(clist)
 
     def merge(self, other):
         """ Merges self configurations and other configurations
         If self configurations is empty, the other configurations are returned
         If other configurations is empty, empty dict is added
 
+        Only configurations found compatible by the index are merged and the
+        merged configurations are ordered the same way as if each of self
+        configurations was compared with each of other configurations.
+
         :param testcase: Testcase
         :type testcase: tplib.TestCase
         :param testplan: Testplan
@@ -399,7 +894,6 @@ class ConfigurationsList(list):
         :return: Configurations
         :rtype: list of dicts
         """
-        configs = []
         # Handle no other configurations
         if other == None:
             other = [{}]
@@ -407,12 +901,15 @@ class ConfigurationsList(list):
         if self == []:
             return other
         # Perform merge
-        for self_config in self:
-            for other_config in other:
-                if self_config.compatible_with(other_config):
-                    configs.append(self_config.merge(other_config))
-
-        return configs
+        other = list(other)
+        pairs = []
+        for other_position, other_config in enumerate(other):
+            for self_position in self._index.compatible(other_config):
+                # order the pairs by self position first
+                pairs.append(self_position * len(other) + other_position)
+        pairs.sort()
+
+        return [ self[pair // len(other)].merge(other[pair % len(other)]) for pair in pairs ]
 
 def merge_testcase_configurations(caseRunConfigurations):
     """ Converts list of CaseRunConfiguration objects into a dict with testcase name as key
@@ -2,9 +2,9 @@ import unittest
 import tempfile
 import os
 
-from . import CaseRunConfiguration, CaseRunConfigurationsList, merge_testcase_configurations
-from ..result import Result
-from ..exceptions import LocalLogExistsError, RemoteLogError
+from . import CaseRunConfiguration, CaseRunConfigurationsList, ConfigurationsList, merge_testcase_configurations
+from ..result import Result, ResultSnapshot
+from ..exceptions import LocalLogExistsError, RemoteLogError, ReadOnlyChangeError, UnknownTestConfigurationMergeMethod
 
 
 class DummyTestCase():
@@ -115,6 +115,38 @@ class TestCaseRunConfigurationLogs(unittest.TestCase):
         self.assertEqual(exception.name, 'url_log')
         self.assertEqual(exception.log_path, url)
 
+class TestCaseRunConfigurationCopies(unittest.TestCase):
+    def setUp(self):
+        self.crc = CaseRunConfiguration(DummyTestCase('testcase1'), {'conf': 1}, [DummyTestPlan('A')])
+        self.crc.updateResult(Result('running', 'PASS', foo='bar'))
+        self.crc.logs['log'] = '/tmp/log'
+
+    def test_readOnlyCopy_snapshot(self):
+        copy = self.crc.readOnlyCopy()
+        self.assertTrue(copy.readOnly)
+        self.assertEqual(copy.id, self.crc.id)
+        self.assertIsInstance(copy.result, ResultSnapshot)
+        self.assertEqual(copy.result, self.crc.result)
+        self.assertEqual(copy.result.version, self.crc.result.version)
+        with self.assertRaises(ReadOnlyChangeError):
+            copy.updateResult(Result('complete', 'PASS', True))
+
+    def test_readOnlyCopy_keeps_state(self):
+        copy = self.crc.readOnlyCopy()
+        self.crc.updateResult(Result('complete', 'FAIL', True))
+        self.crc.logs['other'] = '/tmp/other'
+        self.assertEqual(copy.result.state, 'running')
+        self.assertEqual(copy.result.result, 'PASS')
+        self.assertEqual(copy.logs, {'log': '/tmp/log'})
+
+    def test_copy_is_mutable(self):
+        copy = self.crc.copy()
+        copy.updateResult(Result('complete', 'FAIL', True))
+        self.assertEqual(self.crc.result.state, 'running')
+        self.assertEqual(copy.result.extra_fields, {'foo': 'bar'})
+        # logs are shared with the copy
+        self.assertIs(copy.logs, self.crc.logs)
+
 class TestCaseRunConfigurationsList(unittest.TestCase):
     def setUp(self):
         planA = DummyTestPlan('A')
@@ -146,6 +178,56 @@ class TestCaseRunConfigurationsList(unittest.TestCase):
         caserun_configurations.append(3)
         self.assertListEqual(caserun_configurations, [2, 3])
 
+    def test_append_merge(self):
+        planA = DummyTestPlan('A')
+        planB = DummyTestPlan('B')
+        testcase = DummyTestCase('testcase1')
+        crcA = CaseRunConfiguration(testcase, {'conf': 1}, [planA])
+        crcB = CaseRunConfiguration(testcase, {'conf': 1}, [planB])
+        crcList = CaseRunConfigurationsList()
+        crcList.append(crcA)
+        crcList.append(crcB)
+        self.assertEqual(len(crcList), 1)
+        self.assertIs(crcList[0], crcA)
+        self.assertEqual(crcA.running_for, {'A': True, 'B': True})
+        self.assertIn(crcB, crcList)
+
+    def test_append_unhashable(self):
+        planA = DummyTestPlan('A')
+        planB = DummyTestPlan('B')
+        testcase = DummyTestCase('testcase1')
+        crcA = CaseRunConfiguration(testcase, {'conf': [1, 2]}, [planA])
+        crcB = CaseRunConfiguration(testcase, {'conf': [1, 2]}, [planB])
+        crcC = CaseRunConfiguration(testcase, {'conf': [3]}, [planB])
+        crcList = CaseRunConfigurationsList([crcA])
+        crcList.append(crcB)
+        crcList.append(crcC)
+        self.assertEqual(len(crcList), 2)
+        self.assertIs(crcList[0], crcA)
+        self.assertEqual(crcA.running_for, {'A': True, 'B': True})
+        self.assertIn(crcB, crcList)
+        self.assertIs(crcList[crcC.id], crcC)
+
+    def test_getitem_by_id(self):
+        for crc in self.crcList:
+            self.assertIs(self.crcList[crc.id], crc)
+        with self.assertRaises(KeyError):
+            self.crcList['nonexisting']
+
+    def test_index_follows_changes(self):
+        self.crcList.remove(self.crc12)
+        self.assertNotIn(self.crc12, self.crcList)
+        with self.assertRaises(KeyError):
+            self.crcList[self.crc12.id]
+        self.crcList.insert(0, self.crc12)
+        self.assertIs(self.crcList[self.crc12.id], self.crc12)
+        del self.crcList[0]
+        self.assertNotIn(self.crc12, self.crcList)
+        self.crcList += [self.crc12]
+        self.assertIs(self.crcList[self.crc12.id], self.crc12)
+        self.crcList.clear()
+        self.assertNotIn(self.crc11, self.crcList)
+
     def test_by_testcase(self):
         self.assertEqual(
             self.crcList.by_testcase(),
@@ -155,6 +237,23 @@ class TestCaseRunConfigurationsList(unittest.TestCase):
             },
         )
 
+    def test_group_for_testcase(self):
+        self.assertIs(self.crcList.group_for_testcase('testcase1'), self.crcList.by_testcase()['testcase1'])
+        with self.assertRaises(KeyError):
+            self.crcList.group_for_testcase('nonexisting')
+        crc31 = CaseRunConfiguration(DummyTestCase('testcase3'), {'conf': 1, 'a': 1}, [DummyTestPlan('A')])
+        self.crcList.append(crc31)
+        self.assertEqual(self.crcList.group_for_testcase('testcase3'), CaseRunConfigurationsList([crc31]))
+
+    def test_insert_resets_groupings_and_histogram(self):
+        self.crcList.remove(self.crc12)
+        self.assertEqual(self.crcList.histogram.total, 3)
+        self.assertEqual(self.crcList.group_for_testcase('testcase1'), CaseRunConfigurationsList([self.crc11]))
+        self.crcList.insert(0, self.crc12)
+        self.assertEqual(self.crcList.group_for_testcase('testcase1'), CaseRunConfigurationsList([self.crc12, self.crc11]))
+        self.assertEqual(self.crcList.histogram.total, 4)
+        self.assertEqual(self.crcList.histogram.crcs[0], self.crc12)
+
     def test_by_workflowType(self):
         self.assertEqual(
             self.crcList.by_workflowType(),
@@ -198,6 +297,44 @@ class TestCaseRunConfigurationsList(unittest.TestCase):
             },
         )
 
+    def test_groupings_follow_append(self):
+        by_testplan = self.crcList.by_testplan()
+        by_testcase = self.crcList.by_testcase()
+        # groups are maintained and not rebuilt on subsequent calls
+        self.assertIs(self.crcList.by_testplan()['A'], by_testplan['A'])
+        self.assertIs(self.crcList.by_testcase()['testcase1'], by_testcase['testcase1'])
+        crc31 = CaseRunConfiguration(DummyTestCase('testcase3'), {'conf': 1, 'a': 1}, [DummyTestPlan('A')])
+        self.crcList.append(crc31)
+        self.assertEqual(
+            self.crcList.by_testplan()['A'],
+            CaseRunConfigurationsList([self.crc11, self.crc12, crc31]),
+        )
+        self.assertEqual(
+            self.crcList.by_testcase()['testcase3'],
+            CaseRunConfigurationsList([crc31]),
+        )
+        self.assertEqual(
+            self.crcList.by_configuration('a')[(1,)],
+            CaseRunConfigurationsList([self.crc21, self.crc23, crc31]),
+        )
+
+    def test_by_testplan_follows_running_for(self):
+        self.assertNotIn('C', self.crcList.by_testplan())
+        self.crc11 += CaseRunConfiguration(self.crc11.testcase, self.crc11.configuration, [DummyTestPlan('C')])
+        self.assertEqual(
+            self.crcList.by_testplan()['C'],
+            CaseRunConfigurationsList([self.crc11]),
+        )
+        self.crc21.running_for = {'C': True}
+        self.assertEqual(
+            self.crcList.by_testplan(),
+            {
+                'A' : CaseRunConfigurationsList([self.crc11, self.crc12]),
+                'B' : CaseRunConfigurationsList([self.crc12, self.crc23]),
+                'C' : CaseRunConfigurationsList([self.crc11, self.crc21]),
+            },
+        )
+
     def test_combined(self):
         self.assertEqual(
             {
@@ -306,6 +443,32 @@ class TestCaseRunConfigurationsList(unittest.TestCase):
             ]),
         )
 
+    def test_histogram_follows_results(self):
+        self.assertEqual(self.crcList.status, 'running')
+        self.assertEqual(self.crcList.result, 'ERROR')
+        self.crc11.updateResult(Result('complete', 'PASS', True))
+        self.assertEqual(self.crcList.status, 'complete')
+        self.assertEqual(self.crcList.histogram.final, 1)
+        self.crc23.result = Result('DNF', None, True, dirty=False)
+        self.assertEqual(self.crcList.result, 'FAIL')
+        self.assertEqual(self.crcList.histogram.final, 2)
+        self.assertEqual(
+            self.crcList.withDirtyResult,
+            CaseRunConfigurationsList([self.crc11, self.crc12, self.crc21]),
+        )
+        # the groups count results on their own
+        self.assertEqual(self.crcList.by_testcase()['testcase2'].result, None)
+        self.crc21.updateResult(Result('DNF', 'ERROR', True))
+        self.assertEqual(self.crcList.by_testcase()['testcase2'].result, 'ERROR')
+        self.assertTrue(self.crcList.by_testcase()['testcase2'].allResultsFinal)
+        self.assertFalse(self.crcList.allResultsFinal)
+        # removed crc is not counted anymore
+        self.crcList.remove(self.crc12)
+        self.crc11.result.dirty = False
+        self.crc21.result.dirty = False
+        self.assertFalse(self.crcList.hasDirtyResult)
+        self.assertTrue(self.crcList.allResultsFinal)
+
 class TestMerge_testcase_configurations(unittest.TestCase):
     def setUp(self):
         self.caseRunConfigurations = [CaseRunConfiguration(DummyTestCase('testcase1'), {'conf': 1}, []),
@@ -336,3 +499,80 @@ class TestMerge_testcase_configurations(unittest.TestCase):
         self.assertEqual(len(testcases['testcase2']['caseRunConfigurations']), 2)
         self.assertEqual(testcases['testcase2']['caseRunConfigurations'][0].configuration['conf'], 3)
         self.assertEqual(testcases['testcase2']['caseRunConfigurations'][1].configuration['conf'], 4)
+
+class TestConfigurationsList(unittest.TestCase):
+    def setUp(self):
+        self.testplan_configurations = [
+            {'arch': 'x86_64', 'variant': 'BaseOS'},
+            {'arch': 'aarch64', 'variant': 'BaseOS'},
+            {'arch': 'x86_64', 'variant': 'AppStream'},
+            {'arch': 'x86_64'},
+        ]
+
+    @staticmethod
+    def nested_merge(configurations, other):
+        """Reference merge comparing each pair of configurations"""
+        return [
+            config.merge(other_config)
+            for config in configurations
+            for other_config in other
+            if config.compatible_with(other_config)
+        ]
+
+    def test_merge_extension(self):
+        configurations = ConfigurationsList(self.testplan_configurations, 'extension')
+        testcase_configurations = [
+            {'arch': 'x86_64'},
+            {'variant': 'BaseOS', 'storage': 'lvm'},
+            {'arch': 's390x'},
+            {},
+        ]
+        merged = configurations.merge(testcase_configurations)
+        self.assertEqual(merged, self.nested_merge(configurations, testcase_configurations))
+        self.assertEqual(merged[:4], [
+            {'arch': 'x86_64', 'variant': 'BaseOS'},
+            {'arch': 'x86_64', 'variant': 'BaseOS', 'storage': 'lvm'},
+            {'arch': 'x86_64', 'variant': 'BaseOS'},
+            {'arch': 'aarch64', 'variant': 'BaseOS', 'storage': 'lvm'},
+        ])
+
+    def test_merge_intersection(self):
+        configurations = ConfigurationsList(self.testplan_configurations, 'intersection')
+        testcase_configurations = [
+            {'arch': 'x86_64'},
+            {'variant': 'BaseOS', 'arch': 'aarch64'},
+            {'arch': 's390x'},
+        ]
+        merged = configurations.merge(testcase_configurations)
+        self.assertEqual(merged, [
+            {'arch': 'aarch64', 'variant': 'BaseOS'},
+            {'arch': 'x86_64'},
+        ])
+        self.assertIs(merged[1], testcase_configurations[0])
+
+    def test_merge_unhashable(self):
+        for merge_method in ('extension', 'intersection'):
+            with self.subTest(merge_method=merge_method):
+                configurations = ConfigurationsList(
+                    self.testplan_configurations + [{'arch': 'x86_64', 'disks': ['vda', 'vdb']}],
+                    merge_method
+                )
+                testcase_configurations = [
+                    {'arch': 'x86_64', 'disks': ['vda', 'vdb']},
+                    {'disks': ['vda']},
+                    {'arch': 'x86_64'},
+                ]
+                self.assertEqual(
+                    configurations.merge(testcase_configurations),
+                    self.nested_merge(configurations, testcase_configurations)
+                )
+
+    def test_merge_empty(self):
+        configurations = ConfigurationsList(self.testplan_configurations, 'extension')
+        self.assertEqual(configurations.merge(None), self.testplan_configurations)
+        testcase_configurations = [{'arch': 'x86_64'}]
+        self.assertIs(ConfigurationsList(None, 'extension').merge(testcase_configurations), testcase_configurations)
+
+    def test_unknown_merge_method(self):
+        with self.assertRaises(UnknownTestConfigurationMergeMethod):
+            ConfigurationsList(self.testplan_configurations, 'union')
@@ -31,6 +31,9 @@ class Event():
         for structure_name, fields in event_structures.items():
             self.structures[structure_name] = EventStructuresFactory.make(settings, structure_name, fields)
         self.structures_convert_lock = threading.RLock()
+        self._structure_locks = {}
+        self._failed_conversions = {}
+        """Mapping of structure name -> names of structures it couldn't be converted from"""
         self.id = sha256(f'{self.type}-{json.dumps(event_structures, sort_keys=True)}'.encode()).hexdigest()
 
     def format_branch_spec(self, fmt):
@@ -78,6 +81,19 @@ class Event():
         """
         return library.getTestPlansByQuery('event.handles_testplan_artifact_type(tp.artifact_type) and tp.eval_execute_on(event=event)', event=self)
 
+    @property
+    def prefetch_structures(self):
+        """
+        Names of structures which the pipeline resolves (converts when needed)
+        and prefetches (see BaseStructure.prefetch) concurrently before the
+        testplans are filtered. Event should list the structures used by the
+        testplan filters and workflows it's handled by.
+
+        :return: names of structures, provided structures by default
+        :rtype: tuple
+        """
+        return tuple(self.structures)
+
     @property
     def additional_testplans_data(self):
         """ Event can provide additional testplans. Returns python
@@ -111,19 +127,35 @@ class Event():
     def __getattr__(self, attrname):
         if attrname not in EventStructuresFactory.known():
             return super().__getattribute__(attrname)
+        try:
+            return self.structures[attrname]
+        except KeyError:
+            pass
+        # structures_convert_lock guards only creation of the per-structure
+        # locks so that conversions of different structures don't block
+        # each other
         with self.structures_convert_lock:
+            lock = self._structure_locks.setdefault(attrname, threading.RLock())
+        with lock:
             try:
                 return self.structures[attrname]
             except KeyError:
                 pass
-            structure = EventStructuresFactory.convert(attrname, self.structures)
+            available = frozenset(self.structures)
+            if self._failed_conversions.get(attrname) == available:
+                return None
+            structure = EventStructuresFactory.convert(
+                attrname,
+                self.structures,
+                store=self.structures.setdefault,
+            )
             if structure is NotImplemented:
                 # Return None if the requested structure is not compatible to
                 # allow jinja templates to not crash on expressions like
                 # event.nonexisting_structure.foo but to consider them as None
+                self._failed_conversions[attrname] = available
                 return None
-            self.structures[attrname] = structure
-            return structure
+            return self.structures.setdefault(attrname, structure)
 
 def payload_override(payload_name):
     def decorator(method):
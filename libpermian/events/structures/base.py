@@ -1,3 +1,14 @@
 class BaseStructure():
     def __init__(self, settings):
         self.settings = settings
+
+    def prefetch(self):
+        """
+        Load remote data of the structure (e.g. metadata fetched over the
+        network on first access) in advance. The pipeline calls this method
+        for structures listed in Event.prefetch_structures from a thread pool
+        before the testplans are filtered so that the data are not fetched
+        serially later. Failures are logged by the pipeline and ignored, the
+        data are loaded again when they're accessed.
+        """
+        pass
@@ -1,5 +1,17 @@
+import collections
+import threading
+
 from ...exceptions import UnknownStructure
 
+MAX_CONVERSION_HOPS = 4
+"""Maximal number of conversions used to create a structure from available ones"""
+
+Conversion = collections.namedtuple('Conversion', ['source', 'target', 'method'])
+"""
+Edge of the conversion graph, method is either "from" (target class has
+from_<source> classmethod) or "to" (source has to_<target> method).
+"""
+
 class EventStructuresFactory():
     """
     The EventStructuresFactory provides mechanisms for registering event
@@ -60,6 +72,13 @@ class EventStructuresFactory():
         }
     """
     STRUCTURE_TYPES = {}
+    _graph = None
+    """Mapping of structure name -> conversions creating the structure, built from STRUCTURE_TYPES"""
+    _graph_types = None
+    """Copy of STRUCTURE_TYPES the graph was built for"""
+    _paths = {}
+    """Mapping of (desired structure, available structures) -> conversion paths"""
+    _graph_lock = threading.Lock()
 
     @classmethod
     def register(cls, structure_type, structure_class=None):
@@ -123,7 +142,7 @@ class EventStructuresFactory():
             raise UnknownStructure(name)
 
     @classmethod
-    def convert(cls, desired_structure, available_structures):
+    def convert(cls, desired_structure, available_structures, store=None):
         """
         Try to create a new structure registered under `desired_structure` name
         using other structures provided in `available_structures`.
@@ -152,6 +171,13 @@ class EventStructuresFactory():
         obtained value is returned. If no `to_*` succeds, `NotImplemented` is
         returned signalling the conversion was not sucessful.
 
+        If the desired structure cannot be created directly, intermediate
+        structures are created on the way, e.g. "car" can be created from
+        "toy" via "model" if there's `Model.from_toy` and `Car.from_model`.
+        The possible conversions are found in the conversion graph (see
+        :py:method:`EventStructuresFactory.conversion_graph`) which is built
+        only once instead of probing the classes on every conversion.
+
         Note that individual classes are responsible for passing the settings
         from one to each other.
 
@@ -159,28 +185,114 @@ class EventStructuresFactory():
         :type desired_structure: str
         :param available_structures: Dict with keys containing structure name and values being the structure instances which are currently available and can be used for the conversion.
         :type available_structures: dict
+        :param store: Callable called with name and instance of each intermediate structure created during the conversion.
+        :type store: callable, optional
         :return: Instance of the class registered under `desired_structure` name or NotImplemented if conversion was not successful.
         :rtype: object or NotImplemented
         """
-        structure_class = cls.get_class(desired_structure)
-        # try to generate the structure using structure_class.from_* method
-        for structure_name, structure in available_structures.items():
-            try:
-                conversion_method = getattr(structure_class, f'from_{structure_name}')
-            except AttributeError:
-                continue
-            structure = conversion_method(structure)
-            if structure is NotImplemented:
-                continue
-            return structure
-        # try to generate the structure using structure.to_* method
-        for structure_name, structure in available_structures.items():
-            try:
-                conversion_method = getattr(structure, f'to_{desired_structure}')
-            except AttributeError:
-                continue
-            structure = conversion_method()
-            if structure is NotImplemented:
-                continue
-            return structure
+        cls.get_class(desired_structure)
+        available_structures = dict(available_structures)
+        failed = set()
+        for path in cls.conversion_paths(desired_structure, available_structures.keys()):
+            structure = available_structures[path[0].source]
+            for conversion in path:
+                if conversion.target in available_structures:
+                    structure = available_structures[conversion.target]
+                    continue
+                if conversion in failed:
+                    break
+                structure = cls._apply_conversion(conversion, structure)
+                if structure is NotImplemented:
+                    failed.add(conversion)
+                    break
+                available_structures[conversion.target] = structure
+                if conversion.target != desired_structure and store is not None:
+                    store(conversion.target, structure)
+            else:
+                return structure
         return NotImplemented
+
+    @classmethod
+    def _apply_conversion(cls, conversion, structure):
+        if conversion.method == 'from':
+            return getattr(cls.get_class(conversion.target), f'from_{conversion.source}')(structure)
+        try:
+            conversion_method = getattr(structure, f'to_{conversion.target}')
+        except AttributeError:
+            return NotImplemented
+        return conversion_method()
+
+    @classmethod
+    def conversion_graph(cls):
+        """
+        Provide graph of possible conversions between the registered
+        structures based on the `from_*` classmethods and `to_*` methods of
+        the registered classes. The graph is built once and rebuilt only
+        when the registered structures change.
+
+        :return: Mapping of structure name -> list of Conversions creating the structure
+        :rtype: dict
+        """
+        with cls._graph_lock:
+            if cls._graph is not None and cls._graph_types == cls.STRUCTURE_TYPES:
+                return cls._graph
+            graph = {}
+            for target, target_class in cls.STRUCTURE_TYPES.items():
+                conversions = graph[target] = []
+                # from_* conversions are preferred over to_* conversions
+                for source in cls.STRUCTURE_TYPES:
+                    if source != target and hasattr(target_class, f'from_{source}'):
+                        conversions.append(Conversion(source, target, 'from'))
+                for source, source_class in cls.STRUCTURE_TYPES.items():
+                    if source != target and hasattr(source_class, f'to_{target}'):
+                        conversions.append(Conversion(source, target, 'to'))
+            cls._graph = graph
+            cls._graph_types = dict(cls.STRUCTURE_TYPES)
+            cls._paths = {}
+            return graph
+
+    @classmethod
+    def conversion_paths(cls, desired_structure, available_structures):
+        """
+        Provide all the ways how to create the desired structure from the
+        available structures using up to MAX_CONVERSION_HOPS conversions.
+        Shorter paths come first, direct conversions are ordered as
+        described in :py:method:`EventStructuresFactory.convert`.
+
+        :param desired_structure: Name of the desired structure
+        :type desired_structure: str
+        :param available_structures: Names of the available structures
+        :type available_structures: iterable of str
+        :return: Paths, each path is tuple of Conversions where the first one starts from available structure and the last one creates the desired structure
+        :rtype: tuple
+        """
+        graph = cls.conversion_graph()
+        available_structures = tuple(available_structures)
+        key = (desired_structure, available_structures)
+        with cls._graph_lock:
+            try:
+                return cls._paths[key]
+            except KeyError:
+                pass
+        order = {name: index for index, name in enumerate(available_structures)}
+        paths = []
+        # search backwards from the desired structure
+        partial = [(conversion,) for conversion in graph.get(desired_structure, [])]
+        for _ in range(MAX_CONVERSION_HOPS):
+            extended = []
+            for path in partial:
+                source = path[0].source
+                if source in order:
+                    paths.append(path)
+                    continue
+                visited = {conversion.target for conversion in path}
+                for conversion in graph.get(source, []):
+                    if conversion.source not in visited:
+                        extended.append((conversion,) + path)
+            partial = extended
+        # stable sort keeps from_* before to_* for conversions of the same length
+        paths.sort(key=lambda path: (len(path), path[0].method != 'from', order[path[0].source]))
+        paths = tuple(paths)
+        with cls._graph_lock:
+            cls._paths[key] = paths
+        return paths
@@ -1,9 +1,10 @@
+import threading
 import unittest
 
 from ...exceptions import UnknownStructure
 from ..factory import EventFactory
 from ..base import Event
-from .factory import EventStructuresFactory
+from .factory import EventStructuresFactory, Conversion
 from libpermian.events.structures.base import BaseStructure
 
 class TestEvent(Event):
@@ -33,6 +34,16 @@ class BazStructure(BaseStructure):
     def to_bar(self):
         return EventStructuresFactory.make(self.settings, "bar", {"data": self.values})
 
+class QuxStructure(BaseStructure):
+    conversions = 0
+
+    @classmethod
+    def from_baz(cls, structure):
+        cls.conversions += 1
+        if structure.values == 'qux':
+            return cls(structure.settings)
+        return NotImplemented
+
 class TestStructuresFactory(unittest.TestCase):
     OLD_EVENT_STRUCTUR_TYPES = {}
 
@@ -85,15 +96,48 @@ class TestStructuresFactory(unittest.TestCase):
         self.assertEqual(bar.data, "hello")
 
     def test_convert_impossible(self):
-        foo = EventStructuresFactory.make(None, "foo", {})
-        bar = EventStructuresFactory.convert("bar", {"foo": foo})
-        self.assertIs(bar, NotImplemented)
+        bar = EventStructuresFactory.make(None, "bar", {"data": "hello"})
+        foo = EventStructuresFactory.convert("foo", {"bar": bar})
+        self.assertIs(foo, NotImplemented)
 
     def test_convert_unknown(self):
         foo = EventStructuresFactory.make(None, "foo", {})
         with self.assertRaises(UnknownStructure):
             EventStructuresFactory.convert("unknown", {"foo": foo})
 
+    def test_convert_multiple_hops(self):
+        foo = EventStructuresFactory.make(None, "foo", {})
+        stored = {}
+        bar = EventStructuresFactory.convert("bar", {"foo": foo}, store=stored.setdefault)
+        self.assertIsInstance(bar, BarStructure)
+        self.assertEqual(bar.data, [])
+        self.assertCountEqual(stored.keys(), ["baz"])
+
+    def test_conversion_paths(self):
+        self.assertEqual(
+            EventStructuresFactory.conversion_paths("baz", ["bar", "foo"]),
+            (
+                (Conversion("bar", "baz", "from"),),
+                (Conversion("foo", "baz", "from"),),
+            )
+        )
+        self.assertEqual(
+            EventStructuresFactory.conversion_paths("bar", ["foo"]),
+            ((Conversion("foo", "baz", "from"), Conversion("baz", "bar", "to")),)
+        )
+        self.assertEqual(EventStructuresFactory.conversion_paths("foo", ["bar", "baz"]), ())
+
+    def test_graph_rebuilt_on_register(self):
+        self.assertEqual(EventStructuresFactory.conversion_paths("qux", ["foo"]), ())
+        EventStructuresFactory.register('qux', QuxStructure)
+        try:
+            self.assertEqual(
+                EventStructuresFactory.conversion_paths("qux", ["foo"]),
+                ((Conversion("foo", "baz", "from"), Conversion("baz", "qux", "from")),)
+            )
+        finally:
+            del EventStructuresFactory.STRUCTURE_TYPES['qux']
+
 
 class TestEventStructuresIntegration(unittest.TestCase):
     OLD_EVENT_TYPES = {}
@@ -148,8 +192,43 @@ class TestEventStructuresIntegration(unittest.TestCase):
         self.assertEqual(event.bar.data, "hello")
 
     def test_convert_impossible(self):
+        event = EventFactory.make(None, '{"type": "test", "bar": {"data": "hello"}}')
+        self.assertIsNone(event.foo)
+
+    def test_convert_multiple_hops(self):
+        event = EventFactory.make(None, '{"type": "test", "foo": {}}')
+        self.assertIsInstance(event.bar, BarStructure)
+        self.assertCountEqual(event.structures.keys(), ["foo", "baz", "bar"])
+        self.assertIs(event.bar.data, event.baz.values)
+
+    def test_failed_conversion_cached(self):
+        EventStructuresFactory.register('qux', QuxStructure)
+        QuxStructure.conversions = 0
+        try:
+            event = EventFactory.make(None, '{"type": "test", "baz": {"values": "hello"}}')
+            self.assertIsNone(event.qux)
+            self.assertIsNone(event.qux)
+            self.assertEqual(QuxStructure.conversions, 1)
+            # new structure may make the conversion possible
+            event.structures['bar'] = EventStructuresFactory.make(None, "bar", {"data": "qux"})
+            self.assertIsNone(event.qux)
+            self.assertEqual(QuxStructure.conversions, 2)
+        finally:
+            del EventStructuresFactory.STRUCTURE_TYPES['qux']
+
+    def test_concurrent_conversion(self):
         event = EventFactory.make(None, '{"type": "test", "foo": {}}')
-        self.assertIsNone(event.bar)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(event.bar))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is event.bar for result in results))
 
     def test_not_structure(self):
         event = EventFactory.make(None, '{"type": "test", "foo": {}}')
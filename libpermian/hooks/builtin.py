@@ -1,5 +1,17 @@
 from .register import define
 
+@define
+def workflow_finished(workflow):
+    """
+    Signal the workflow has finished its execution and all the
+    caseRunConfigurations handled by the workflow have final result (the ones
+    which didn't get final result from the workflow were marked as DNF).
+
+    The hook is called from the main thread as soon as the workflow is
+    finished regardless of the state of other workflows.
+    """
+    pass
+
 @define
 def pipeline_ended(pipeline):
     """
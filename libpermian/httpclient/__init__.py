@@ -0,0 +1,246 @@
+import logging
+import os
+import random
+import threading
+import time
+import urllib.parse
+import weakref
+import xmlrpc.client
+
+import requests
+import requests.adapters
+
+LOGGER = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+"""Response status codes after which the request is retried"""
+
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+"""Methods which are retried by default"""
+
+_clients = weakref.WeakKeyDictionary()
+_clientsLock = threading.Lock()
+
+
+def client(settings):
+    """
+    Provide HTTPClient shared by everything using the same settings, so that
+    the connections are reused across plugins.
+
+    :param settings: Pipeline settings object
+    :type settings: libpermian.settings.Settings
+    :rtype: HTTPClient
+    """
+    with _clientsLock:
+        try:
+            return _clients[settings]
+        except KeyError:
+            sharedClient = _clients[settings] = HTTPClient(settings)
+            return sharedClient
+
+
+class HostStats():
+    """Counters of requests sent to one host"""
+    __slots__ = ('requests', 'failures', 'retries', 'latency', 'maxLatency')
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.latency = 0.0
+        """Total seconds spent waiting for responses"""
+        self.maxLatency = 0.0
+
+    def record(self, latency, failed):
+        self.requests += 1
+        self.failures += failed
+        self.latency += latency
+        self.maxLatency = max(self.maxLatency, latency)
+
+    def asdict(self):
+        return {
+            'requests': self.requests,
+            'failures': self.failures,
+            'retries': self.retries,
+            'latency': self.latency,
+            'averageLatency': self.latency / self.requests if self.requests else 0.0,
+            'maxLatency': self.maxLatency,
+        }
+
+
+class HTTPClient():
+    """
+    HTTP client keeping pool of keep-alive connections for each host. Number
+    of concurrent requests to one host is bounded by the pool size, requests
+    failing on connection errors or with one of RETRY_STATUS_CODES are
+    retried with exponential backoff with full jitter. Only requests with
+    idempotent methods are retried unless the caller says otherwise.
+
+    The behavior is configured in http settings section. Use client function
+    (or api.httpclient.client) to obtain the shared instance.
+
+    :param settings: Pipeline settings object
+    :type settings: libpermian.settings.Settings
+    """
+    def __init__(self, settings):
+        self.maxConnections = settings.getint('http', 'max_connections_per_host')
+        self.retries = settings.getint('http', 'retries')
+        self.backoff = settings.getfloat('http', 'backoff')
+        self.backoffMax = settings.getfloat('http', 'backoff_max')
+        self.timeout = settings.getfloat('http', 'timeout') or None
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.maxConnections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._lock = threading.Lock()
+        self._hosts = {}
+        """Mapping of host -> (semaphore, HostStats)"""
+
+    def _host(self, url):
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            try:
+                return self._hosts[host]
+            except KeyError:
+                state = self._hosts[host] = (threading.BoundedSemaphore(self.maxConnections), HostStats())
+                return state
+
+    def stats(self):
+        """
+        :return: Mapping of host to its counters, see HostStats.asdict
+        :rtype: dict
+        """
+        with self._lock:
+            return { host:stats.asdict() for host, (_, stats) in self._hosts.items() }
+
+    def backoffDelay(self, attempt, response=None):
+        """
+        Seconds to wait before the attempt (counted from 1 for the first
+        retry). Retry-After header of the response is respected up to
+        backoff_max.
+        """
+        if response is not None:
+            try:
+                return min(float(response.headers['Retry-After']), self.backoffMax)
+            except (KeyError, ValueError):
+                pass
+        return random.uniform(0, min(self.backoffMax, self.backoff * 2 ** (attempt - 1)))
+
+    def request(self, method, url, retries=None, idempotent=None, **kwargs):
+        """
+        Send the request using the pooled session, the arguments are the same
+        as the ones of requests.Session.request. The timeout from settings is
+        used if it's not provided.
+
+        :param retries: Number of retries, the value from settings is used by default
+        :type retries: int, optional
+        :param idempotent: Whether the request can be retried, decided based on the method by default
+        :type idempotent: bool, optional
+        :raises requests.RequestException: When the request fails even after retries
+        :rtype: requests.Response
+        """
+        method = method.upper()
+        if retries is None:
+            retries = self.retries
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        if not idempotent:
+            retries = 0
+        kwargs.setdefault('timeout', self.timeout)
+        semaphore, stats = self._host(url)
+        attempt = 0
+        while True:
+            response = None
+            start = time.monotonic()
+            try:
+                with semaphore:
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                stats.record(time.monotonic() - start, True)
+                if attempt >= retries:
+                    raise
+                LOGGER.debug('%s %s failed: %s', method, url, e)
+            else:
+                failed = response.status_code in RETRY_STATUS_CODES
+                stats.record(time.monotonic() - start, failed)
+                if not failed or attempt >= retries:
+                    return response
+                LOGGER.debug('%s %s failed with status %s', method, url, response.status_code)
+                response.close()
+            attempt += 1
+            stats.retries += 1
+            time.sleep(self.backoffDelay(attempt, response))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def read(self, url, **kwargs):
+        """
+        Read content of the URL, local paths and file:// URLs are read
+        directly from the filesystem.
+
+        :raises requests.RequestException: When the content can't be obtained
+        :raises OSError: When the local file can't be read
+        :rtype: bytes
+        """
+        if url.startswith('file://'):
+            url = url[7:]
+        if '://' not in url:
+            with open(os.path.expanduser(url), 'rb') as fo:
+                return fo.read()
+        response = self.get(url, **kwargs)
+        response.raise_for_status()
+        return response.content
+
+    def xmlrpc(self, url, idempotent=False, **kwargs):
+        """
+        Provide xmlrpc.client.ServerProxy sending its requests using this
+        client. Use idempotent=True when all the called methods are safe to
+        retry (e.g. read-only queries).
+        """
+        transport = XMLRPCTransport(
+            self,
+            urllib.parse.urlsplit(url).scheme,
+            idempotent,
+            use_datetime=kwargs.get('use_datetime', False),
+            use_builtin_types=kwargs.get('use_builtin_types', False),
+        )
+        return xmlrpc.client.ServerProxy(url, transport=transport, **kwargs)
+
+
+class XMLRPCTransport(xmlrpc.client.Transport):
+    """XML-RPC transport sending the requests using HTTPClient"""
+    def __init__(self, httpClient, scheme, idempotent=False, **kwargs):
+        super().__init__(**kwargs)
+        self.httpClient = httpClient
+        self.scheme = scheme
+        self.idempotent = idempotent
+
+    def request(self, host, handler, request_body, verbose=False):
+        response = self.httpClient.post(
+            f'{self.scheme}://{host}{handler}',
+            data=request_body,
+            headers={'Content-Type': 'text/xml', 'User-Agent': self.user_agent},
+            idempotent=self.idempotent,
+        )
+        if response.status_code != 200:
+            raise xmlrpc.client.ProtocolError(host + handler, response.status_code, response.reason, dict(response.headers))
+        parser, unmarshaller = self.getparser()
+        parser.feed(response.content)
+        parser.close()
+        return unmarshaller.close()
@@ -0,0 +1,187 @@
+import http.server
+import os
+import socket
+import tempfile
+import threading
+import unittest
+import xmlrpc.client
+import xmlrpc.server
+from unittest.mock import patch
+
+import requests
+
+from libpermian.settings import Settings
+from libpermian.httpclient import client, HTTPClient
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.clients.add(self.client_address)
+            status = server.statuses.pop(0) if server.statuses else 200
+        body = f'hello {self.path}'.encode()
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+class XMLRPCHandler(xmlrpc.server.SimpleXMLRPCRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return f'http://{server.server_address[0]}:{server.server_address[1]}'
+
+
+def make_settings(**options):
+    options.setdefault('backoff', '0.01')
+    return Settings({'http': options}, {}, [])
+
+
+class TestHTTPClient(unittest.TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.clients = set()
+        self.server.statuses = []
+        self.url = serve(self.server)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_shared(self):
+        settings = make_settings()
+        self.assertIs(client(settings), client(settings))
+        self.assertIsNot(client(settings), client(make_settings()))
+
+    def test_keep_alive(self):
+        httpClient = HTTPClient(make_settings())
+        for number in range(5):
+            response = httpClient.get(f'{self.url}/{number}')
+            self.assertEqual(response.text, f'hello /{number}')
+        self.assertEqual(len(self.server.clients), 1)
+        stats = httpClient.stats()[self.url[7:]]
+        self.assertEqual(stats['requests'], 5)
+        self.assertEqual(stats['failures'], 0)
+
+    def test_retry(self):
+        httpClient = HTTPClient(make_settings())
+        self.server.statuses = [503, 429]
+        response = httpClient.get(f'{self.url}/retry')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.requests, ['/retry'] * 3)
+        stats = httpClient.stats()[self.url[7:]]
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats['failures'], 2)
+        self.assertEqual(stats['retries'], 2)
+
+    def test_retries_exhausted(self):
+        httpClient = HTTPClient(make_settings(retries='1'))
+        self.server.statuses = [500, 500, 500]
+        response = httpClient.get(f'{self.url}/fail')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_not_idempotent(self):
+        httpClient = HTTPClient(make_settings())
+        self.server.statuses = [503]
+        self.assertEqual(httpClient.post(f'{self.url}/post').status_code, 503)
+        self.server.statuses = [503]
+        self.assertEqual(httpClient.post(f'{self.url}/post', idempotent=True).status_code, 200)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_connection_error(self):
+        httpClient = HTTPClient(make_settings(retries='2'))
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            host = '%s:%s' % sock.getsockname()
+        with self.assertRaises(requests.ConnectionError):
+            httpClient.get(f'http://{host}')
+        self.assertEqual(httpClient.stats()[host]['retries'], 2)
+        self.assertEqual(httpClient.stats()[host]['failures'], 3)
+
+    def test_backoff(self):
+        httpClient = HTTPClient(make_settings(backoff='1', backoff_max='3'))
+        for attempt in range(1, 10):
+            self.assertLessEqual(httpClient.backoffDelay(attempt), min(3, 2 ** (attempt - 1)))
+
+    def test_concurrency(self):
+        httpClient = HTTPClient(make_settings(max_connections_per_host='2'))
+        running = 0
+        maxRunning = 0
+        lock = threading.Lock()
+        original = httpClient.session.request
+        def request(*args, **kwargs):
+            nonlocal running, maxRunning
+            with lock:
+                running += 1
+                maxRunning = max(maxRunning, running)
+            try:
+                return original(*args, **kwargs)
+            finally:
+                with lock:
+                    running -= 1
+        threads = []
+        with patch.object(httpClient.session, 'request', new=request):
+            for number in range(8):
+                thread = threading.Thread(target=httpClient.get, args=(f'{self.url}/{number}',))
+                thread.start()
+                threads.append(thread)
+            for thread in threads:
+                thread.join()
+        self.assertLessEqual(maxRunning, 2)
+        self.assertEqual(len(self.server.requests), 8)
+
+    def test_read(self):
+        httpClient = HTTPClient(make_settings())
+        self.assertEqual(httpClient.read(f'{self.url}/read'), b'hello /read')
+        self.server.statuses = [404]
+        with self.assertRaises(requests.HTTPError):
+            httpClient.read(f'{self.url}/missing')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'file')
+            with open(path, 'wb') as fo:
+                fo.write(b'local')
+            self.assertEqual(httpClient.read(path), b'local')
+            self.assertEqual(httpClient.read(f'file://{path}'), b'local')
+
+
+class TestXMLRPC(unittest.TestCase):
+    def setUp(self):
+        self.server = xmlrpc.server.SimpleXMLRPCServer(('127.0.0.1', 0), XMLRPCHandler, allow_none=True, logRequests=False)
+        self.server.register_function(lambda a, b: a + b, 'add')
+        self.server.register_function(lambda value: value, 'echo')
+        self.url = serve(self.server)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_call(self):
+        httpClient = HTTPClient(make_settings())
+        proxy = httpClient.xmlrpc(self.url, allow_none=True)
+        self.assertEqual(proxy.add(1, 2), 3)
+        self.assertEqual(proxy.echo(None), None)
+        self.assertEqual(httpClient.stats()[self.url[7:]]['requests'], 2)
+
+    def test_fault(self):
+        proxy = HTTPClient(make_settings()).xmlrpc(self.url)
+        with self.assertRaises(xmlrpc.client.Fault):
+            proxy.missing()
@@ -1,7 +1,9 @@
 import abc
+import concurrent.futures
 import threading
 
 from .issueset import IssueSet
+from .lookupcache import lookup_cache
 
 # Note: This could be just a regular callable
 class BaseAnalyzer(metaclass=abc.ABCMeta):
@@ -29,6 +31,8 @@ class BaseIssue(metaclass=abc.ABCMeta):
             if not self.tracked or self.create_issues_instead_of_update:
                 if self.create_issues:
                     self._uri = self.make()
+                    # let other pipelines know the issue is tracked now
+                    self._cache_lookups([self], [self._uri])
             elif self.tracked and self.update_issues:
                 self.update()
             self._submitted = True
@@ -52,6 +56,106 @@ class BaseIssue(metaclass=abc.ABCMeta):
         """
         pass
 
+    @classmethod
+    def lookup_many(cls, issues):
+        """
+        Lookup multiple issues of this type in the issue database at once.
+        Override this method when the issue database allows to look up
+        multiple issues in one query. By default, _lookup of the issues is
+        called in parallel using up to sync_workers threads. Single issue is
+        always looked up by its _lookup.
+
+        :param issues: Issues of this type to be looked up
+        :type issues: list
+        :return: URIs of the issues in the same order as the issues, None for issues not found in the issue database
+        :rtype: list
+        """
+        if len(issues) == 1:
+            return [issues[0]._lookup()]
+        workers = issues[0].settings.getint(issues[0].settings_sections, 'sync_workers')
+        with concurrent.futures.ThreadPoolExecutor(max(1, min(workers, len(issues)))) as executor:
+            futures = [executor.submit(issue._lookup) for issue in issues]
+        return [future.result() for future in futures]
+
+    @classmethod
+    def sync_many(cls, issues, force=False):
+        """
+        Sync multiple issues of this type using lookup_many, see sync.
+
+        :param issues: Issues of this type to be synced
+        :type issues: list
+        :param force: Perform the sync even for issues which were already synced.
+        :type force: boolean
+        :rtype: None
+        """
+        issues = [issue for issue in issues if force or not issue.synced]
+        if not issues:
+            return
+        uris = cls._cached_lookup_many(issues, force)
+        for issue, uri in zip(issues, uris):
+            with issue._lock:
+                if force or not issue._synced:
+                    issue._apply_lookup(uri)
+
+    @classmethod
+    def _cached_lookup_many(cls, issues, force=False):
+        """
+        Lookup the issues using the persistent lookup cache (see
+        lookupcache.LookupCache) for issues providing lookup_key, the cache
+        is not read when force is set but it's updated by the results.
+        """
+        cache = lookup_cache(issues[0].settings)
+        keys = [issue._cache_key if cache is not None else None for issue in issues]
+        cached = {}
+        if cache is not None and not force:
+            cached = cache.get_many(key for key in keys if key is not None)
+        missing = [index for index, key in enumerate(keys) if key not in cached]
+        uris = [cached.get(key) for key in keys]
+        if not missing:
+            return uris
+        if len(missing) == 1:
+            found = [issues[missing[0]]._lookup()]
+        else:
+            found = cls.lookup_many([issues[index] for index in missing])
+        for index, uri in zip(missing, found):
+            uris[index] = uri
+        cls._cache_lookups([issues[index] for index in missing], found)
+        return uris
+
+    @staticmethod
+    def _cache_lookups(issues, uris):
+        cache = lookup_cache(issues[0].settings)
+        if cache is None:
+            return
+        cache.set_many(
+            (issue._cache_key, uri)
+            for issue, uri in zip(issues, uris)
+            if issue._cache_key is not None
+        )
+
+    @property
+    def lookup_key(self):
+        """
+        Identifier of the issue which is stable across pipeline runs, e.g.
+        signature of the failure the issue is looked up by. Issues providing
+        the key have their lookups stored in the persistent lookup cache,
+        None (default) = don't cache lookups of this issue.
+
+        :rtype: str or None
+        """
+        return None
+
+    @property
+    def _cache_key(self):
+        key = self.lookup_key
+        if key is None:
+            return None
+        return f'{type(self).__module__}.{type(self).__qualname__}:{key}'
+
+    @property
+    def synced(self):
+        return self._synced
+
     @property
     def new(self):
         self.sync()
@@ -81,18 +185,21 @@ class BaseIssue(metaclass=abc.ABCMeta):
         """
         Sync the status of the issue by looking it up in the issue database.
 
-        :param force: Perform the sync even if the sync was already done for this issue. Note that this won't overwrite the "new" status to prevent incorrect interpretation if the make method was called between the syncs.
+        :param force: Perform the sync even if the sync was already done for this issue, the persistent lookup cache is bypassed. Note that this won't overwrite the "new" status to prevent incorrect interpretation if the make method was called between the syncs.
         :type force: boolean
         :rtype: None
         """
         with self._lock:
             if not force and self._synced:
                 return
-            self._uri = self._lookup()
-            # don't update "new" state in case of subsequent force sync
-            if self._new is None:
-                self._new = self._uri is None
-            self._synced = True
+            self._apply_lookup(self._cached_lookup_many([self], force)[0])
+
+    def _apply_lookup(self, uri):
+        self._uri = uri
+        # don't update "new" state in case of subsequent force sync
+        if self._new is None:
+            self._new = self._uri is None
+        self._synced = True
 
     def __str__(self):
         self.sync()
@@ -0,0 +1,152 @@
+import collections
+import threading
+import time
+
+
+class _PendingLoad():
+    __slots__ = ('event', 'value', 'exception')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.exception = None
+
+
+class IssueCache():
+    """
+    Thread-safe cache of issues shared by all the issue analyzers. Access to
+    the cache holds the internal lock only for the dict operation, so that
+    analyzers running in different threads don't block each other.
+
+    Use load method to obtain the issue, the loader is called only once for
+    the key even when multiple threads ask for the same missing key at once,
+    the other threads wait for the result of the first one (single-flight).
+
+    Entries expire after ttl seconds (0 = never) and the least recently used
+    entries are dropped when there's more than max_size of them (0 = no
+    limit).
+
+    The cache can be used as a context manager for compatibility with the
+    original issue_cache context of IssueAnalyzerProxy.
+
+    :param ttl: Seconds after which the entry expires, 0 = never
+    :type ttl: float
+    :param max_size: Maximal number of entries, 0 = no limit
+    :type max_size: int
+    """
+    def __init__(self, ttl=0, max_size=0):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        """Mapping of key -> (expiration time or None, value)"""
+        self._loading = {}
+        """Mapping of key -> _PendingLoad of loads in progress"""
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key):
+        expires, value = self._entries[key]
+        if expires is not None and expires <= time.monotonic():
+            del self._entries[key]
+            raise KeyError(key)
+        if self.max_size:
+            self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while self.max_size and len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def load(self, key, loader):
+        """
+        Provide value of the key, call loader to obtain it if it's not
+        cached. Exception raised by the loader is propagated to all the
+        callers waiting for the key and nothing is cached.
+
+        :param key: Unique issue identifier
+        :param loader: Callable without arguments providing the value
+        :type loader: callable
+        """
+        with self._lock:
+            try:
+                value = self._get(key)
+                self.hits += 1
+                return value
+            except KeyError:
+                pass
+            pending = self._loading.get(key)
+            loading = pending is None
+            if loading:
+                self.misses += 1
+                pending = self._loading[key] = _PendingLoad()
+        if not loading:
+            pending.event.wait()
+            if pending.exception is not None:
+                raise pending.exception
+            return pending.value
+        try:
+            pending.value = loader()
+        except BaseException as e:
+            pending.exception = e
+            raise
+        finally:
+            with self._lock:
+                if pending.exception is None:
+                    self._set(key, pending.value)
+                del self._loading[key]
+            pending.event.set()
+        return pending.value
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                return self._get(key)
+            except KeyError:
+                return default
+
+    def pop(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._get(key)
+            except KeyError:
+                return default
+            del self._entries[key]
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._get(key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._set(key, value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._entries[key]
+
+    def __contains__(self, key):
+        with self._lock:
+            try:
+                self._get(key)
+                return True
+            except KeyError:
+                return False
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
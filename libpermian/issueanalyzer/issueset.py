@@ -15,6 +15,22 @@ class IssueSet(set):
     def isComplete(self):
         return self._complete
 
+    def sync(self, force=False):
+        """
+        Sync all the issues in this set which were not synced yet. Issues of
+        the same type are synced together using sync_many of the issue type
+        (which uses lookup_many) instead of looking up the issues one by one.
+
+        :param force: Sync also the issues which were already synced.
+        :type force: boolean
+        """
+        issueTypes = {}
+        for issue in self:
+            if force or not issue.synced:
+                issueTypes.setdefault(type(issue), []).append(issue)
+        for issueType, issues in issueTypes.items():
+            issueType.sync_many(issues, force)
+
     @property
     def needsReview(self):
         """
@@ -23,6 +39,7 @@ class IssueSet(set):
         be fixed (but it was detected) or if there's some new (previously
         untracked) issue.
         """
+        self.sync()
         return any(i.new or i.resolved for i in self)
 
     @property
@@ -32,6 +49,7 @@ class IssueSet(set):
         or resolved (but it was detected) are subject for review and should
         result either in update of the issue and/or change of the test.
         """
+        self.sync()
         return (i for i in self if i.new or i.resolved)
 
     @property
@@ -40,16 +58,20 @@ class IssueSet(set):
 
     @property
     def tracked(self):
+        self.sync()
         return (i for i in self if i.tracked)
 
     @property
     def untracked(self):
+        self.sync()
         return (i for i in self if not i.tracked)
 
     @property
     def resolved(self):
+        self.sync()
         return (i for i in self if i.resolved)
 
     @property
     def new(self):
+        self.sync()
         return (i for i in self if i.new)
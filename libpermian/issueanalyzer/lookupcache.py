@@ -0,0 +1,159 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+LOGGER = logging.getLogger(__name__)
+
+_caches = weakref.WeakKeyDictionary()
+_cachesLock = threading.Lock()
+
+
+def lookup_cache(settings):
+    """
+    Provide LookupCache configured by lookup_cache, lookup_cache_ttl and
+    lookup_cache_negative_ttl options of issueAnalyzer section shared by
+    everything using the same settings.
+
+    :param settings: Pipeline settings object
+    :type settings: libpermian.settings.Settings
+    :return: Shared LookupCache or None if the cache is disabled
+    :rtype: LookupCache or None
+    """
+    with _cachesLock:
+        try:
+            return _caches[settings]
+        except KeyError:
+            pass
+        path = settings.get('issueAnalyzer', 'lookup_cache')
+        cache = None
+        if path:
+            cache = LookupCache(
+                path,
+                settings.getfloat('issueAnalyzer', 'lookup_cache_ttl'),
+                settings.getfloat('issueAnalyzer', 'lookup_cache_negative_ttl'),
+            )
+        _caches[settings] = cache
+        return cache
+
+
+class LookupCache():
+    """
+    Persistent cache of issue lookup results (URI of the issue or None if the
+    issue is not tracked) stored in SQLite database so that the results can
+    be shared by pipelines running on the same host one after another or at
+    once. SQLite takes care of locking of the database file, the database
+    uses write-ahead log so that readers don't block the writer.
+
+    Failures of the database are logged and treated as cache misses, the
+    cache must never break the issue analysis.
+
+    :param path: Path to the SQLite database file, created when it doesn't exist
+    :type path: str
+    :param ttl: Seconds after which the lookup result expires, 0 = never
+    :type ttl: float
+    :param negative_ttl: Seconds after which the result of lookup which didn't find the issue (None) expires, 0 = such results are not cached. It should be short as the issue may be created by other pipeline or by hand anytime.
+    :type negative_ttl: float
+    """
+    TIMEOUT = 30
+    """Seconds to wait for the database lock held by other process"""
+
+    def __init__(self, path, ttl=0, negative_ttl=0):
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.TIMEOUT, check_same_thread=False)
+            try:
+                connection.execute('PRAGMA journal_mode=WAL')
+                with connection:
+                    connection.execute('CREATE TABLE IF NOT EXISTS lookups (key TEXT PRIMARY KEY, uri TEXT, updated REAL NOT NULL)')
+                    if self.ttl:
+                        connection.execute('DELETE FROM lookups WHERE updated <= ?', (time.time() - self.ttl,))
+                    if self.negative_ttl:
+                        connection.execute('DELETE FROM lookups WHERE uri IS NULL AND updated <= ?', (time.time() - self.negative_ttl,))
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    def get_many(self, keys):
+        """
+        :param keys: Keys of the issues
+        :type keys: list of str
+        :return: Mapping of key -> URI (or None) for the keys found in the cache
+        :rtype: dict
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        now = time.time()
+        since = now - self.ttl if self.ttl else float('-inf')
+        # negative results which are not cached anymore are ignored as well
+        negative_since = now - self.negative_ttl if self.negative_ttl else float('inf')
+        found = {}
+        with self._lock:
+            try:
+                connection = self._connect()
+                # stay below the default limit of SQL variables
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start+500]
+                    rows = connection.execute(
+                        f'SELECT key, uri FROM lookups WHERE updated > (CASE WHEN uri IS NULL THEN ? ELSE ? END) AND key IN ({",".join("?" * len(chunk))})',
+                        (max(since, negative_since), since, *chunk),
+                    )
+                    found.update(rows)
+            except (sqlite3.Error, OSError) as e:
+                LOGGER.warning(f'Issue lookup cache {self.path} is not available: {e}')
+        return found
+
+    def set_many(self, items):
+        """
+        :param items: Pairs of key and URI (or None) of the issues, None is stored only when negative_ttl is set otherwise the cached result of the issue is removed
+        :type items: iterable of tuples
+        """
+        now = time.time()
+        rows = []
+        removed = []
+        for key, uri in items:
+            if uri is None and not self.negative_ttl:
+                removed.append((key,))
+            else:
+                rows.append((key, uri, now))
+        if not rows and not removed:
+            return
+        with self._lock:
+            try:
+                connection = self._connect()
+                with connection:
+                    connection.executemany('INSERT OR REPLACE INTO lookups (key, uri, updated) VALUES (?, ?, ?)', rows)
+                    connection.executemany('DELETE FROM lookups WHERE key = ?', removed)
+            except (sqlite3.Error, OSError) as e:
+                LOGGER.warning(f'Issue lookup cache {self.path} is not available: {e}')
+
+    def get(self, key):
+        """
+        :return: Tuple of (found, URI)
+        :rtype: tuple
+        """
+        found = self.get_many([key])
+        return (key in found, found.get(key))
+
+    def set(self, key, uri):
+        self.set_many([(key, uri)])
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -1,13 +1,19 @@
 import threading
-import contextlib
 
+from .cache import IssueCache
 from .issueset import IssueSet
 from ..exception_dump import dump_exception
 
 class IssueAnalyzerProxy():
     """
     Issues are cached in issue_cache with key being unique issue identifier
-    defined by implementation of BaseAnalyzer
+    defined by implementation of BaseAnalyzer, see IssueCache. Prefer
+    issue_cache.load which looks up each issue only once even when it's
+    requested by multiple analyzers at once.
+
+    Results of analysis of each caseRunConfiguration are cached with the
+    version of its result and its logs, the analyzers run again only when the
+    result of the caseRunConfiguration changes or a log is added to it.
     """
     issue_analyzers = set()
 
@@ -25,42 +31,51 @@ class IssueAnalyzerProxy():
 
     def __init__(self, settings):
         self.settings = settings
-        self._issue_cache = {}
-        self._issue_cache_lock = threading.Lock()
-
-    @property
-    @contextlib.contextmanager
-    def issue_cache(self):
-        with self._issue_cache_lock:
-            # Ensure that it's only possible to update the cache inside
-            # the context and any update done out of it doesn't have any effect
-            # on the cache.
-            # Note the copy-update approach is definitely not the most
-            # efficient and doesn't warn when the cache is used/updated out of
-            # the context.
-            # This protection may be improved or dropped later.
-            cache_copy = self._issue_cache.copy()
-            yield cache_copy
-            self._issue_cache.update(cache_copy)
+        self.issue_cache = IssueCache(
+            ttl=settings.getfloat('issueAnalyzer', 'issue_cache_ttl'),
+            max_size=settings.getint('issueAnalyzer', 'issue_cache_size'),
+        )
+        self._analysis_cache = {}
+        """Mapping of crc id -> ((result version, logs), IssueSet)"""
+        self._analysis_cache_lock = threading.Lock()
 
     def analyze(self, caseRunConfigurations):
         superIssueSet = IssueSet()
 
         for caseRunConfiguration in caseRunConfigurations:
-            # consider crcs with final result as complete, if it's not complete
-            # the analysis cannot be reliable
-            issueSet = IssueSet(complete=caseRunConfiguration.result.final)
-            for IssueAnalyzer in self.issue_analyzers:
-                try:
-                    issueSet.extend(IssueAnalyzer.analyze(self, caseRunConfiguration))
-                except Exception as e:
-                    dump_exception(e, IssueAnalyzer)
-                    issueSet.extend(IssueSet(complete=False))
-            if not issueSet and caseRunConfiguration.result.result != "PASS":
-                # No issue was found and the result is not PASS, so there
-                # seems to be something missing, mark it as incomplete to
-                # require review.
-                superIssueSet.extend(IssueSet(complete=False))
-            else:
-                superIssueSet.extend(issueSet)
+            superIssueSet.extend(self._analyze(caseRunConfiguration))
         return superIssueSet
+
+    def _analyze(self, caseRunConfiguration):
+        """
+        Provide IssueSet of one caseRunConfiguration, cached for the version
+        of its result and its logs. Logs are often attached after the final
+        result is reported, so they're part of the cache key.
+        """
+        version = (caseRunConfiguration.result.version, frozenset(caseRunConfiguration.logs.items()))
+        with self._analysis_cache_lock:
+            cached = self._analysis_cache.get(caseRunConfiguration.id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        # consider crcs with final result as complete, if it's not complete
+        # the analysis cannot be reliable
+        issueSet = IssueSet(complete=caseRunConfiguration.result.final)
+        failed = False
+        for IssueAnalyzer in self.issue_analyzers:
+            try:
+                issueSet.extend(IssueAnalyzer.analyze(self, caseRunConfiguration))
+            except Exception as e:
+                dump_exception(e, IssueAnalyzer)
+                issueSet.extend(IssueSet(complete=False))
+                failed = True
+        if not issueSet and caseRunConfiguration.result.result != "PASS":
+            # No issue was found and the result is not PASS, so there
+            # seems to be something missing, mark it as incomplete to
+            # require review.
+            issueSet = IssueSet(complete=False)
+        # don't keep the analysis which failed, the failure may be temporary
+        if not failed:
+            with self._analysis_cache_lock:
+                self._analysis_cache[caseRunConfiguration.id] = (version, issueSet)
+        return issueSet
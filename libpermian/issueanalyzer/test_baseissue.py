@@ -1,6 +1,7 @@
 import unittest
 import logging
 import contextlib
+import threading
 
 from libpermian.settings import Settings
 
@@ -277,3 +278,67 @@ class TestSubmitCreateAlwaysWithUpdateOn(TestSubmitCreateAlwaysWithUpdateOff):
         {},
         []
     )
+
+class BulkIssue(TrackedUnresolvedIssue):
+    lookups = []
+
+    def __init__(self, settings, number):
+        super().__init__(settings)
+        self.number = number
+
+    @classmethod
+    def lookup_many(cls, issues):
+        cls.lookups.append(sorted(issue.number for issue in issues))
+        return [f'http://issuetracker.example.com/{issue.number}' if issue.number % 2 else None for issue in issues]
+
+class SlowIssue(NewIssue):
+    def __init__(self, settings, barrier):
+        super().__init__(settings)
+        self.barrier = barrier
+
+    def _lookup(self):
+        # all the lookups have to run at once to pass the barrier
+        self.barrier.wait(5)
+        return None
+
+class TestSyncMany(unittest.TestCase):
+    def setUp(self):
+        self.settings = Settings({}, {}, [])
+        BulkIssue.lookups = []
+
+    def test_bulk_lookup(self):
+        issues = [BulkIssue(self.settings, number) for number in range(4)]
+        issues[0].sync()
+        issueSet = IssueSet(issues + [NewIssue(self.settings)])
+        with self.assertLogs('test', level='INFO') as cm:
+            self.assertTrue(issueSet.needsReview)
+        # NewIssue uses the default lookup_many
+        self.assertEqual(cm.output, ['INFO:test:lookup was called'])
+        self.assertEqual(BulkIssue.lookups, [[1, 2, 3]])
+        self.assertEqual(issues[1].uri, 'http://issuetracker.example.com/1')
+        self.assertTrue(issues[2].new)
+        self.assertCountEqual(issueSet.tracked, [issues[0], issues[1], issues[3]])
+        # everything is synced already
+        self.assertEqual(BulkIssue.lookups, [[1, 2, 3]])
+
+    def test_force(self):
+        issues = [BulkIssue(self.settings, number) for number in range(2)]
+        issueSet = IssueSet(issues)
+        issueSet.sync()
+        issueSet.sync(force=True)
+        self.assertEqual(BulkIssue.lookups, [[0, 1], [0, 1]])
+
+    def test_parallel_fallback(self):
+        barrier = threading.Barrier(3)
+        issues = [SlowIssue(self.settings, barrier) for _ in range(3)]
+        SlowIssue.sync_many(issues)
+        self.assertTrue(all(issue.synced and issue.new for issue in issues))
+
+    def test_lookup_exception(self):
+        class FailingIssue(NewIssue):
+            def _lookup(self):
+                raise ValueError()
+        issues = [FailingIssue(self.settings), FailingIssue(self.settings)]
+        with self.assertRaises(ValueError):
+            IssueSet(issues).sync()
+        self.assertFalse(any(issue.synced for issue in issues))
@@ -0,0 +1,84 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from .cache import IssueCache
+
+
+class TestIssueCache(unittest.TestCase):
+    def test_dict_access(self):
+        cache = IssueCache()
+        self.assertNotIn('foo', cache)
+        self.assertIsNone(cache.get('foo'))
+        cache['foo'] = 'bar'
+        self.assertIn('foo', cache)
+        self.assertEqual(cache['foo'], 'bar')
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.pop('foo'), 'bar')
+        with self.assertRaises(KeyError):
+            cache['foo']
+
+    def test_load(self):
+        cache = IssueCache()
+        calls = []
+        def loader():
+            calls.append(1)
+            return 'bar'
+        self.assertEqual(cache.load('foo', loader), 'bar')
+        self.assertEqual(cache.load('foo', loader), 'bar')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_load_exception(self):
+        cache = IssueCache()
+        def loader():
+            raise ValueError()
+        with self.assertRaises(ValueError):
+            cache.load('foo', loader)
+        self.assertNotIn('foo', cache)
+        self.assertEqual(cache.load('foo', lambda: 'bar'), 'bar')
+
+    def test_single_flight(self):
+        cache = IssueCache()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        def loader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'bar'
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.load('foo', loader))) for _ in range(4)]
+        threads[0].start()
+        self.assertTrue(started.wait(5))
+        for thread in threads[1:]:
+            thread.start()
+        # other keys are not blocked by the load in progress
+        self.assertEqual(cache.load('other', lambda: 'baz'), 'baz')
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['bar'] * 4)
+        self.assertEqual(len(calls), 1)
+
+    def test_ttl(self):
+        cache = IssueCache(ttl=10)
+        with patch('time.monotonic', return_value=100):
+            cache['foo'] = 'bar'
+        with patch('time.monotonic', return_value=109):
+            self.assertEqual(cache['foo'], 'bar')
+        with patch('time.monotonic', return_value=110):
+            self.assertNotIn('foo', cache)
+            self.assertEqual(len(cache), 0)
+
+    def test_max_size(self):
+        cache = IssueCache(max_size=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache['a']
+        cache['c'] = 3
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(len(cache), 2)
@@ -0,0 +1,193 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from libpermian.settings import Settings
+
+from libpermian.plugins.test import TestIssue
+
+from .base import BaseIssue
+from .issueset import IssueSet
+from .lookupcache import LookupCache, lookup_cache
+
+
+class CachedIssue(BaseIssue):
+    lookups = []
+    tracked_signatures = {}
+
+    def __init__(self, settings, signature):
+        super().__init__(settings)
+        self.signature = signature
+
+    @property
+    def lookup_key(self):
+        return self.signature
+
+    def make(self):
+        return f'http://issuetracker.example.com/new/{self.signature}'
+
+    def update(self):
+        pass
+
+    def _lookup(self):
+        self.lookups.append(self.signature)
+        return self.tracked_signatures.get(self.signature)
+
+    @property
+    def resolved(self):
+        return False
+
+    @property
+    def report_url(self):
+        return 'http://issuetracker.example.com/new'
+
+
+class TestLookupCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'cache', 'issues.sqlite')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_get_set(self):
+        cache = LookupCache(self.path, negative_ttl=60)
+        self.assertEqual(cache.get('foo'), (False, None))
+        cache.set('foo', 'http://issuetracker.example.com/1')
+        cache.set('bar', None)
+        self.assertEqual(cache.get('foo'), (True, 'http://issuetracker.example.com/1'))
+        self.assertEqual(cache.get('bar'), (True, None))
+        self.assertEqual(cache.get_many(['foo', 'bar', 'baz']), {'foo': 'http://issuetracker.example.com/1', 'bar': None})
+        cache.close()
+
+    def test_shared(self):
+        # separate instances behave like separate pipeline processes
+        caches = [LookupCache(self.path) for _ in range(4)]
+        def write(number, cache):
+            for item in range(20):
+                cache.set(f'{number}-{item}', str(item))
+        threads = [threading.Thread(target=write, args=args) for args in enumerate(caches)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        found = LookupCache(self.path).get_many(f'{number}-{item}' for number in range(4) for item in range(20))
+        self.assertEqual(len(found), 80)
+
+    def test_ttl(self):
+        cache = LookupCache(self.path, ttl=60)
+        with patch('time.time', return_value=1000):
+            cache.set('foo', 'bar')
+        with patch('time.time', return_value=1059):
+            self.assertEqual(cache.get('foo'), (True, 'bar'))
+        with patch('time.time', return_value=1060):
+            self.assertEqual(cache.get('foo'), (False, None))
+
+    def test_negative_ttl(self):
+        cache = LookupCache(self.path, ttl=600, negative_ttl=60)
+        with patch('time.time', return_value=1000):
+            cache.set_many([('foo', 'bar'), ('baz', None)])
+        with patch('time.time', return_value=1059):
+            self.assertEqual(cache.get_many(['foo', 'baz']), {'foo': 'bar', 'baz': None})
+        with patch('time.time', return_value=1060):
+            self.assertEqual(cache.get_many(['foo', 'baz']), {'foo': 'bar'})
+
+    def test_negative_not_cached(self):
+        cache = LookupCache(self.path)
+        cache.set_many([('foo', 'bar'), ('baz', None)])
+        self.assertEqual(cache.get_many(['foo', 'baz']), {'foo': 'bar'})
+        # the issue is not found anymore
+        cache.set('foo', None)
+        self.assertEqual(cache.get('foo'), (False, None))
+        # negative results cached by other pipeline are ignored
+        LookupCache(self.path, negative_ttl=60).set('baz', None)
+        self.assertEqual(cache.get('baz'), (False, None))
+
+    def test_not_available(self):
+        with open(os.path.join(self.tmpdir.name, 'file'), 'w'):
+            pass
+        cache = LookupCache(os.path.join(self.tmpdir.name, 'file', 'issues.sqlite'))
+        with self.assertLogs('libpermian.issueanalyzer.lookupcache', level='WARNING'):
+            self.assertEqual(cache.get('foo'), (False, None))
+
+
+class TestIssueLookupCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.settings = self.make_settings()
+        CachedIssue.lookups = []
+        CachedIssue.tracked_signatures = {'known': 'http://issuetracker.example.com/1'}
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_settings(self, **options):
+        options.setdefault('lookup_cache', os.path.join(self.tmpdir.name, 'issues.sqlite'))
+        return Settings({'issueAnalyzer': options}, {}, [])
+
+    def test_disabled(self):
+        self.assertIsNone(lookup_cache(Settings({}, {}, [])))
+
+    def test_cross_run(self):
+        self.assertIs(lookup_cache(self.settings), lookup_cache(self.settings))
+        CachedIssue.sync_many([CachedIssue(self.settings, 'known'), CachedIssue(self.settings, 'unknown')])
+        self.assertCountEqual(CachedIssue.lookups, ['known', 'unknown'])
+        # next pipeline uses the cached lookups
+        settings = self.make_settings()
+        known = CachedIssue(settings, 'known')
+        unknown = CachedIssue(settings, 'unknown')
+        self.assertTrue(known.tracked)
+        self.assertEqual(known.uri, 'http://issuetracker.example.com/1')
+        self.assertTrue(unknown.new)
+        self.assertEqual(len(CachedIssue.lookups), 2)
+
+    def test_force(self):
+        CachedIssue(self.settings, 'known').sync()
+        CachedIssue.tracked_signatures['known'] = 'http://issuetracker.example.com/2'
+        issue = CachedIssue(self.make_settings(), 'known')
+        issue.sync()
+        self.assertEqual(issue.uri, 'http://issuetracker.example.com/1')
+        issue.sync(force=True)
+        self.assertEqual(issue.uri, 'http://issuetracker.example.com/2')
+        self.assertEqual(CachedIssue.lookups, ['known', 'known'])
+        # the forced lookup refreshed the cache
+        self.assertEqual(CachedIssue(self.make_settings(), 'known').uri, 'http://issuetracker.example.com/2')
+
+    def test_make(self):
+        settings = self.make_settings(create_issues='True')
+        CachedIssue(settings, 'unknown').submit()
+        issue = CachedIssue(self.make_settings(), 'unknown')
+        self.assertTrue(issue.tracked)
+        self.assertEqual(issue.uri, 'http://issuetracker.example.com/new/unknown')
+        self.assertEqual(CachedIssue.lookups, ['unknown'])
+
+    def test_negative_lookups_disabled(self):
+        settings = self.make_settings(lookup_cache_negative_ttl='0')
+        CachedIssue.sync_many([CachedIssue(settings, 'known'), CachedIssue(settings, 'unknown')])
+        CachedIssue.sync_many([CachedIssue(self.make_settings(lookup_cache_negative_ttl='0'), name) for name in ('known', 'unknown')])
+        # only the issue which wasn't found is looked up again
+        self.assertCountEqual(CachedIssue.lookups, ['known', 'unknown', 'unknown'])
+
+    def test_issueset_sync(self):
+        issues = IssueSet([
+            TestIssue(self.settings, 'http://issuetracker.example.com/1', 'http://issuetracker.example.com/new?1'),
+            TestIssue(self.settings, None, 'http://issuetracker.example.com/new?2'),
+        ])
+        with patch.object(TestIssue, '_lookup', autospec=True, side_effect=lambda issue: issue.test_uri) as lookup:
+            issues.sync()
+            self.assertEqual(lookup.call_count, 2)
+            # the next pipeline finds the issues in the cache, the issue
+            # database would provide different results now
+            settings = self.make_settings()
+            issues = IssueSet([
+                TestIssue(settings, 'http://issuetracker.example.com/3', 'http://issuetracker.example.com/new?1'),
+                TestIssue(settings, 'http://issuetracker.example.com/4', 'http://issuetracker.example.com/new?2'),
+            ])
+            issues.sync()
+            self.assertEqual(lookup.call_count, 2)
+        self.assertCountEqual(
+            [issue.uri for issue in issues],
+            ['http://issuetracker.example.com/1', None],
+        )
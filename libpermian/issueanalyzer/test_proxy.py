@@ -2,9 +2,11 @@ import unittest
 
 from .proxy import IssueAnalyzerProxy
 from .base import BaseAnalyzer, BaseIssue
+from .cache import IssueCache
 from .issueset import IssueSet
 from libpermian.caserunconfiguration import CaseRunConfiguration
-from libpermian.pipeline import Pipeline
+from libpermian.result import Result
+from libpermian.settings import Settings
 
 # share common setUp and tearDown between test cases, but not tests
 class TestIssueAnalyzerProxyCommon(unittest.TestCase):
@@ -29,9 +31,7 @@ class TestIssueAnalyzerProxyCommon(unittest.TestCase):
         for crc in self.caseRunConfigurations:
             crc.result.final = True
             crc.result.result = "PASS"
-        self.analyzerProxy = IssueAnalyzerProxy(
-            unittest.mock.create_autospec(Pipeline, instance=True)
-        )
+        self.analyzerProxy = IssueAnalyzerProxy(Settings({}, {}, []))
 
     def tearDown(self):
         IssueAnalyzerProxy.issue_analyzers = self.originalIssueAnalyzers
@@ -153,16 +153,68 @@ class TestIssueAnalyzerProxyAnalyze(TestIssueAnalyzerProxyCommon):
 
 class TestIssueAnalyzerProxyCache(TestIssueAnalyzerProxyCommon):
     def test_cache(self):
-        self.assertFalse(self.analyzerProxy._issue_cache_lock.locked())
+        self.assertIsInstance(self.analyzerProxy.issue_cache, IssueCache)
         with self.analyzerProxy.issue_cache as issue_cache:
-            self.assertTrue(self.analyzerProxy._issue_cache_lock.locked())
-            self.assertEqual(issue_cache, dict())
+            self.assertEqual(len(issue_cache), 0)
             issue_cache['foo'] = 'bar'
-        self.assertFalse(self.analyzerProxy._issue_cache_lock.locked())
-        # test cache out of context protection
-        self.assertIsNot(issue_cache, self.analyzerProxy._issue_cache)
-        issue_cache['dirt'] = 'mud'
-        # check the cache contains changes done only inside cache context
-        with self.analyzerProxy.issue_cache as issue_cache:
-            self.assertTrue(self.analyzerProxy._issue_cache_lock.locked())
-            self.assertEqual(issue_cache, {"foo": "bar"})
+        self.assertEqual(self.analyzerProxy.issue_cache['foo'], 'bar')
+        self.assertEqual(self.analyzerProxy.issue_cache.load('foo', lambda: 'baz'), 'bar')
+
+    def test_cache_settings(self):
+        analyzerProxy = IssueAnalyzerProxy(Settings({'issueAnalyzer': {'issue_cache_ttl': '60', 'issue_cache_size': '10'}}, {}, []))
+        self.assertEqual(analyzerProxy.issue_cache.ttl, 60)
+        self.assertEqual(analyzerProxy.issue_cache.max_size, 10)
+
+class DummyTestCase():
+    def __init__(self, name):
+        self.name = name
+        self.id = name
+
+class TestIssueAnalyzerProxyAnalysisCache(TestIssueAnalyzerProxyCommon):
+    def setUp(self):
+        super().setUp()
+        IssueAnalyzerProxy.register(self.AnalyzerClass1)
+        self.issue = unittest.mock.create_autospec(BaseIssue, instance=True)
+        self.AnalyzerClass1.analyze.return_value = [self.issue]
+        self.crc1 = CaseRunConfiguration(DummyTestCase('testcase1'), {}, [])
+        self.crc2 = CaseRunConfiguration(DummyTestCase('testcase2'), {}, [])
+        self.crc1.updateResult(Result('complete', 'FAIL', True))
+        self.crc2.updateResult(Result('running'))
+
+    def test_cached(self):
+        for _ in range(3):
+            result = self.analyzerProxy.analyze([self.crc1, self.crc2])
+            self.assertCountEqual(result.all, [self.issue])
+            self.assertFalse(result.isComplete)
+            self.analyzerProxy.analyze([self.crc1])
+        self.assertEqual(self.AnalyzerClass1.analyze.call_count, 2)
+
+    def test_result_changed(self):
+        self.analyzerProxy.analyze([self.crc1, self.crc2])
+        self.crc2.updateResult(Result('complete', 'PASS', True))
+        result = self.analyzerProxy.analyze([self.crc1, self.crc2])
+        self.assertTrue(result.isComplete)
+        self.AnalyzerClass1.analyze.assert_called_with(self.analyzerProxy, self.crc2)
+        self.assertEqual(self.AnalyzerClass1.analyze.call_count, 3)
+        # read-only copies share version with the original result
+        self.analyzerProxy.analyze([self.crc2.readOnlyCopy()])
+        self.assertEqual(self.AnalyzerClass1.analyze.call_count, 3)
+
+    def test_log_added(self):
+        self.analyzerProxy.analyze([self.crc1])
+        self.crc1.addLog('console', '/tmp/console.log')
+        self.analyzerProxy.analyze([self.crc1])
+        self.assertEqual(self.AnalyzerClass1.analyze.call_count, 2)
+        # read-only copies provide snapshot of the logs
+        self.analyzerProxy.analyze([self.crc1.readOnlyCopy()])
+        self.assertEqual(self.AnalyzerClass1.analyze.call_count, 2)
+
+    def test_failed_analysis_not_cached(self):
+        self.AnalyzerClass1.analyze.side_effect = Exception('tracker not available')
+        with unittest.mock.patch('libpermian.issueanalyzer.proxy.dump_exception'):
+            self.assertFalse(self.analyzerProxy.analyze([self.crc1]).isComplete)
+        self.AnalyzerClass1.analyze.side_effect = None
+        result = self.analyzerProxy.analyze([self.crc1])
+        self.assertCountEqual(result.all, [self.issue])
+        self.assertTrue(result.isComplete)
+        self.assertEqual(self.AnalyzerClass1.analyze.call_count, 2)
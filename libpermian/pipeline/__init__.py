@@ -1,6 +1,8 @@
+import concurrent.futures
 import copy
 import os
 import threading
+import time
 import logging
 from tplib.library import Library
 
@@ -40,6 +42,7 @@ def get_caserunconfigurations(event, settings_paths, overrides, env=None):
     Uses the same arguments as run_pipeline
     """
     pipeline = Pipeline(event, settings_paths, overrides, env)
+    pipeline._prefetchStructures()
     pipeline._cloneLibrary()
     return pipeline.event.generate_caseRunConfigurations(pipeline.library)
 
@@ -97,6 +100,8 @@ class Pipeline():
         LOGGER.debug('Starting WebUI')
         self._startWebUI()
         LOGGER.debug('WebUI started')
+        LOGGER.debug('Prefetching event structures')
+        self._prefetchStructures()
         self._cloneLibrary()
         LOGGER.debug('Making test runs')
         self._makeTestRuns()
@@ -129,6 +134,61 @@ class Pipeline():
         self.webUI.start()
         self.webUI.waitUntilStarted()
 
+    def _prefetchStructures(self):
+        """
+        Resolve the event structures listed in
+        :py:attr:`libpermian.events.base.Event.prefetch_structures` and
+        prefetch their remote data concurrently using up to
+        prefetch_workers threads so that the testplan filters and workflows
+        don't fetch them one by one later. Structures provided by the event
+        are prefetched first, the converted ones afterwards as they're often
+        converted using data of the provided ones.
+
+        Structures provided by the event are prefetched (in the main thread)
+        even when prefetch_workers is 0 so that invalid structures (e.g.
+        unknown koji build) fail the pipeline at its start instead of failing
+        some testplan filter or workflow later. Failures of the converted
+        structures are only logged, the data are fetched again (and the
+        failure is raised) when accessed.
+
+        :raises Exception: When prefetch of a structure provided by the event failed
+        """
+        workers = self.settings.getint('pipeline', 'prefetch_workers')
+        names = tuple(dict.fromkeys(self.event.prefetch_structures))
+        if not names:
+            return
+        provided = [name for name in names if name in self.event.structures]
+        converted = [name for name in names if name not in self.event.structures]
+        if workers <= 0:
+            errors = [self._prefetchStructure(name) for name in provided]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(min(workers, len(names)), thread_name_prefix='prefetch') as executor:
+                errors = list(executor.map(self._prefetchStructure, provided))
+                if not any(errors):
+                    list(executor.map(self._prefetchStructure, converted))
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def _prefetchStructure(self, name):
+        """
+        :return: Exception raised by the prefetch or None
+        :rtype: Exception or None
+        """
+        start = time.monotonic()
+        try:
+            structure = getattr(self.event, name)
+            if structure is not None:
+                structure.prefetch()
+        except Exception as e:
+            LOGGER.warning(f'Prefetching of structure {name} failed after {time.monotonic() - start:.3f}s: {e!r}')
+            return e
+        if structure is None:
+            LOGGER.debug(f'Structure {name} is not available for the event')
+            return None
+        LOGGER.info(f'Structure {name} prefetched in {time.monotonic() - start:.3f}s')
+        return None
+
     def _cloneLibrary(self, target_directory=None):
         """
         Clone repository containing testplans, requirements and testcases and
@@ -0,0 +1,107 @@
+import threading
+import unittest
+
+from . import Pipeline
+from ..events.base import Event
+from ..events.factory import EventFactory
+from ..events.structures.base import BaseStructure
+from ..events.structures.factory import EventStructuresFactory
+
+
+class PrefetchEvent(Event):
+    @property
+    def prefetch_structures(self):
+        return super().prefetch_structures + ('derived', 'broken', 'missing')
+
+
+class RemoteStructure(BaseStructure):
+    def __init__(self, settings, fail=False):
+        super().__init__(settings)
+        self.fail = fail
+        self.prefetched_by = None
+
+    def prefetch(self):
+        if self.fail:
+            raise ConnectionError('remote is down')
+        self.prefetched_by = threading.current_thread()
+
+
+class DerivedStructure(RemoteStructure):
+    @classmethod
+    def from_remote(cls, structure):
+        # the provided structures are prefetched first
+        assert structure.prefetched_by is not None
+        return cls(structure.settings)
+
+
+class BrokenStructure(RemoteStructure):
+    @classmethod
+    def from_remote(cls, structure):
+        return cls(structure.settings, fail=True)
+
+
+class MissingStructure(BaseStructure):
+    pass
+
+
+class TestPrefetch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.OLD_EVENT_TYPES = EventFactory.EVENT_TYPES.copy()
+        cls.OLD_EVENT_STRUCTURE_TYPES = EventStructuresFactory.STRUCTURE_TYPES.copy()
+        EventFactory.register('prefetch')(PrefetchEvent)
+        EventStructuresFactory.register('remote', RemoteStructure)
+        EventStructuresFactory.register('failing', RemoteStructure)
+        EventStructuresFactory.register('derived', DerivedStructure)
+        EventStructuresFactory.register('broken', BrokenStructure)
+        EventStructuresFactory.register('missing', MissingStructure)
+
+    @classmethod
+    def tearDownClass(cls):
+        EventFactory.EVENT_TYPES = cls.OLD_EVENT_TYPES
+        EventStructuresFactory.STRUCTURE_TYPES = cls.OLD_EVENT_STRUCTURE_TYPES
+
+    def make_pipeline(self, workers, event='{"type": "prefetch", "remote": {}}'):
+        return Pipeline(
+            event,
+            [],
+            {'pipeline': {'prefetch_workers': workers}},
+            env={},
+        )
+
+    def test_prefetch(self):
+        pipeline = self.make_pipeline(4)
+        with self.assertLogs('libpermian.pipeline', level='DEBUG') as cm:
+            pipeline._prefetchStructures()
+        remote = pipeline.event.structures['remote']
+        derived = pipeline.event.structures['derived']
+        self.assertIsNotNone(remote.prefetched_by)
+        self.assertIsNot(remote.prefetched_by, threading.current_thread())
+        self.assertIsNotNone(derived.prefetched_by)
+        self.assertNotIn('missing', pipeline.event.structures)
+        output = '\n'.join(cm.output)
+        self.assertRegex(output, r'Structure remote prefetched in \d+\.\d+s')
+        self.assertRegex(output, r'Structure derived prefetched in \d+\.\d+s')
+        # failure of converted structure is only logged
+        self.assertIn('Prefetching of structure broken failed', output)
+        self.assertIn('Structure missing is not available', output)
+
+    def test_provided_failure(self):
+        pipeline = self.make_pipeline(4, '{"type": "prefetch", "remote": {}, "failing": {"fail": true}}')
+        with self.assertLogs('libpermian.pipeline', level='WARNING') as cm:
+            with self.assertRaises(ConnectionError):
+                pipeline._prefetchStructures()
+        self.assertIn('Prefetching of structure failing failed', '\n'.join(cm.output))
+        self.assertIsNotNone(pipeline.event.structures['remote'].prefetched_by)
+        self.assertNotIn('derived', pipeline.event.structures)
+
+    def test_prefetch_disabled(self):
+        pipeline = self.make_pipeline(0)
+        pipeline._prefetchStructures()
+        # the provided structures are validated in the main thread
+        self.assertIs(pipeline.event.structures['remote'].prefetched_by, threading.current_thread())
+        self.assertNotIn('derived', pipeline.event.structures)
+        pipeline = self.make_pipeline(0, '{"type": "prefetch", "failing": {"fail": true}}')
+        with self.assertLogs('libpermian.pipeline', level='WARNING'):
+            with self.assertRaises(ConnectionError):
+                pipeline._prefetchStructures()
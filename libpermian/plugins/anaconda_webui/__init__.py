@@ -122,27 +122,36 @@ class AnacondaWebUIWorkflow(IsolatedWorkflow):
         """
         Make separate instances of this workflow for given crcIds.
 
-        Also create Semaphore that will limit the number of VMs running at once
-        and threading lock used for setup and teardown
+        Also create threading lock used for setup and teardown, the number of
+        VMs running at once is limited by the workflow scheduler using the
+        vm resource, see WorkflowScheduler. The deprecated hypervisor_vm_limit
+        option overrides the limit of the vm resource when it's set.
 
         :param crcIds: List of CaseRunConfiguration which belong to this workflow.
         :type crcIds: list
         """
-        vm_limit = testRuns.settings.getint('AnacondaWebUI', 'hypervisor_vm_limit')
-        vm_semaphore = threading.Semaphore(vm_limit)
+        try:
+            vm_limit = testRuns.settings.getint('AnacondaWebUI', 'hypervisor_vm_limit')
+        except KeyError:
+            pass
+        else:
+            LOGGER.warning('AnacondaWebUI.hypervisor_vm_limit is deprecated, use workflowResources.vm instead')
+            testRuns.workflowScheduler.setLimit('vm', vm_limit)
         setup_lock = threading.Lock()
 
         for singleCrcList in crcList.by_key(lambda x: x.id).values():
-            cls(testRuns, singleCrcList, setup_lock, vm_semaphore)
+            cls(testRuns, singleCrcList, setup_lock)
 
-    def __init__(self, testRuns, crcList, setup_lock, vm_semaphore):
+    def __init__(self, testRuns, crcList, setup_lock):
         super().__init__(testRuns, crcList)
         self.installation_source = self.event.InstallationSource
         self.boot_iso_structure = self.event.bootIso
         self.boot_iso_path = None
         if self.installation_source is None and self.boot_iso_structure is None:
             raise ResourceNotAvailable('anaconda-webui needs bootIso or InstallationSource structure')
-        self.vm_semaphore = vm_semaphore
+        self.vm_resource = None
+        """vm resource of the hypervisor held while the VM is running"""
+        self.vm_slot_acquired = False
         self.setup_lock = setup_lock
         self.vm_name = f'anaconda-webui-{hash(self.crc)}'
         self.test_system_ip = None
@@ -190,6 +199,11 @@ class AnacondaWebUIWorkflow(IsolatedWorkflow):
             self.hypervisor = Hypervisor(self.settings.get('VMHypervisors', self.architecture))
         except KeyError:
             self.hypervisor = None
+        else:
+            # held for the whole workflow (including setup), the vm resource
+            # is acquired only while the VM is running
+            self.resources = (f'hypervisor@{self.hypervisor.host}',)
+            self.vm_resource = f'vm@{self.hypervisor.host}'
 
     def setup(self):
         # Check if we have hypervisor for specified architecture
@@ -245,7 +259,8 @@ class AnacondaWebUIWorkflow(IsolatedWorkflow):
 
         # Start VM
         self.log('Waiting for VM slot', show=True)
-        self.vm_semaphore.acquire()
+        self.testRuns.workflowScheduler.acquire(self.vm_resource)
+        self.vm_slot_acquired = True
         if self.canceled:
             return
         self.reportResult(Result('started', None, False))
@@ -383,7 +398,9 @@ class AnacondaWebUIWorkflow(IsolatedWorkflow):
         if self.hypervisor.remote:
             self.hypervisor.forwarding_cleanup()
 
-        self.vm_semaphore.release()
+        if self.vm_slot_acquired:
+            self.testRuns.workflowScheduler.releaseResource(self.vm_resource)
+            self.vm_slot_acquired = False
 
         with self.setup_lock:
             # If this instance is the last one using temp dir -> remove it
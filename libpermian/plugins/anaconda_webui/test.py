@@ -57,7 +57,7 @@ class TestAnacondaWebUIWorkflow(unittest.TestCase):
                                    {'branch': 'test_branch', 'architecture': 'aarch64'},
                                    [DummyTestPlan()])
 
-        self.workflow = AnacondaWebUIWorkflow(testRuns, [crc], None, None)
+        self.workflow = AnacondaWebUIWorkflow(testRuns, [crc], None)
         self.workflow.log = MagicMock()
         self.workflow.groupLog = MagicMock()
         self.workflow.addLog = MagicMock()
@@ -136,7 +136,7 @@ class Test_get_boot_iso_path(unittest.TestCase):
         crc = CaseRunConfiguration(get_DummyTestCase(),
                                    {'branch': 'test_branch', 'architecture': 'x86_64'},
                                    [DummyTestPlan()])
-        self.workflow = AnacondaWebUIWorkflow(testRuns, [crc], None, None)
+        self.workflow = AnacondaWebUIWorkflow(testRuns, [crc], None)
 
     def test_remote_hv(self):
         self.workflow.hypervisor.remote = True
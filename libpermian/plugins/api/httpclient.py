@@ -0,0 +1,10 @@
+from ...httpclient import client as _client
+
+def client(settings):
+    """
+    Redirects to httpclient.client
+
+    Provides HTTP client shared by all the plugins with pooled keep-alive
+    connections, bounded per-host concurrency and retries with backoff.
+    """
+    return _client(settings)
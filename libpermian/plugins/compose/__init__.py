@@ -2,9 +2,8 @@ import json
 import logging
 import time
 import re
-import urllib.request
-import urllib.error
 import json
+import threading
 
 from .. import api
 from ...events.base import Event, payload_override
@@ -24,6 +23,10 @@ class ComposeEvent(Event):
     def __init__(self, settings, type, compose, **kwargs):
         super().__init__(settings, type, compose=compose, **kwargs)
 
+    @property
+    def prefetch_structures(self):
+        return super().prefetch_structures + ('product',)
+
     def __str__(self):
         label_part = f" ({self.compose.label.split('-')[0]})" if self.compose.label else ""
         short_type = self.type.split('.')[-1]
@@ -60,16 +63,25 @@ class ComposeStructure(BaseStructure):
         self._parent_product = parent_product
         self._parent_version = parent_version
         self.available_in = [] if available_in is None else available_in
+        self._composeinfo = None
+        self._composeinfo_lock = threading.Lock()
 
     @property
     def location(self):
         if self._location:
             return self._location
-        try:
-            with urllib.request.urlopen(self.settings.get('compose', 'location') % self.id) as response:
-                return response.geturl()
-        except urllib.error.HTTPError as excp:
-            raise ComposeNotAvailable('Could not find compose with ID %s via %s, error %s' % (self.id, self.settings.get('compose', 'location'), excp.code))
+        # only the final URL after redirects is needed, don't download the content
+        response = api.httpclient.client(self.settings).get(self.settings.get('compose', 'location') % self.id, stream=True)
+        response.close()
+        if response.status_code >= 400:
+            raise ComposeNotAvailable('Could not find compose with ID %s via %s, error %s' % (self.id, self.settings.get('compose', 'location'), response.status_code))
+        self._location = response.url
+        return self._location
+
+    def prefetch(self):
+        # the properties memoize the location and the metadata
+        _ = self.location
+        _ = self.composeinfo.metadata.info
 
     @property
     def type(self):
@@ -127,7 +139,10 @@ class ComposeStructure(BaseStructure):
 
     @property
     def composeinfo(self):
-        return ComposeInfo(self.location, self.location_http or self.location)
+        with self._composeinfo_lock:
+            if self._composeinfo is None:
+                self._composeinfo = ComposeInfo(self.settings, self.location, self.location_http or self.location, self.id)
+            return self._composeinfo
 
     def previous(self, beaker_tag=None):
         if beaker_tag is not None:
@@ -153,14 +168,13 @@ class ComposeStructure(BaseStructure):
 
         raise TypeError('previous requires at least one argument from (beaker_tag)')
 
+    @property
+    def component_index(self):
+        return self.composeinfo.component_index
+
     @property
     def components(self):
-        _components = set()
-        for variant in self.composeinfo.metadata.rpms.rpms.values():
-            for architecture in variant.values():
-                for comp in architecture.keys():
-                    _components.add(comp)
-        return _components
+        return self.component_index.components
 
     def diff(self, other_compose):
         return ComposeDiff(self, other_compose)
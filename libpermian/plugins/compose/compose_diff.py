@@ -1,5 +1,8 @@
 import re
+import json
 import logging
+import threading
+from collections import OrderedDict
 
 LOGGER = logging.getLogger(__name__)
 RPM_VERSION_SPLIT_RE = re.compile('-[0-9]+:[0-9]+')
@@ -9,19 +12,143 @@ def strip_rpm_version(rpm_name):
     return RPM_VERSION_SPLIT_RE.split(rpm_name, 1)[0]
 
 
+class ComponentIndex():
+    """
+    Index of compose components (source RPMs) mapping component name ->
+    variant -> architecture -> list of the component NEVRAs. The index is
+    built once per compose from the rpms metadata and can be serialized so
+    that it's stored in the compose metadata cache instead of parsing the
+    rpms metadata again.
+
+    :param index: The index, see above
+    :type index: dict
+    """
+    FORMAT_VERSION = 1
+    CACHE_NAME = f'component-index-v{FORMAT_VERSION}.json'
+    """Name of the file in MetadataCache"""
+
+    def __init__(self, index):
+        self.index = index
+        self._versions = {
+            name: frozenset(nevra for arches in variants.values() for nevras in arches.values() for nevra in nevras)
+            for name, variants in index.items()
+        }
+
+    @classmethod
+    def from_rpms(cls, rpms):
+        """
+        :param rpms: Rpms of productmd compose metadata (compose.rpms.rpms) - variant -> arch -> source NEVRA -> binary rpms
+        :type rpms: dict
+        """
+        index = {}
+        for variant, arches in rpms.items():
+            for arch, srpms in arches.items():
+                for srpm in srpms:
+                    index.setdefault(strip_rpm_version(srpm), {}).setdefault(variant, {}).setdefault(arch, []).append(srpm)
+        for variants in index.values():
+            for arches in variants.values():
+                for nevras in arches.values():
+                    nevras.sort()
+        return cls(index)
+
+    @classmethod
+    def from_components(cls, components):
+        """
+        Create index of the components not knowing their variants and
+        architectures, '*' is used for both of them.
+
+        :param components: Component NEVRAs
+        :type components: iterable of str
+        """
+        index = {}
+        for component in sorted(components):
+            index.setdefault(strip_rpm_version(component), {'*': {'*': []}})['*']['*'].append(component)
+        return cls(index)
+
+    @classmethod
+    def loads(cls, data):
+        data = json.loads(data)
+        if data.get('version') != cls.FORMAT_VERSION:
+            raise ValueError(f'Unsupported component index version {data.get("version")}')
+        return cls(data['components'])
+
+    def dumps(self):
+        return json.dumps({'version': self.FORMAT_VERSION, 'components': self.index}, sort_keys=True)
+
+    @property
+    def names(self):
+        return self._versions.keys()
+
+    @property
+    def components(self):
+        """
+        :return: NEVRAs of all the components
+        :rtype: set
+        """
+        return set().union(*self._versions.values())
+
+    def versions(self, name):
+        """
+        :return: NEVRAs of the component across all variants and architectures
+        :rtype: frozenset
+        """
+        return self._versions.get(name, frozenset())
+
+    def diff(self, other):
+        """
+        :return: Names of components which are present only in one of the indexes or in different versions
+        :rtype: set
+        """
+        return {
+            name
+            for name in self.names | other.names
+            if self.versions(name) != other.versions(name)
+        }
+
+
 class ComposeDiff():
+    COMPONENT_NAMES_CACHE_SIZE = 128
+    """Maximal number of compose pairs whose component names are remembered"""
+    _component_names = OrderedDict()
+    """Mapping of (first compose id, second compose id) -> component names, the least recently used first"""
+    _component_names_lock = threading.Lock()
+
     def __init__(self, first, second):
         self.first = first
         self.second = second
         if self.second == None:
             LOGGER.warn('No compose for comparison, ComposeDiff will mark everything as different.')
 
-    @property
-    def component_names(self):
-        if self.second == None:
-            return { strip_rpm_version(component) for component in self.first.components }
-        # get symmetric difference
-        difference = self.first.components ^ self.second.components
-        return { strip_rpm_version(component) for component in difference }
+    @staticmethod
+    def _component_index(compose):
+        try:
+            return compose.component_index
+        except AttributeError:
+            return ComponentIndex.from_components(compose.components)
 
+    @property
+    def _key(self):
+        first_id = getattr(self.first, 'id', None)
+        second_id = getattr(self.second, 'id', None)
+        if first_id is None or (self.second is not None and second_id is None):
+            return None
+        return (first_id, second_id)
 
+    @property
+    def component_names(self):
+        key = self._key
+        with self._component_names_lock:
+            names = self._component_names.get(key)
+            if names is not None:
+                self._component_names.move_to_end(key)
+        if names is None:
+            if self.second == None:
+                names = frozenset(self._component_index(self.first).names)
+            else:
+                names = frozenset(self._component_index(self.first).diff(self._component_index(self.second)))
+            if key is not None:
+                with self._component_names_lock:
+                    self._component_names[key] = names
+                    while len(self._component_names) > self.COMPONENT_NAMES_CACHE_SIZE:
+                        self._component_names.popitem(last=False)
+        return set(names)
@@ -1,14 +1,65 @@
+import threading
+
 import productmd
-import urllib
+
+from .. import api
+from .metadata_cache import metadata_cache, CachedComposeMetadata
+from .compose_diff import ComponentIndex
 
 class ComposeInfo():
-    def __init__(self, location, location_http):
+    """
+    Compose metadata and .treeinfo files of the compose variants. When
+    compose.metadata_cache is set, the metadata and .treeinfo files are
+    loaded from the on-disk cache (see
+    :py:class:`libpermian.plugins.compose.metadata_cache.MetadataCache`)
+    keyed by compose_id.
+
+    :param settings: Pipeline settings object
+    :type settings: libpermian.settings.Settings
+    :param location: Location of the compose used in the provided URLs
+    :type location: str
+    :param location_http: Location of the compose used to fetch the metadata
+    :type location_http: str
+    :param compose_id: Id of the compose, the cache is not used when not provided
+    :type compose_id: str, optional
+    """
+    def __init__(self, settings, location, location_http, compose_id=None):
+        self.settings = settings
+        self.compose_id = compose_id
+        self.cache = metadata_cache(settings) if compose_id is not None else None
         self.metadata = productmd.compose.Compose(location_http)
         if self.metadata.compose_path != location_http and self.metadata.compose_path.endswith('/compose'):
             # if location_http missed /compose, the location needs it as well
             location = '/'.join([location, 'compose'])
         self.location = location
+        if self.cache is not None:
+            self.metadata = CachedComposeMetadata(settings, self.metadata, compose_id, self.cache)
         self._treeinfos = {}
+        self._treeinfos_lock = threading.Lock()
+        self._component_index = None
+        self._component_index_lock = threading.Lock()
+
+    @property
+    def component_index(self):
+        """
+        Index of the compose components built from the rpms metadata, the
+        serialized index is stored in the metadata cache when enabled.
+
+        :rtype: libpermian.plugins.compose.compose_diff.ComponentIndex
+        """
+        with self._component_index_lock:
+            if self._component_index is not None:
+                return self._component_index
+            content = None
+            if self.cache is not None:
+                content = self.cache.get(self.compose_id, ComponentIndex.CACHE_NAME)
+            if content is not None:
+                self._component_index = ComponentIndex.loads(content.decode())
+            else:
+                self._component_index = ComponentIndex.from_rpms(self.metadata.rpms.rpms)
+                if self.cache is not None:
+                    self.cache.set(self.compose_id, ComponentIndex.CACHE_NAME, self._component_index.dumps().encode())
+            return self._component_index
 
     def tree_url(self, variant, architecture):
         for variant_metadata in self.metadata.info.get_variants():
@@ -17,14 +68,18 @@ class ComposeInfo():
         raise Exception(f'No variant "{variant}" was found in compose stored at: {self.location}')
 
     def treeinfo(self, variant, architecture):
-        if (variant, architecture) not in self._treeinfos:
-            url = '/'.join([self.tree_url(variant, architecture), '.treeinfo'])
-            if url.startswith('/'):
-                url = f'file://{url}'
-            ti = productmd.treeinfo.TreeInfo()
-            ti.loads(urllib.request.urlopen(url).read().decode())
-            self._treeinfos[(variant, architecture)] = ti
-        return self._treeinfos[(variant, architecture)]
+        with self._treeinfos_lock:
+            if (variant, architecture) not in self._treeinfos:
+                url = '/'.join([self.tree_url(variant, architecture), '.treeinfo'])
+                loader = lambda: api.httpclient.client(self.settings).read(url)
+                if self.cache is not None:
+                    content = self.cache.load(self.compose_id, f'{variant}/{architecture}/.treeinfo', loader)
+                else:
+                    content = loader()
+                ti = productmd.treeinfo.TreeInfo()
+                ti.loads(content.decode())
+                self._treeinfos[(variant, architecture)] = ti
+            return self._treeinfos[(variant, architecture)]
 
     def kernel_path(self, variant, architecture):
         return self.treeinfo(variant, architecture).images[architecture]['kernel']
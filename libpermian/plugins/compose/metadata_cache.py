@@ -0,0 +1,260 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
+import weakref
+
+import productmd.composeinfo
+import productmd.images
+import productmd.modules
+import productmd.rpms
+
+from .. import api
+
+LOGGER = logging.getLogger(__name__)
+
+_caches = weakref.WeakKeyDictionary()
+_cachesLock = threading.Lock()
+
+
+def metadata_cache(settings):
+    """
+    Provide MetadataCache configured by metadata_cache and
+    metadata_cache_max_age options of compose section shared by everything
+    using the same settings. The cache is pruned when it's created.
+
+    :param settings: Pipeline settings object
+    :type settings: libpermian.settings.Settings
+    :return: Shared MetadataCache or None if the cache is disabled
+    :rtype: MetadataCache or None
+    """
+    with _cachesLock:
+        try:
+            return _caches[settings]
+        except KeyError:
+            pass
+        directory = settings.get('compose', 'metadata_cache')
+        cache = None
+        if directory:
+            cache = MetadataCache(directory, settings.getfloat('compose', 'metadata_cache_max_age'))
+            cache.prune()
+        _caches[settings] = cache
+        return cache
+
+
+class MetadataCache():
+    """
+    Content-addressed on-disk cache of compose metadata files shared by
+    pipelines running on the same host. Composes don't change once they're
+    finished, so the files are cached by compose id and name of the file
+    until they're not used for max_age seconds, see prune.
+
+    Content of the files is stored in objects directory under its sha256
+    digest (so that identical files of different composes, e.g. respins, are
+    stored only once) and the composes directory contains references from
+    compose id and file name to the digest. Both are written atomically, so
+    the cache can be used by multiple processes at once without locking.
+
+    Failures of the cache are logged and treated as cache misses.
+
+    :param directory: Path to the cache directory, created when it doesn't exist
+    :type directory: str
+    :param max_age: Seconds after which files which were not used are removed by prune, 0 = never
+    :type max_age: float
+    """
+    def __init__(self, directory, max_age=0):
+        self.directory = os.path.expanduser(directory)
+        self.max_age = max_age
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, 'objects', digest[:2], digest)
+
+    def _ref_path(self, compose_id, name):
+        return os.path.join(
+            self.directory, 'composes',
+            urllib.parse.quote(compose_id, safe=''),
+            urllib.parse.quote(name, safe=''),
+        )
+
+    @staticmethod
+    def _write(path, content):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, compose_id, name):
+        """
+        :param compose_id: Id of the compose
+        :type compose_id: str
+        :param name: Name of the file, e.g. rpms.json or BaseOS/x86_64/.treeinfo
+        :type name: str
+        :return: Content of the file or None if it's not cached
+        :rtype: bytes or None
+        """
+        ref_path = self._ref_path(compose_id, name)
+        try:
+            with open(ref_path) as f:
+                digest = f.read().strip()
+            with open(self._object_path(digest), 'rb') as f:
+                content = f.read()
+            # modification time of the reference is the time of last use
+            os.utime(ref_path)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            LOGGER.warning(f'Compose metadata cache {self.directory} is not available: {e}')
+            return None
+        if hashlib.sha256(content).hexdigest() != digest:
+            LOGGER.warning(f'Cached {name} of compose {compose_id} is corrupted, ignoring it')
+            return None
+        return content
+
+    def set(self, compose_id, name, content):
+        """
+        Store the file content in the cache.
+
+        :param compose_id: Id of the compose
+        :type compose_id: str
+        :param name: Name of the file
+        :type name: str
+        :param content: Content of the file
+        :type content: bytes
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        try:
+            try:
+                # keep the object from being pruned
+                os.utime(self._object_path(digest))
+            except FileNotFoundError:
+                self._write(self._object_path(digest), content)
+            self._write(self._ref_path(compose_id, name), digest.encode())
+        except OSError as e:
+            LOGGER.warning(f'Compose metadata cache {self.directory} is not available: {e}')
+
+    def load(self, compose_id, name, loader):
+        """
+        Provide the file content from the cache or call loader to obtain it
+        and store it in the cache.
+
+        :param loader: Callable without arguments providing content of the file
+        :type loader: callable
+        :rtype: bytes
+        """
+        content = self.get(compose_id, name)
+        if content is None:
+            content = loader()
+            self.set(compose_id, name, content)
+        return content
+
+    def prune(self):
+        """
+        Remove references which were not used for max_age seconds and
+        objects which are not referenced anymore. Objects are removed only
+        when they were not stored for max_age seconds as well, so that
+        objects which are just being referenced by other process are kept.
+        Files removed while they're used by other process are treated as
+        cache misses and stored again.
+        """
+        if not self.max_age:
+            return
+        expired = time.time() - self.max_age
+        composes_dir = os.path.join(self.directory, 'composes')
+        objects_dir = os.path.join(self.directory, 'objects')
+        referenced = set()
+        removed = 0
+        try:
+            for root, _, files in os.walk(composes_dir, topdown=False):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        if os.stat(path).st_mtime <= expired:
+                            os.unlink(path)
+                            removed += 1
+                            continue
+                        with open(path) as f:
+                            referenced.add(f.read().strip())
+                    except FileNotFoundError:
+                        pass
+                if root != composes_dir:
+                    try:
+                        os.rmdir(root)
+                    except OSError:
+                        # not empty
+                        pass
+            for root, _, files in os.walk(objects_dir):
+                for name in files:
+                    path = os.path.join(root, name)
+                    if name in referenced:
+                        continue
+                    try:
+                        if os.stat(path).st_mtime <= expired:
+                            os.unlink(path)
+                            removed += 1
+                    except FileNotFoundError:
+                        pass
+        except OSError as e:
+            LOGGER.warning(f'Compose metadata cache {self.directory} could not be pruned: {e}')
+            return
+        if removed:
+            LOGGER.debug(f'Removed {removed} files from compose metadata cache {self.directory}')
+
+
+class CachedComposeMetadata():
+    """
+    Wrapper of productmd.compose.Compose loading the compose metadata
+    (composeinfo, rpms, images and modules) from MetadataCache. Other
+    attributes are provided by the wrapped compose.
+
+    :param compose: Compose metadata
+    :type compose: productmd.compose.Compose
+    :param compose_id: Id of the compose used as the cache key
+    :type compose_id: str
+    :param cache: The cache
+    :type cache: MetadataCache
+    """
+    METADATA = {
+        'info': ('composeinfo.json', productmd.composeinfo.ComposeInfo),
+        'rpms': ('rpms.json', productmd.rpms.Rpms),
+        'images': ('images.json', productmd.images.Images),
+        'modules': ('modules.json', productmd.modules.Modules),
+    }
+
+    def __init__(self, settings, compose, compose_id, cache):
+        self.settings = settings
+        self.compose = compose
+        self.compose_id = compose_id
+        self.cache = cache
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        try:
+            filename, metadata_class = self.METADATA[name]
+        except KeyError:
+            return getattr(self.compose, name)
+        # only one thread downloads and parses the metadata
+        with self._lock:
+            try:
+                return self.__dict__[name]
+            except KeyError:
+                pass
+            content = self.cache.load(
+                self.compose_id,
+                filename,
+                lambda: api.httpclient.client(self.settings).read(
+                    '/'.join([self.compose.compose_path, 'metadata', filename])
+                ),
+            )
+            metadata = metadata_class()
+            metadata.loads(content.decode())
+            self.__dict__[name] = metadata
+            return metadata
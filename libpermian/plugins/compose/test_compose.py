@@ -1,5 +1,6 @@
 import unittest
 import re
+from collections import OrderedDict
 from unittest.mock import patch, create_autospec
 import productmd
 
@@ -8,15 +9,17 @@ from libpermian.settings import Settings
 from libpermian.exceptions import StructureConversionError
 from libpermian.events.factory import EventFactory
 from libpermian.plugins.compose import ComposeStructure
-from libpermian.plugins.compose.compose_diff import ComposeDiff
+from libpermian.plugins.compose.compose_diff import ComposeDiff, ComponentIndex
+from libpermian.plugins.compose.compose_info import ComposeInfo
 from libpermian.plugins.kickstart_test import BootIsoStructure
 
 
 class MockComposeResponse():
+    status_code = 200
     def __init__(self, url):
-        self.url = url
-    def geturl(self):
-        return self.url.replace('example.com/compose', 'example.com/here')
+        self.url = url.replace('example.com/compose', 'example.com/here')
+    def close(self):
+        pass
 
 class DummyImage():
     def __init__(self, image_type, image_path):
@@ -52,16 +55,11 @@ def MockProductmdComposeImagesMultipleBoot(location):
     instance.images.images['Other']['x86_64'].add(DummyImage('boot', 'Other/isos/x86_64/boot.iso'))
     return instance
 
-class MockUrlopen():
-    def __init__(self, url):
-        self.url = url
-    def __enter__(self):
-        return MockComposeResponse(self.url)
-    def __exit__(self, type, value, traceback):
-        pass
+def MockHttpGet(client, url, **kwargs):
+    return MockComposeResponse(url)
 
 @patch('productmd.compose.Compose', new=MockProductmdCompose)
-@patch('urllib.request.urlopen', new=MockUrlopen)
+@patch('libpermian.httpclient.HTTPClient.get', new=MockHttpGet)
 class TestEventCompose(unittest.TestCase):
     def setUp(self):
         self.settings = Settings(cmdline_overrides={'compose': {'location': 'http://example.com/compose/%s'}},
@@ -228,6 +226,19 @@ class TestEventCompose(unittest.TestCase):
         )
         self.assertEqual(str(event), 'RHEL-8.3.0-20200701.n.2 baz')
 
+    def test_composeinfo_memoized(self):
+        event = EventFactory.make(self.settings, CliFactory.parse('compose', ['RHEL-8.3.0-20200701.2'])[1])
+        with patch('libpermian.plugins.compose.ComposeInfo', wraps=ComposeInfo) as composeinfo:
+            self.assertEqual(event.compose.type, 'production')
+            self.assertEqual(event.compose.label, 'Hello-3.14')
+            self.assertIs(event.compose.composeinfo, event.compose.composeinfo)
+        composeinfo.assert_called_once_with(
+            self.settings,
+            'http://example.com/here/RHEL-8.3.0-20200701.2',
+            'http://example.com/here/RHEL-8.3.0-20200701.2',
+            'RHEL-8.3.0-20200701.2',
+        )
+
 
 def mock_list_tagged_composes(pattern, tags):
     return [{'distro_id': 1, 'distro_tags': tags, 'distro_version': 'RedHatEnterpriseLinux8.2', 'distro_name': 'RHEL-8.2.0-20200404.0'},
@@ -284,8 +295,80 @@ class TestComposeDiff(unittest.TestCase):
             self.assertEqual(diff.component_names, {'anaconda', 'python-blivet'})
         self.assertTrue(cm.output[0].startswith('WARNING:libpermian.plugins.compose.compose_diff:'))
 
+class ComposeTestIndexed():
+    def __init__(self, id, rpms):
+        self.id = id
+        self.index_loads = 0
+        self.rpms = rpms
+
+    @property
+    def component_index(self):
+        self.index_loads += 1
+        return ComponentIndex.from_rpms(self.rpms)
+
+RPMS1 = {'BaseOS': {'x86_64': {'anaconda-0:29.19.2.17-1.el8.src': {},
+                               'grub2-1:2.02-81.el8.src': {}},
+                    'aarch64': {'anaconda-0:29.19.2.17-1.el8.src': {}}}}
+RPMS2 = {'BaseOS': {'x86_64': {'anaconda-0:29.19.2.17-1.el8.src': {},
+                               'grub2-1:2.02-81.el8.src': {}},
+                    'aarch64': {'anaconda-0:29.21.1.5-1.el8.src': {}}},
+         'AppStream': {'x86_64': {'python-blivet-1:3.1.0-20.el8.src': {}}}}
+
+class TestComponentIndex(unittest.TestCase):
+    def test_index(self):
+        index = ComponentIndex.from_rpms(RPMS2)
+        self.assertEqual(index.index['anaconda'], {'BaseOS': {'x86_64': ['anaconda-0:29.19.2.17-1.el8.src'],
+                                                              'aarch64': ['anaconda-0:29.21.1.5-1.el8.src']}})
+        self.assertEqual(index.versions('anaconda'), {'anaconda-0:29.19.2.17-1.el8.src', 'anaconda-0:29.21.1.5-1.el8.src'})
+        self.assertEqual(index.versions('unknown'), set())
+        self.assertEqual(set(index.names), {'anaconda', 'grub2', 'python-blivet'})
+        self.assertEqual(index.components, {'anaconda-0:29.19.2.17-1.el8.src',
+                                            'anaconda-0:29.21.1.5-1.el8.src',
+                                            'grub2-1:2.02-81.el8.src',
+                                            'python-blivet-1:3.1.0-20.el8.src'})
+
+    def test_serialization(self):
+        index = ComponentIndex.from_rpms(RPMS2)
+        loaded = ComponentIndex.loads(index.dumps())
+        self.assertEqual(loaded.index, index.index)
+        self.assertEqual(loaded.components, index.components)
+        with self.assertRaises(ValueError):
+            ComponentIndex.loads('{"version": 0, "components": {}}')
+
+    def test_diff(self):
+        self.assertEqual(ComponentIndex.from_rpms(RPMS1).diff(ComponentIndex.from_rpms(RPMS2)), {'anaconda', 'python-blivet'})
+        self.assertEqual(ComponentIndex.from_rpms(RPMS2).diff(ComponentIndex.from_rpms(RPMS2)), set())
+
+    def test_compose_diff_memoized(self):
+        first = ComposeTestIndexed('OS-1.0-20220221.1', RPMS1)
+        second = ComposeTestIndexed('OS-1.0-20220222.1', RPMS2)
+        self.assertEqual(ComposeDiff(first, second).component_names, {'anaconda', 'python-blivet'})
+        # new structures of the same composes, e.g. obtained by compose.previous()
+        other_first = ComposeTestIndexed('OS-1.0-20220221.1', RPMS1)
+        other_second = ComposeTestIndexed('OS-1.0-20220222.1', RPMS2)
+        self.assertEqual(ComposeDiff(other_first, other_second).component_names, {'anaconda', 'python-blivet'})
+        self.assertEqual((first.index_loads, second.index_loads), (1, 1))
+        self.assertEqual((other_first.index_loads, other_second.index_loads), (0, 0))
+        self.assertEqual(ComposeDiff(second, first).component_names, {'anaconda', 'python-blivet'})
+
+    @patch.object(ComposeDiff, 'COMPONENT_NAMES_CACHE_SIZE', 2)
+    @patch.object(ComposeDiff, '_component_names', OrderedDict())
+    def test_compose_diff_memo_bounded(self):
+        first = ComposeTestIndexed('OS-1.0-20220221.1', RPMS1)
+        seconds = [ComposeTestIndexed(f'OS-1.0-2022022{day}.1', RPMS2) for day in range(2, 5)]
+        for second in seconds:
+            ComposeDiff(first, second).component_names
+        self.assertEqual(list(ComposeDiff._component_names), [
+            ('OS-1.0-20220221.1', 'OS-1.0-20220223.1'),
+            ('OS-1.0-20220221.1', 'OS-1.0-20220224.1'),
+        ])
+        # the evicted diff is computed again
+        ComposeDiff(first, seconds[0]).component_names
+        self.assertEqual(seconds[0].index_loads, 2)
+
+
 @patch('productmd.compose.Compose', new=MockProductmdComposeImages)
-@patch('urllib.request.urlopen', new=MockUrlopen)
+@patch('libpermian.httpclient.HTTPClient.get', new=MockHttpGet)
 class TestComposeToBootIso(unittest.TestCase):
     def setUp(self):
         self.settings = Settings(cmdline_overrides={'compose': {'location': 'http://example.com/compose/%s/'}},
@@ -300,7 +383,7 @@ class TestComposeToBootIso(unittest.TestCase):
                                                  'aarch64': 'http://example.com/here/OS-1.0.2-20220221.1/Main/isos/aarch64/boot.iso'})
 
 @patch('productmd.compose.Compose', new=MockProductmdComposeImagesMultipleBoot)
-@patch('urllib.request.urlopen', new=MockUrlopen)
+@patch('libpermian.httpclient.HTTPClient.get', new=MockHttpGet)
 class TestComposeToBootIsoFail(unittest.TestCase):
     def setUp(self):
         self.settings = Settings(cmdline_overrides={'compose': {'location': 'http://example.com/compose/%s/'}},
@@ -0,0 +1,143 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+from libpermian.settings import Settings
+from libpermian.plugins.compose.metadata_cache import MetadataCache, CachedComposeMetadata, metadata_cache
+from libpermian.plugins.compose.compose_info import ComposeInfo
+
+
+class FakeRpms():
+    def loads(self, content):
+        self.content = content
+        self.rpms = json.loads(content)['rpms']
+
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = MetadataCache(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def objects(self):
+        return [
+            name
+            for _, _, files in os.walk(os.path.join(self.tmpdir.name, 'objects'))
+            for name in files
+        ]
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get('OS-1.0-20220221.1', 'rpms.json'))
+        self.cache.set('OS-1.0-20220221.1', 'rpms.json', b'{"rpms": 1}')
+        self.assertEqual(self.cache.get('OS-1.0-20220221.1', 'rpms.json'), b'{"rpms": 1}')
+        self.assertIsNone(self.cache.get('OS-1.0-20220221.2', 'rpms.json'))
+        # another instance (pipeline) uses the same files
+        self.assertEqual(MetadataCache(self.tmpdir.name).get('OS-1.0-20220221.1', 'rpms.json'), b'{"rpms": 1}')
+
+    def test_content_addressed(self):
+        self.cache.set('OS-1.0-20220221.1', 'rpms.json', b'same')
+        self.cache.set('OS-1.0-20220221.2', 'rpms.json', b'same')
+        self.cache.set('OS-1.0-20220221.2', 'BaseOS/x86_64/.treeinfo', b'other')
+        self.assertEqual(len(self.objects()), 2)
+        self.assertEqual(self.cache.get('OS-1.0-20220221.2', 'BaseOS/x86_64/.treeinfo'), b'other')
+
+    def test_load(self):
+        loader = MagicMock(return_value=b'content')
+        self.assertEqual(self.cache.load('OS-1.0-20220221.1', 'images.json', loader), b'content')
+        self.assertEqual(self.cache.load('OS-1.0-20220221.1', 'images.json', loader), b'content')
+        loader.assert_called_once_with()
+
+    def test_corrupted(self):
+        self.cache.set('OS-1.0-20220221.1', 'rpms.json', b'content')
+        path, = [os.path.join(root, name) for root, _, files in os.walk(os.path.join(self.tmpdir.name, 'objects')) for name in files]
+        with open(path, 'wb') as f:
+            f.write(b'garbage')
+        with self.assertLogs('libpermian.plugins.compose.metadata_cache', level='WARNING'):
+            self.assertIsNone(self.cache.get('OS-1.0-20220221.1', 'rpms.json'))
+
+    def test_prune(self):
+        cache = MetadataCache(self.tmpdir.name, max_age=60)
+        with patch('time.time', return_value=1000):
+            cache.set('OS-1.0-20220221.1', 'rpms.json', b'old')
+            cache.set('OS-1.0-20220221.1', 'images.json', b'shared')
+            cache.set('OS-1.0-20220221.2', 'rpms.json', b'new')
+            cache.set('OS-1.0-20220221.2', 'images.json', b'shared')
+        for root, _, files in os.walk(self.tmpdir.name):
+            for name in files:
+                os.utime(os.path.join(root, name), (1000, 1000))
+        # the second compose is still used
+        cache.get('OS-1.0-20220221.2', 'rpms.json')
+        cache.get('OS-1.0-20220221.2', 'images.json')
+        with patch('time.time', return_value=1060):
+            cache.prune()
+        self.assertIsNone(cache.get('OS-1.0-20220221.1', 'rpms.json'))
+        self.assertIsNone(cache.get('OS-1.0-20220221.1', 'images.json'))
+        self.assertEqual(cache.get('OS-1.0-20220221.2', 'rpms.json'), b'new')
+        self.assertEqual(cache.get('OS-1.0-20220221.2', 'images.json'), b'shared')
+        self.assertEqual(len(self.objects()), 2)
+        self.assertEqual(os.listdir(os.path.join(self.tmpdir.name, 'composes')), ['OS-1.0-20220221.2'])
+
+    def test_prune_disabled(self):
+        self.cache.set('OS-1.0-20220221.1', 'rpms.json', b'content')
+        with patch('time.time', return_value=float('inf')):
+            self.cache.prune()
+        self.assertEqual(self.cache.get('OS-1.0-20220221.1', 'rpms.json'), b'content')
+
+    def test_disabled(self):
+        settings = Settings({}, {}, [])
+        self.assertIsNone(metadata_cache(settings))
+        settings = Settings({'compose': {'metadata_cache': self.tmpdir.name}}, {}, [])
+        self.assertIsInstance(metadata_cache(settings), MetadataCache)
+        self.assertIs(metadata_cache(settings), metadata_cache(settings))
+
+
+@patch.dict(CachedComposeMetadata.METADATA, {'rpms': ('rpms.json', FakeRpms)})
+class TestCachedComposeMetadata(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.settings = Settings({}, {}, [])
+        self.compose = MagicMock(compose_path='http://example.com/compose/OS-1.0-20220221.1/compose')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @patch('libpermian.httpclient.HTTPClient.read', return_value=b'{"rpms": {}}')
+    def test_download_once(self, read):
+        for _ in range(2):
+            metadata = CachedComposeMetadata(self.settings, self.compose, 'OS-1.0-20220221.1', MetadataCache(self.tmpdir.name))
+            self.assertEqual(metadata.rpms.content, '{"rpms": {}}')
+            self.assertIs(metadata.rpms, metadata.rpms)
+        read.assert_called_once_with('http://example.com/compose/OS-1.0-20220221.1/compose/metadata/rpms.json')
+
+    def test_other_attributes(self):
+        metadata = CachedComposeMetadata(self.settings, self.compose, 'OS-1.0-20220221.1', MetadataCache(self.tmpdir.name))
+        self.assertEqual(metadata.compose_path, 'http://example.com/compose/OS-1.0-20220221.1/compose')
+
+
+@patch.dict(CachedComposeMetadata.METADATA, {'rpms': ('rpms.json', FakeRpms)})
+class TestCachedComponentIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.settings = Settings({'compose': {'metadata_cache': self.tmpdir.name}}, {}, [])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @patch('libpermian.httpclient.HTTPClient.read')
+    @patch('productmd.compose.Compose')
+    def test_component_index(self, compose, read):
+        location = 'http://example.com/compose/OS-1.0-20220221.1'
+        compose.return_value.compose_path = location
+        read.return_value = json.dumps({'rpms': {'BaseOS': {'x86_64': {'anaconda-0:29.19.2.17-1.el8.src': {}}}}}).encode()
+        components = ComposeInfo(self.settings, location, location, 'OS-1.0-20220221.1').component_index.components
+        self.assertEqual(components, {'anaconda-0:29.19.2.17-1.el8.src'})
+        read.assert_called_once_with(f'{location}/metadata/rpms.json')
+        # the index is loaded from the cache without parsing the rpms metadata
+        with patch.object(FakeRpms, 'loads') as loads:
+            composeinfo = ComposeInfo(self.settings, location, location, 'OS-1.0-20220221.1')
+            self.assertEqual(composeinfo.component_index.components, components)
+        loads.assert_not_called()
@@ -1,4 +1,3 @@
-import requests
 import jinja2
 import logging
 import json
@@ -27,6 +26,7 @@ class GitHubPullRequestReportSender(BaseReportSender):
     """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.httpClient = api.httpclient.client(self.settings)
         github_token = self.settings.get('github', 'token')
         self.pr_id = self.settings.get('github', 'pull-request')
         self.repository = self.settings.get('github', 'repository')
@@ -92,7 +92,7 @@ class GitHubPullRequestReportSender(BaseReportSender):
             return
 
         # Get head SHA from pull request
-        pr_response = requests.get(
+        pr_response = self.httpClient.get(
             f'{self.api_url}/repos/{self.repository}/pulls/{self.pr_id}',
             headers=self.headers)
 
@@ -102,7 +102,7 @@ class GitHubPullRequestReportSender(BaseReportSender):
         head_sha = pr_response.json()['head']['sha']
 
         # Create new check run
-        cr_response = requests.post(
+        cr_response = self.httpClient.post(
             f'{self.api_url}/repos/{self.repository}/check-runs',
             data=self.make_payload('queued', head_sha=head_sha),
             headers=self.headers)
@@ -122,10 +122,12 @@ class GitHubPullRequestReportSender(BaseReportSender):
             LOGGER.info(f'Dry run reporting: {payload}')
             return
 
-        cru_response = requests.patch(
+        # the payload holds the whole state of the check-run, safe to retry
+        cru_response = self.httpClient.patch(
             f'{self.api_url}/repos/{self.repository}/check-runs/{self.check_run_id}',
             data=payload,
-            headers=self.headers)
+            headers=self.headers,
+            idempotent=True)
 
         if cru_response.status_code != 200:
             raise GitHubReportingException(cru_response.status_code, cru_response.text)
@@ -65,9 +65,9 @@ class TestGitHubPullRequestReportSender(unittest.TestCase):
         self.crc = CaseRunConfiguration(DummyTestCase(), {'test': '1'}, [self.library.testplans['GitHub testplan 1']])
         self.caseRunConfigurations = CaseRunConfigurationsList([self.crc])
 
-    @patch('requests.get')
-    @patch('requests.post')
-    @patch('requests.patch')
+    @patch('libpermian.httpclient.HTTPClient.get')
+    @patch('libpermian.httpclient.HTTPClient.post')
+    @patch('libpermian.httpclient.HTTPClient.patch')
     def test_reporting_default(self, requests_patch, requests_post, requests_get):
         requests_get.return_value = ResultMock200()
         requests_patch.return_value = ResultMock200()
@@ -94,11 +94,12 @@ class TestGitHubPullRequestReportSender(unittest.TestCase):
         
         requests_patch.assert_called_with('https://api.github.com/repos/user/test/check-runs/47261',
             data='{"name": "GitHub testplan 1", "status": "completed", "output": {"title": "GitHub testplan 1", "summary": "Testplan for testing github-pr report sender", "text": "| Test case | Configuration | Status | Result |\\n| --------- | ------------- | ------ | ------ |\\n| Dummy test case |test: 1, | complete | PASS |"}, "conclusion": "success"}',
-            headers={'Accept': 'application/vnd.github.v3+json', 'Authorization': 'token 1234'})
+            headers={'Accept': 'application/vnd.github.v3+json', 'Authorization': 'token 1234'},
+            idempotent=True)
 
-    @patch('requests.get')
-    @patch('requests.post')
-    @patch('requests.patch')
+    @patch('libpermian.httpclient.HTTPClient.get')
+    @patch('libpermian.httpclient.HTTPClient.post')
+    @patch('libpermian.httpclient.HTTPClient.patch')
     def test_reporting_custom(self, requests_patch, requests_post, requests_get):
         requests_get.return_value = ResultMock200()
         requests_patch.return_value = ResultMock200()
@@ -125,7 +126,8 @@ class TestGitHubPullRequestReportSender(unittest.TestCase):
         
         requests_patch.assert_called_with('https://api.github.com/repos/user/test/check-runs/47261',
             data='{"name": "Special check", "status": "completed", "output": {"title": "Special check", "summary": "Summary", "text": "PASS"}, "conclusion": "success"}',
-            headers={'Accept': 'application/vnd.github.v3+json', 'Authorization': 'token 1234'})
+            headers={'Accept': 'application/vnd.github.v3+json', 'Authorization': 'token 1234'},
+            idempotent=True)
 
 class TestGitHubPullRequestReportSenderThrottled(unittest.TestCase):
     def setUp(self):
@@ -140,9 +142,9 @@ class TestGitHubPullRequestReportSenderThrottled(unittest.TestCase):
         self.crc = CaseRunConfiguration(DummyTestCase(), {'test': '1'}, [self.library.testplans['GitHub testplan 1']])
         self.caseRunConfigurations = CaseRunConfigurationsList([self.crc])
 
-    @patch('requests.get')
-    @patch('requests.post')
-    @patch('requests.patch')
+    @patch('libpermian.httpclient.HTTPClient.get')
+    @patch('libpermian.httpclient.HTTPClient.post')
+    @patch('libpermian.httpclient.HTTPClient.patch')
     def test_reporting_throttled(self, requests_patch, requests_post, requests_get):
         requests_get.return_value = ResultMock200()
         requests_patch.return_value = ResultMock200()
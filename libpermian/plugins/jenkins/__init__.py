@@ -1,7 +1,7 @@
 import logging
-import requests
 import json
 
+from ..api.httpclient import client
 from ..api.hooks import threaded_callback_on
 from ...webui.hooks import WebUI_started, static_WebUI_rendered
 
@@ -45,8 +45,9 @@ def set_webui_link_description(settings, event, URL, is_artifact=False):
     }
 
     LOGGER.debug(f'Setting jenkins build info: {submit_url}; {str(payload)}')
-    response = requests.post(submit_url, data={'Submit': 'save', 'json': json.dumps(payload)},
-                             auth=(settings.get('jenkins', 'username'), settings.get('jenkins', 'password')))
+    response = client(settings).post(submit_url, data={'Submit': 'save', 'json': json.dumps(payload)},
+                                     auth=(settings.get('jenkins', 'username'), settings.get('jenkins', 'password')),
+                                     idempotent=True)
     if response.status_code != 200:
         LOGGER.error(f'Can\'t set jenkins build name and description: {response.status_code}: {response.text}')
 
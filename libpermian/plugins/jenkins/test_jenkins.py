@@ -23,7 +23,7 @@ class TestJenkins(unittest.TestCase):
         cls.webui.pipeline.event = 'TestEvent'
         cls.webui.baseurl = 'http://example.com:1234/webui'
 
-    @patch('requests.post')
+    @patch('libpermian.httpclient.HTTPClient.post')
     def test_set_build_info(self, requests_post):
         requests_post.return_value = ResultMock()
         self.webui.pipeline.settings = Settings(environment={}, settings_locations=[],
@@ -36,9 +36,10 @@ class TestJenkins(unittest.TestCase):
         requests_post.assert_called_with('https://jenkins.example.com/job/pipeline/1/configSubmit',
             data={'Submit': 'save',
                   'json': '{"displayName": "#1: TestEvent", "description": "<a href=\\"http://example.com:1234/webui\\">WebUI</a>"}'},
-            auth=('user', 'pass'))
+            auth=('user', 'pass'),
+            idempotent=True)
 
-    @patch('requests.post')
+    @patch('libpermian.httpclient.HTTPClient.post')
     def test_not_set_build_info(self, requests_post):
         requests_post.return_value = ResultMock()
         self.webui.pipeline.settings = Settings(environment={}, settings_locations=[],
@@ -50,7 +51,7 @@ class TestJenkins(unittest.TestCase):
         set_jenkins_build_info(self.webui)
         requests_post.assert_not_called()
 
-    @patch('requests.post')
+    @patch('libpermian.httpclient.HTTPClient.post')
     def test_set_static_webui_build_info(self, requests_post):
         requests_post.return_value = ResultMock()
         self.webui.pipeline.settings = Settings(environment={}, settings_locations=[],
@@ -63,9 +64,10 @@ class TestJenkins(unittest.TestCase):
         requests_post.assert_called_with('https://jenkins.example.com/job/pipeline/1/configSubmit',
             data={'Submit': 'save',
                   'json': '{"displayName": "#1: TestEvent", "description": "<a href=\\"https://jenkins.example.com/job/pipeline/1/artifact/./some/path/file.suffix\\">WebUI</a>"}'},
-            auth=('user', 'pass'))
+            auth=('user', 'pass'),
+            idempotent=True)
 
-    @patch('requests.post')
+    @patch('libpermian.httpclient.HTTPClient.post')
     def test_not_set_static_webui_build_info(self, requests_post):
         self.webui.pipeline.settings = Settings(environment={}, settings_locations=[],
             cmdline_overrides={'jenkins': {'url': 'https://jenkins.example.com',
@@ -1,10 +1,8 @@
 import os
 import re
 import json
-import xmlrpc.client
 import productmd
-import urllib.request
-import urllib.error
+import requests
 import logging
 import time
 import datetime
@@ -18,6 +16,7 @@ from libpermian.cli.parser import bool_argument, ToPayload, AppendToPayload
 from libpermian.plugins.compose import ComposeStructure
 from libpermian.plugins.compose.exceptions import ComposeNotAvailable
 from libpermian.plugins.beaker import BeakerCompose
+from libpermian.plugins.koji.client import koji_client
 
 
 LOGGER = logging.getLogger(__name__)
@@ -50,12 +49,13 @@ class KojiBuild(BaseStructure):
         self._info = None
         self.hub_url = self.settings.get('koji', 'hub_url')
         self.nvr = nvr
-        self.build_id = None # have it set to None until it's discovered
-        self.build_id = build_id or self.info['build_id']
+        # the build info is discovered on first access (or by prefetch) when
+        # not provided
+        self._build_id = build_id
         self._tags = tags
         self._new_tag = new_tag
-        self.task_id = task_id or self.info['task_id']
-        self.package_name = package_name or self.info['package_name']
+        self._task_id = task_id
+        self._package_name = package_name
         self.composes_baseurl = self.settings.get('koji', 'testcompose_baseurl')
         self._to_compose_exception = None
 
@@ -63,18 +63,50 @@ class KojiBuild(BaseStructure):
     def info(self):
         if self._info is not None:
             return self._info
-        koji = xmlrpc.client.ServerProxy(self.hub_url)
-        self._info = koji.getBuild(self.build_id or self.nvr, True) # use build_id if specified
+        self._info = koji_client(self.settings).get_build(self._build_id or self.nvr) # use build_id if specified
         return self._info
 
+    @property
+    def build_id(self):
+        if self._build_id is None:
+            self._build_id = self.info['build_id']
+        return self._build_id
+
+    @property
+    def task_id(self):
+        if self._task_id is None:
+            self._task_id = self.info['task_id']
+        return self._task_id
+
+    @property
+    def package_name(self):
+        if self._package_name is None:
+            self._package_name = self.info['package_name']
+        return self._package_name
+
+    def prefetch(self):
+        # get both build info and tags in one request
+        needs_info = None in (self._build_id, self._task_id, self._package_name) and self._info is None
+        if needs_info and self._tags is None:
+            build = self._build_id or self.nvr
+            self._info, tags = koji_client(self.settings).call_many([
+                ('getBuild', (build, True)),
+                ('listTags', (build, None, False)),
+            ])
+            self._tags = tuple(tag['name'] for tag in tags)
+        # the properties memoize the discovered values
+        _ = self.build_id
+        _ = self.task_id
+        _ = self.package_name
+        _ = self.tags
+
     @property
     def tags(self):
         if self._tags is not None:
             return self._tags
-        koji = xmlrpc.client.ServerProxy(self.hub_url, allow_none=True)
         self._tags = tuple(
             tag['name'] for tag in
-            koji.listTags(self.build_id, None, False)
+            koji_client(self.settings).list_tags(self.build_id)
         )
         return self._tags
 
@@ -96,21 +128,23 @@ class KojiBuild(BaseStructure):
         entrypoint = f'{self.composes_baseurl}/{self.task_id}-{self.package_name}'
         entrypoint_dir = os.path.dirname(entrypoint)
 
+        httpClient = api.httpclient.client(self.settings)
+
         LOGGER.debug(f'Trying to locate the compose {entrypoint} until timeout {wait_until}')
         while wait_until is None or datetime.datetime.now() < wait_until:
             try:
-                with urllib.request.urlopen(entrypoint, timeout=5) as response:
-                    compose_relpaths = response.read().decode().strip()
-                    compose_relpath = compose_relpaths.split('\n')[-1]
-                    compose_path = f'{entrypoint_dir}/{compose_relpath}'
-                    try:
-                        compose_id = productmd.compose.Compose(compose_path).info.compose.id
-                        LOGGER.debug(f'Found compose {compose_id} at {compose_path}')
-                        return ComposeStructure(self.settings, compose_id, location=compose_path)
-                    except RuntimeError: # raised by productmd when failed to load compose metadata
-                        pass
-            except urllib.error.URLError as e:
-                LOGGER.debug(e.reason)
+                # the attempts are repeated here, don't let the client retry
+                compose_relpaths = httpClient.read(entrypoint, timeout=5, retries=0).decode().strip()
+                compose_relpath = compose_relpaths.split('\n')[-1]
+                compose_path = f'{entrypoint_dir}/{compose_relpath}'
+                try:
+                    compose_id = productmd.compose.Compose(compose_path).info.compose.id
+                    LOGGER.debug(f'Found compose {compose_id} at {compose_path}')
+                    return ComposeStructure(self.settings, compose_id, location=compose_path)
+                except RuntimeError: # raised by productmd when failed to load compose metadata
+                    pass
+            except (requests.RequestException, OSError) as e:
+                LOGGER.debug(e)
             # Don't repeat attempts if timeout was set to 0
             if timeout == 0:
                 break
@@ -137,6 +171,10 @@ class KojiEvent(Event):
     def __init__(self, settings, type, koji_build, **kwargs):
         super().__init__(settings, type, koji_build=koji_build, **kwargs)
 
+    @property
+    def prefetch_structures(self):
+        return super().prefetch_structures + ('product',)
+
     def __str__(self):
         return f"{self.koji_build.package_name} {self.koji_build.nvr} {self.koji_build.new_tag}"
 
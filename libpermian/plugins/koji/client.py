@@ -0,0 +1,165 @@
+import copy
+import threading
+import time
+import weakref
+import xmlrpc.client
+
+from libpermian.plugins import api
+
+_clients = weakref.WeakKeyDictionary()
+_clientsLock = threading.Lock()
+
+
+def koji_client(settings):
+    """
+    Provide KojiClient shared by everything using the same settings.
+
+    :param settings: Pipeline settings object
+    :type settings: libpermian.settings.Settings
+    :rtype: KojiClient
+    """
+    with _clientsLock:
+        try:
+            return _clients[settings]
+        except KeyError:
+            client = _clients[settings] = KojiClient(settings)
+            return client
+
+
+class KojiClient():
+    """
+    Client of the koji hub (koji.hub_url) sending read-only queries over
+    the shared HTTP client (see libpermian.httpclient) so that the
+    connection to the hub is reused. Multiple queries are sent in one
+    multiCall request and results of the queries are cached for
+    koji.cache_ttl seconds.
+
+    Only read-only queries should be sent using this client as they're
+    cached and retried.
+
+    :param settings: Pipeline settings object
+    :type settings: libpermian.settings.Settings
+    """
+    MULTICALL_SIZE = 100
+    """Maximal number of queries sent in one multiCall request"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.hub_url = settings.get('koji', 'hub_url')
+        self.ttl = settings.getfloat('koji', 'cache_ttl')
+        self.proxy = api.httpclient.client(settings).xmlrpc(self.hub_url, idempotent=True, allow_none=True)
+        self._cache = {}
+        """Mapping of (method, args) -> (expiration time, result)"""
+        self._lock = threading.Lock()
+
+    def _cached(self, call):
+        with self._lock:
+            try:
+                expires, result = self._cache[call]
+            except KeyError:
+                raise KeyError(call) from None
+            if expires <= time.monotonic():
+                del self._cache[call]
+                raise KeyError(call)
+            return copy.deepcopy(result)
+
+    def _store(self, call, result):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._cache[call] = (time.monotonic() + self.ttl, copy.deepcopy(result))
+
+    def _multicall(self, calls):
+        results = self.proxy.multiCall([
+            {'methodName': method, 'params': list(args)}
+            for method, args in calls
+        ])
+        for (method, args), result in zip(calls, results):
+            # successful calls are wrapped in list, failed ones are fault dicts
+            if isinstance(result, dict):
+                yield xmlrpc.client.Fault(result.get('faultCode'), result.get('faultString'))
+            else:
+                yield result[0]
+
+    def call_many(self, calls):
+        """
+        Perform the queries which are not cached in one multiCall request
+        (single query is sent directly).
+
+        :param calls: Pairs of method name and tuple of its arguments
+        :type calls: list of tuples
+        :raises xmlrpc.client.Fault: When any of the queries failed, results of the other queries are cached anyway.
+        :return: Results of the queries in the same order as the calls
+        :rtype: list
+        """
+        calls = [(method, tuple(args)) for method, args in calls]
+        results = [None] * len(calls)
+        missing = {}
+        for index, call in enumerate(calls):
+            try:
+                results[index] = self._cached(call)
+            except KeyError:
+                missing.setdefault(call, []).append(index)
+        missing_calls = list(missing)
+        if len(missing_calls) == 1:
+            method, args = missing_calls[0]
+            fetched = [getattr(self.proxy, method)(*args)]
+        else:
+            fetched = []
+            for start in range(0, len(missing_calls), self.MULTICALL_SIZE):
+                fetched.extend(self._multicall(missing_calls[start:start+self.MULTICALL_SIZE]))
+        fault = None
+        for call, result in zip(missing_calls, fetched):
+            if isinstance(result, xmlrpc.client.Fault):
+                fault = fault or result
+                continue
+            self._store(call, result)
+            for index in missing[call]:
+                results[index] = copy.deepcopy(result)
+        if fault is not None:
+            raise fault
+        return results
+
+    def call(self, method, *args):
+        return self.call_many([(method, args)])[0]
+
+    def get_build(self, build):
+        """
+        :param build: Build id or NVR
+        :type build: int or str
+        :return: Build info
+        :rtype: dict
+        """
+        return self.call('getBuild', build, True)
+
+    def list_tags(self, build):
+        """
+        :param build: Build id or NVR
+        :type build: int or str
+        :return: Tags of the build
+        :rtype: list of dict
+        """
+        return self.call('listTags', build, None, False)
+
+    def get_builds(self, builds):
+        """
+        :param builds: Build ids or NVRs
+        :type builds: list
+        :return: Build infos in the same order as builds
+        :rtype: list of dict
+        """
+        return self.call_many([('getBuild', (build, True)) for build in builds])
+
+    def list_tags_many(self, builds):
+        """
+        :param builds: Build ids or NVRs
+        :type builds: list
+        :return: Tags of the builds in the same order as builds
+        :rtype: list of lists
+        """
+        return self.call_many([('listTags', (build, None, False)) for build in builds])
+
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._cache.clear()
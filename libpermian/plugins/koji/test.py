@@ -1,9 +1,8 @@
 import unittest
 import re
-from unittest.mock import patch, create_autospec, call
+from unittest.mock import patch, create_autospec, call, ANY
 import productmd
-import io
-import urllib.error
+import requests
 
 from libpermian.events.factory import EventFactory
 from libpermian.cli.factory import CliFactory
@@ -111,7 +110,7 @@ class TestKojiEventStructure(unittest.TestCase):
         self.assertEqual(koji_build.task_id, self.task_id)
         self.assertEqual(koji_build.package_name, self.package_name)
         self.assertEqual(koji_build.new_tag, self.new_tag)
-        koji_proxy_class.assert_called_with(self.hub_url, allow_none=True)
+        koji_proxy_class.assert_called_with(self.hub_url, transport=ANY, allow_none=True)
         koji_proxy_class.return_value.getBuild.assert_called_once_with(self.nvr, True)
         koji_proxy_class.return_value.listTags.assert_called_once_with(self.build_id, None, False)
 
@@ -130,9 +129,9 @@ class TestKojiEventStructure(unittest.TestCase):
         koji_proxy_class.assert_not_called()
         koji_proxy_class.return_value.getBuild.assert_not_called()
 
-    @patch('urllib.request.urlopen')
+    @patch('libpermian.httpclient.HTTPClient.read')
     @patch('productmd.compose.Compose')
-    def test_convert_compose(self, Compose, urlopen, koji_proxy_class):
+    def test_convert_compose(self, Compose, http_read, koji_proxy_class):
         compose_id = 'FooBar-1.23-123456.t.98'
         compose_relpath = '../some_compose_dir'
         koji_proxy_class.return_value.getBuild.return_value = {
@@ -144,7 +143,7 @@ class TestKojiEventStructure(unittest.TestCase):
             {'name': self.new_tag},
         )
         Compose.return_value.info.compose.id = compose_id
-        urlopen.return_value = io.BytesIO(bytes(f'{compose_relpath}\n', 'utf-8'))
+        http_read.return_value = bytes(f'{compose_relpath}\n', 'utf-8')
         koji_build = KojiBuild(self.settings, self.nvr)
         compose = koji_build.to_compose()
         self.assertEqual(compose.id, compose_id)
@@ -153,9 +152,9 @@ class TestKojiEventStructure(unittest.TestCase):
             f'{self.composes_baseurl}/{compose_relpath}'
         )
 
-    @patch('urllib.request.urlopen')
+    @patch('libpermian.httpclient.HTTPClient.read')
     @patch('productmd.compose.Compose')
-    def test_convert_compose_multiple(self, Compose, urlopen, koji_proxy_class):
+    def test_convert_compose_multiple(self, Compose, http_read, koji_proxy_class):
         compose_id = 'FooBar-1.23-123456.t.98'
         mocked_compose_relpath = '../some_compose_dir\n../another_compose_dir\n'
         desired_compose_relpath = '../another_compose_dir'
@@ -168,7 +167,7 @@ class TestKojiEventStructure(unittest.TestCase):
             {'name': self.new_tag},
         )
         Compose.return_value.info.compose.id = compose_id
-        urlopen.return_value = io.BytesIO(bytes(mocked_compose_relpath, 'utf-8'))
+        http_read.return_value = bytes(mocked_compose_relpath, 'utf-8')
         koji_build = KojiBuild(self.settings, self.nvr)
         compose = koji_build.to_compose()
         self.assertEqual(compose.id, compose_id)
@@ -177,9 +176,9 @@ class TestKojiEventStructure(unittest.TestCase):
             f'{self.composes_baseurl}/{desired_compose_relpath}'
         )
 
-    @patch('urllib.request.urlopen')
+    @patch('libpermian.httpclient.HTTPClient.read')
     @patch('productmd.compose.Compose')
-    def test_convert_compose_fail(self, Compose, urlopen, koji_proxy_class):
+    def test_convert_compose_fail(self, Compose, http_read, koji_proxy_class):
         compose_id = 'FooBar-1.23-123456.t.98'
         compose_relpath = '../some_compose_dir'
         koji_proxy_class.return_value.getBuild.return_value = {
@@ -190,7 +189,7 @@ class TestKojiEventStructure(unittest.TestCase):
         koji_proxy_class.return_value.listTags.return_value = (
             {'name': self.new_tag},
         )
-        urlopen.side_effect = urllib.error.URLError('reason')
+        http_read.side_effect = requests.ConnectionError('reason')
         koji_build = KojiBuild(self.settings, self.nvr)
         with self.assertRaises(ComposeNotAvailable):
             compose = koji_build.to_compose()
@@ -198,12 +197,12 @@ class TestKojiEventStructure(unittest.TestCase):
         # testcompose_timeout=3
         # testcompose_retry_interval=1.2
         # There should be 3 attempts (but not more) before the timeout
-        urlopen.assert_has_calls([
-            call(entrypoint, timeout=5),
-            call(entrypoint, timeout=5),
-            call(entrypoint, timeout=5)
+        http_read.assert_has_calls([
+            call(entrypoint, timeout=5, retries=0),
+            call(entrypoint, timeout=5, retries=0),
+            call(entrypoint, timeout=5, retries=0)
         ])
-        self.assertEqual(urlopen.call_count, 3)
+        self.assertEqual(http_read.call_count, 3)
 
     def test_convert_product_base(self, tag):
         expected_mapping = {
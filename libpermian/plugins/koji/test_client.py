@@ -0,0 +1,144 @@
+import threading
+import unittest
+import xmlrpc.client
+import xmlrpc.server
+
+from libpermian.settings import Settings
+
+from . import KojiBuild
+from .client import koji_client, KojiClient
+
+
+class QuietHandler(xmlrpc.server.SimpleXMLRPCRequestHandler):
+    rpc_paths = ('/kojihub',)
+
+    def log_message(self, *args):
+        pass
+
+
+class KojiHubStandIn():
+    """Local XML-RPC server providing subset of the koji hub API"""
+    BUILDS = {
+        'foo-1.2-3.dt4': {'build_id': 1001, 'task_id': 1337, 'package_name': 'foo', 'nvr': 'foo-1.2-3.dt4'},
+        'bar-4.5-6.dt4': {'build_id': 1002, 'task_id': 1338, 'package_name': 'bar', 'nvr': 'bar-4.5-6.dt4'},
+    }
+    TAGS = {
+        'foo-1.2-3.dt4': [{'name': 'acme-1.2.3-poof'}, {'name': 'foo'}],
+        'bar-4.5-6.dt4': [{'name': 'bar'}],
+    }
+
+    def __init__(self):
+        self.server = xmlrpc.server.SimpleXMLRPCServer(('127.0.0.1', 0), QuietHandler, allow_none=True, logRequests=False)
+        self.server.register_function(self.getBuild, 'getBuild')
+        self.server.register_function(self.listTags, 'listTags')
+        self.server.register_function(self.multiCall, 'multiCall')
+        self.requests = []
+        self.calls = []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/kojihub'
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _build(self, build):
+        for nvr, info in self.BUILDS.items():
+            if build in (nvr, info['build_id']):
+                return nvr
+        raise xmlrpc.client.Fault(1000, f'No such build: {build}')
+
+    def _getBuild(self, build, strict=False):
+        self.calls.append(('getBuild', build))
+        return self.BUILDS[self._build(build)]
+
+    def _listTags(self, build=None, package=None, perms=True):
+        self.calls.append(('listTags', build))
+        return self.TAGS[self._build(build)]
+
+    def getBuild(self, *args):
+        self.requests.append('getBuild')
+        return self._getBuild(*args)
+
+    def listTags(self, *args):
+        self.requests.append('listTags')
+        return self._listTags(*args)
+
+    def multiCall(self, calls):
+        self.requests.append('multiCall')
+        results = []
+        for call in calls:
+            try:
+                method = getattr(self, '_' + call['methodName'])
+                results.append([method(*call['params'])])
+            except xmlrpc.client.Fault as fault:
+                results.append({'faultCode': fault.faultCode, 'faultString': fault.faultString})
+        return results
+
+
+class TestKojiClient(unittest.TestCase):
+    def setUp(self):
+        self.hub = KojiHubStandIn()
+        self.settings = Settings({'koji': {'hub_url': self.hub.url}}, {}, [])
+
+    def tearDown(self):
+        self.hub.stop()
+
+    def test_shared(self):
+        self.assertIs(koji_client(self.settings), koji_client(self.settings))
+
+    def test_single_call(self):
+        client = KojiClient(self.settings)
+        self.assertEqual(client.get_build('foo-1.2-3.dt4')['build_id'], 1001)
+        self.assertEqual(self.hub.requests, ['getBuild'])
+
+    def test_multicall(self):
+        client = KojiClient(self.settings)
+        self.assertEqual(
+            [build['build_id'] for build in client.get_builds(['foo-1.2-3.dt4', 'bar-4.5-6.dt4'])],
+            [1001, 1002],
+        )
+        self.assertEqual(
+            client.list_tags_many([1001, 1002]),
+            [self.hub.TAGS['foo-1.2-3.dt4'], self.hub.TAGS['bar-4.5-6.dt4']],
+        )
+        self.assertEqual(self.hub.requests, ['multiCall', 'multiCall'])
+
+    def test_cache(self):
+        client = KojiClient(self.settings)
+        client.get_build('foo-1.2-3.dt4')
+        info = client.get_build('foo-1.2-3.dt4')
+        info['build_id'] = None # cached result must not be changed
+        builds = client.get_builds(['foo-1.2-3.dt4', 'bar-4.5-6.dt4', 'bar-4.5-6.dt4'])
+        self.assertEqual([build['build_id'] for build in builds], [1001, 1002, 1002])
+        self.assertEqual(self.hub.requests, ['getBuild', 'getBuild'])
+        self.assertEqual(self.hub.calls, [('getBuild', 'foo-1.2-3.dt4'), ('getBuild', 'bar-4.5-6.dt4')])
+        client.clear()
+        client.get_build('foo-1.2-3.dt4')
+        self.assertEqual(len(self.hub.requests), 3)
+
+    def test_cache_disabled(self):
+        client = KojiClient(Settings({'koji': {'hub_url': self.hub.url, 'cache_ttl': 0}}, {}, []))
+        client.get_build('foo-1.2-3.dt4')
+        client.get_build('foo-1.2-3.dt4')
+        self.assertEqual(self.hub.requests, ['getBuild', 'getBuild'])
+
+    def test_fault(self):
+        client = KojiClient(self.settings)
+        with self.assertRaises(xmlrpc.client.Fault):
+            client.get_builds(['foo-1.2-3.dt4', 'unknown-1-1'])
+        # the successful query was cached
+        client.get_build('foo-1.2-3.dt4')
+        self.assertEqual(self.hub.requests, ['multiCall'])
+
+    def test_koji_build_prefetch(self):
+        koji_build = KojiBuild(self.settings, 'foo-1.2-3.dt4')
+        koji_build.prefetch()
+        self.assertEqual(self.hub.requests, ['multiCall'])
+        self.assertEqual(koji_build.build_id, 1001)
+        self.assertEqual(koji_build.task_id, 1337)
+        self.assertEqual(koji_build.package_name, 'foo')
+        self.assertEqual(koji_build.new_tag, 'acme-1.2.3-poof')
+        # other structure of the same build uses the cached results
+        self.assertEqual(KojiBuild(self.settings, 'foo-1.2-3.dt4').build_id, 1001)
+        self.assertEqual(self.hub.requests, ['multiCall'])
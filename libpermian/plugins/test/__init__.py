@@ -204,6 +204,10 @@ class TestIssue(BaseIssue):
     def _lookup(self):
         return self.test_uri
 
+    @property
+    def lookup_key(self):
+        return self.test_report_url
+
     @property
     def resolved(self):
         return self.test_resolved
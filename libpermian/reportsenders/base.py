@@ -7,6 +7,7 @@ import time
 from ..caserunconfiguration import CaseRunConfiguration, CaseRunConfigurationsList
 from ..exceptions import UnexpectedState
 from ..exception_dump import dump_exception
+from .resultsqueue import CoalescingResultsQueue
 
 
 LOGGER = logging.getLogger(__name__)
@@ -48,8 +49,10 @@ class BaseReportSender(threading.Thread, metaclass=abc.ABCMeta):
         self.dry_run = self.fallbackSettings.getboolean('dry_run')
         self.issueAnalyzerProxy = issueAnalyzerProxy
         self.group=group
-        self.resultsQueue = queue.Queue()
+        self.resultsQueue = CoalescingResultsQueue()
         self.exception = None
+        self.dispatcher = None
+        """ReportDispatcher driving this ReportSender instead of its own thread"""
 
         # Get throttleInterval from settings.reportSender{type} or settings.reportSenders
         self.throttleInterval = self.fallbackSettings.getfloat('throttleInterval')
@@ -70,35 +73,80 @@ class BaseReportSender(threading.Thread, metaclass=abc.ABCMeta):
     def run(self):
         LOGGER.debug("ReportSender started: '%s'", self)
         try:
-            self.setUp()
-            self.processTestRunStarted()
-            for crc in self.caseRunConfigurations.withDirtyResult:
-                crc.result.dirty = False
-
+            self.startProcessing()
             while True:
                 try:
                     item = self.resultsQueue.get(timeout = self.nextFlush)
-                    LOGGER.debug("'%s' processing: '%s'", self, item)
-                    if isinstance(item, CaseRunConfiguration):
-                        if self.processResult(item):
-                            self.resultsQueue.task_done()
-                            break
-                        self.resultsQueue.task_done()
                 except queue.Empty:
-                    self.setNextFlush()
-                    if self.caseRunConfigurations.withDirtyResult:
-                        if self.flush():
-                            for crc in self.caseRunConfigurations.withDirtyResult:
-                                crc.result.dirty = False
-
-            self.tearDown()
-            LOGGER.debug("'%s' finished processing items (test run should be complete)", self)
-            self.checkEmptyQueue()
+                    self.throttledFlush()
+                    continue
+                if self.processItem(item):
+                    break
+            self.finishProcessing()
         except Exception as e:
             self.exception = dump_exception(e, self)
             # reraise the exception so that it's exposed for unit tests
             raise
 
+    def startProcessing(self):
+        """
+        Set up the ReportSender and report start of the test run before
+        processing the results queue.
+        """
+        self.setUp()
+        self.processTestRunStarted()
+        for crc in self.caseRunConfigurations.withDirtyResult:
+            crc.result.dirty = False
+
+    def processItem(self, item):
+        """
+        Process item taken from the results queue.
+
+        :return: True if the processed result is expected to be the last one. False otherwise.
+        :rtype: bool
+        """
+        LOGGER.debug("'%s' processing: '%s' (%s)", self, item, self.queueStats)
+        finished = False
+        if isinstance(item, CaseRunConfiguration):
+            finished = self.processResult(item)
+        elif isinstance(item, tuple):
+            finished = self.processResults(item)
+        self.resultsQueue.task_done()
+        return finished
+
+    def throttledFlush(self):
+        """
+        Flush the dirty results when throttling is enabled and plan the next
+        flush. This is called when the next flush time has come.
+        """
+        self.setNextFlush()
+        if self.caseRunConfigurations.withDirtyResult:
+            if self.flush():
+                for crc in self.caseRunConfigurations.withDirtyResult:
+                    crc.result.dirty = False
+
+    def finishProcessing(self):
+        """Tear down the ReportSender once the last result was processed"""
+        self.tearDown()
+        LOGGER.debug("'%s' finished processing items (test run should be complete)", self)
+        self.checkEmptyQueue()
+
+    @property
+    def queueStats(self):
+        """
+        Depth of the results queue, seconds the oldest waiting update is in
+        the queue, seconds the last processed update was waiting in the
+        queue and number of updates coalesced with newer ones.
+
+        :rtype: dict
+        """
+        return {
+            'depth': self.resultsQueue.depth,
+            'lag': self.resultsQueue.lag,
+            'lastLag': self.resultsQueue.lastLag,
+            'coalesced': self.resultsQueue.coalesced,
+        }
+
     @property
     def nextFlush(self):
         """
@@ -139,7 +187,9 @@ class BaseReportSender(threading.Thread, metaclass=abc.ABCMeta):
         of the result itself.
 
         Default implementation just puts the relevant result to a queue which
-        is later processed by the ReportSender in its thread.
+        is later processed by the ReportSender in its thread. Waiting
+        non-final update of the same caseRunConfiguration is replaced by the
+        new one, see CoalescingResultsQueue.
 
         :param result:
         :typer result: libpermian.testrun.result.Result
@@ -149,8 +199,45 @@ class BaseReportSender(threading.Thread, metaclass=abc.ABCMeta):
         if crc not in self.caseRunConfigurations:
             return False
         self.resultsQueue.put(crc)
+        if self.dispatcher is not None:
+            self.dispatcher.wake(self)
+        return True
+
+    def resultsUpdate(self, crcs):
+        """
+        Notify ReportSender about batch of new results. The results relevant
+        to the ReportSender are put to the queue as one item which is then
+        processed by processResults.
+
+        :param crcs: Updated caseRunConfigurations
+        :type crcs: iterable of CaseRunConfiguration
+        :return: True if any of the results was relevant to the ReportSender instance. False otherwise.
+        :rtype: bool
+        """
+        relevant = tuple(crc for crc in crcs if crc in self.caseRunConfigurations)
+        if not relevant:
+            return False
+        self.resultsQueue.put(relevant)
+        if self.dispatcher is not None:
+            self.dispatcher.wake(self)
         return True
 
+    def processResults(self, crcUpdates):
+        """
+        This method is called in the loop processing results queue for batch
+        of results provided by resultsUpdate. Default implementation processes
+        the results one by one using processResult.
+
+        :param crcUpdates: Results to be processed.
+        :type crcUpdates: tuple of CaseRunConfiguration
+        :return: True if the last processed result is expected to be the last one. False otherwise.
+        :rtype: bool
+        """
+        finished = False
+        for crcUpdate in crcUpdates:
+            finished = self.processResult(crcUpdate)
+        return finished
+
     def processResult(self, crcUpdate):
         """
         This method is called in the loop processing results queue and signals
@@ -164,7 +251,8 @@ class BaseReportSender(threading.Thread, metaclass=abc.ABCMeta):
         localCaseRunConfiguration = self.caseRunConfigurations[crcUpdate.id]
         # Update result of local copy of caseRunConfiguration
         localCaseRunConfiguration.updateResult(crcUpdate.result)
-        localCaseRunConfiguration.logs = crcUpdate.logs.copy()
+        # logs of the update are read-only snapshot, no need to copy them
+        localCaseRunConfiguration.logs = crcUpdate.logs
 
         if crcUpdate.result.final and (self.reporting.submit_issues is None or self.reporting.submit_issues):
                 for issue in self.issuesFor([crcUpdate]):
@@ -174,12 +262,12 @@ class BaseReportSender(threading.Thread, metaclass=abc.ABCMeta):
             if crcUpdate.result.final:
                 self.processFinalResult(crcUpdate)
                 # Catch end of test case
-                if all([crc.result.final for crc in self.caseRunConfigurations if crcUpdate.testcase == crc.testcase]):
+                if self.caseRunConfigurations.group_for_testcase(crcUpdate.testcase.id).allResultsFinal:
                     self.processCaseRunFinished(crcUpdate.testcase.name)
             else:
                 self.processPartialResult(crcUpdate)
 
-        if all([crc.result.final for crc in self.caseRunConfigurations]):
+        if self.caseRunConfigurations.allResultsFinal:
             # Catch end of testun
             self.processTestRunFinished()
             return True
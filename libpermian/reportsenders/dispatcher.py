@@ -0,0 +1,166 @@
+import collections
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+
+from ..exception_dump import dump_exception
+
+LOGGER = logging.getLogger(__name__)
+
+ITEMS_PER_STEP = 16
+"""Maximal number of queue items of one ReportSender processed before other ReportSenders get their turn"""
+
+
+class ReportDispatcher():
+    """
+    Drives ReportSenders by a small pool of worker threads instead of running
+    each ReportSender in its own thread. ReportSender with items in its
+    results queue is woken up (see BaseReportSender.resultUpdate) and one of
+    the workers processes its items using the same hook methods the
+    ReportSender thread would use. Each ReportSender is processed by at most
+    one worker at a time, so the hook methods of one ReportSender are never
+    called concurrently.
+
+    Flushes of ReportSenders with throttleInterval are planned in one timer
+    heap shared by all the workers.
+
+    Number of workers is set by dispatcher_workers option in reportSenders
+    section, when it's 0, the ReportSenders run in their own threads.
+
+    :param settings: Pipeline settings object
+    :type settings: libpermian.settings.Settings
+    """
+    def __init__(self, settings):
+        self.workers = settings.getint('reportSenders', 'dispatcher_workers')
+        self.reportSenders = []
+        self._condition = threading.Condition()
+        self._ready = collections.deque()
+        """ReportSenders waiting for a worker"""
+        self._scheduled = set()
+        """ids of ReportSenders waiting for a worker or being processed"""
+        self._unfinished = {}
+        """Mapping of id -> ReportSender which haven't finished yet"""
+        self._started = set()
+        """ids of ReportSenders which have already started processing"""
+        self._timers = []
+        """Heap of (flush time, sequence number, ReportSender)"""
+        self._flushTimes = {}
+        """Mapping of id(ReportSender) -> planned flush time in timers"""
+        self._sequence = itertools.count()
+        self._threads = []
+
+    def start(self, reportSenders):
+        """
+        Start processing of the ReportSenders.
+
+        :param reportSenders: ReportSenders to be driven by the dispatcher
+        :type reportSenders: list of BaseReportSender
+        """
+        self.reportSenders = list(reportSenders)
+        if not self.workers:
+            for reportSender in self.reportSenders:
+                reportSender.start()
+            return
+        with self._condition:
+            for reportSender in self.reportSenders:
+                reportSender.dispatcher = self
+                self._unfinished[id(reportSender)] = reportSender
+                self._scheduled.add(id(reportSender))
+                self._ready.append(reportSender)
+        for number in range(min(self.workers, len(self.reportSenders))):
+            thread = threading.Thread(target=self._work, name=f'report-dispatcher-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def join(self):
+        """Wait until all the ReportSenders finish"""
+        if not self.workers:
+            for reportSender in self.reportSenders:
+                reportSender.join()
+            return
+        for thread in self._threads:
+            thread.join()
+
+    def wake(self, reportSender):
+        """
+        Notify the dispatcher that there are new items in the results queue
+        of the ReportSender.
+        """
+        with self._condition:
+            self._schedule(reportSender)
+
+    def _schedule(self, reportSender):
+        if id(reportSender) not in self._unfinished or id(reportSender) in self._scheduled:
+            return
+        self._scheduled.add(id(reportSender))
+        self._ready.append(reportSender)
+        self._condition.notify()
+
+    def _next(self):
+        """Wait for ReportSender to be processed, None if all of them finished"""
+        with self._condition:
+            while self._unfinished:
+                now = time.time()
+                while self._timers and self._timers[0][0] <= now:
+                    _, _, reportSender = heapq.heappop(self._timers)
+                    self._flushTimes.pop(id(reportSender), None)
+                    self._schedule(reportSender)
+                if self._ready:
+                    return self._ready.popleft()
+                timeout = self._timers[0][0] - now if self._timers else None
+                self._condition.wait(timeout)
+            return None
+
+    def _work(self):
+        while True:
+            reportSender = self._next()
+            if reportSender is None:
+                return
+            try:
+                finished = self._step(reportSender)
+            except Exception as e:
+                reportSender.exception = dump_exception(e, reportSender)
+                finished = True
+            with self._condition:
+                self._scheduled.discard(id(reportSender))
+                if finished:
+                    del self._unfinished[id(reportSender)]
+                    # let the idle workers find out that everything is finished
+                    self._condition.notify_all()
+                    continue
+                if not reportSender.resultsQueue.empty():
+                    self._schedule(reportSender)
+                nextFlush = reportSender.nextFlush
+                if nextFlush is not None:
+                    flushTime = reportSender._nextFlush
+                    if self._flushTimes.get(id(reportSender)) != flushTime:
+                        self._flushTimes[id(reportSender)] = flushTime
+                        heapq.heappush(self._timers, (flushTime, next(self._sequence), reportSender))
+                        self._condition.notify()
+
+    def _step(self, reportSender):
+        """
+        Process items waiting in the results queue of the ReportSender and
+        flush its results if the time has come.
+
+        :return: True if the ReportSender has finished
+        :rtype: bool
+        """
+        if id(reportSender) not in self._started:
+            self._started.add(id(reportSender))
+            LOGGER.debug("ReportSender started: '%s'", reportSender)
+            reportSender.startProcessing()
+        for _ in range(ITEMS_PER_STEP):
+            try:
+                item = reportSender.resultsQueue.get(timeout=0)
+            except queue.Empty:
+                break
+            if reportSender.processItem(item):
+                reportSender.finishProcessing()
+                return True
+        if reportSender.nextFlush == 0:
+            reportSender.throttledFlush()
+        return False
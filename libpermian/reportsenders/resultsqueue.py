@@ -0,0 +1,115 @@
+import collections
+import queue
+import threading
+import time
+
+from ..caserunconfiguration import CaseRunConfiguration
+
+
+class _Entry():
+    __slots__ = ('time', 'crcs', 'batch')
+
+    def __init__(self, batch):
+        self.time = time.monotonic()
+        self.crcs = []
+        self.batch = batch
+
+
+class CoalescingResultsQueue():
+    """
+    Queue of caseRunConfiguration updates provided to ReportSender where the
+    latest update of the caseRunConfiguration wins. When a non-final update
+    of caseRunConfiguration arrives while older non-final update of the same
+    caseRunConfiguration is still waiting in the queue, the older update is
+    replaced by the new one in its place. The updates provided by TestRuns
+    are read-only copies holding whole state of the result, so nothing is
+    lost by skipping the older update.
+
+    Final updates are never coalesced, they're put at the end of the queue
+    (dropping the waiting non-final update of the same caseRunConfiguration),
+    so that the final results and with them the test case and test run
+    finished callbacks are delivered in the order the results finished.
+
+    The queue provides get, put, task_done and empty methods of queue.Queue.
+    Items are either caseRunConfigurations or tuples of them (batches), get
+    provides the items in the same form they were put in.
+    """
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._entries = collections.deque()
+        self._pending = {}
+        """Mapping of crcId -> (entry, index) of waiting non-final update"""
+        self._depth = 0
+        self.coalesced = 0
+        """Number of updates replaced by newer ones"""
+        self.lastLag = 0.0
+        """Seconds the last provided item was waiting in the queue"""
+
+    def put(self, item):
+        batch = not isinstance(item, CaseRunConfiguration)
+        crcs = tuple(item) if batch else (item,)
+        with self._condition:
+            entry = _Entry(batch)
+            for crc in crcs:
+                pendingEntry, index = self._pending.pop(crc.id, (None, None))
+                if pendingEntry is not None:
+                    self.coalesced += 1
+                    if not crc.result.final:
+                        pendingEntry.crcs[index] = crc
+                        self._pending[crc.id] = (pendingEntry, index)
+                        continue
+                    pendingEntry.crcs[index] = None
+                    self._depth -= 1
+                if not crc.result.final:
+                    self._pending[crc.id] = (entry, len(entry.crcs))
+                entry.crcs.append(crc)
+                self._depth += 1
+            if entry.crcs:
+                self._entries.append(entry)
+                self._condition.notify()
+
+    def get(self, timeout=None):
+        """
+        :raises queue.Empty: When no item arrives in timeout seconds
+        :return: caseRunConfiguration or tuple of caseRunConfigurations
+        """
+        with self._condition:
+            while True:
+                if not self._condition.wait_for(lambda: self._entries, timeout):
+                    raise queue.Empty
+                entry = self._entries.popleft()
+                crcs = tuple(crc for crc in entry.crcs if crc is not None)
+                if not crcs:
+                    # all the updates were superseded by final updates
+                    continue
+                for crc in crcs:
+                    if self._pending.get(crc.id, (None,))[0] is entry:
+                        del self._pending[crc.id]
+                self._depth -= len(crcs)
+                self.lastLag = time.monotonic() - entry.time
+                return crcs if entry.batch else crcs[0]
+
+    def task_done(self):
+        pass
+
+    def empty(self):
+        with self._condition:
+            return self._depth == 0
+
+    def qsize(self):
+        return self.depth
+
+    @property
+    def depth(self):
+        """Number of caseRunConfiguration updates waiting in the queue"""
+        with self._condition:
+            return self._depth
+
+    @property
+    def lag(self):
+        """Seconds the oldest waiting update is in the queue, 0 if the queue is empty"""
+        with self._condition:
+            for entry in self._entries:
+                if any(crc is not None for crc in entry.crcs):
+                    return time.monotonic() - entry.time
+            return 0.0
@@ -0,0 +1,128 @@
+import threading
+import unittest
+
+from libpermian.settings import Settings
+from libpermian.caserunconfiguration import CaseRunConfiguration, CaseRunConfigurationsList
+from libpermian.reportsenders.base import BaseReportSender
+from libpermian.reportsenders.dispatcher import ReportDispatcher
+from libpermian.result import Result
+
+
+class DummyTestCase():
+    def __init__(self, name):
+        self.name = name
+        self.id = name
+
+
+class DummyReporting():
+    type = 'dummy'
+    submit_issues = False
+
+
+class DummyReportSender(BaseReportSender):
+    def __init__(self, caseRunConfigurations, settings):
+        super().__init__(None, DummyReporting(), caseRunConfigurations, None, settings, None)
+        self.calls = []
+        self.threads = set()
+
+    def record(self, *call):
+        self.calls.append(call)
+        self.threads.add(threading.current_thread().name)
+
+    def processPartialResult(self, crc):
+        self.record('partial', crc.id)
+
+    def processFinalResult(self, crc):
+        self.record('final', crc.id)
+
+    def processTestRunStarted(self):
+        self.record('started')
+
+    def processTestRunFinished(self):
+        self.record('finished')
+
+    def processCaseRunFinished(self, testCaseID):
+        self.record('caseRunFinished', testCaseID)
+
+    def flush(self):
+        self.record('flush')
+        return True
+
+
+def make_settings(**options):
+    options.setdefault('dispatcher_workers', '2')
+    return Settings({'reportSenders': options}, {}, [])
+
+
+def make_crcs(prefix):
+    return CaseRunConfigurationsList([
+        CaseRunConfiguration(DummyTestCase(f'{prefix}-{i}'), {}, []) for i in range(2)
+    ])
+
+
+def report(reportSender, crc, *args):
+    crcUpdate = crc.copy()
+    crcUpdate.updateResult(Result(*args))
+    reportSender.resultUpdate(crcUpdate.readOnlyCopy())
+
+
+class TestReportDispatcher(unittest.TestCase):
+    def test_dispatch(self):
+        settings = make_settings()
+        senders = [DummyReportSender(make_crcs(f'sender{i}'), settings) for i in range(20)]
+        dispatcher = ReportDispatcher(settings)
+        threads = threading.active_count()
+        dispatcher.start(senders)
+        self.assertLessEqual(threading.active_count(), threads + 2)
+        for sender in senders:
+            for crc in sender.caseRunConfigurations:
+                report(sender, crc, 'running')
+        for sender in senders:
+            for crc in sender.caseRunConfigurations:
+                report(sender, crc, 'complete', 'PASS', True)
+        dispatcher.join()
+        for sender in senders:
+            self.assertIsNone(sender.exception)
+            self.assertFalse(sender.is_alive())
+            self.assertEqual(sender.calls[0], ('started',))
+            self.assertEqual(sender.calls[-1], ('finished',))
+            finals = [call[1] for call in sender.calls if call[0] == 'final']
+            self.assertEqual(finals, [crc.id for crc in sender.caseRunConfigurations])
+            self.assertTrue(sender.threads <= {'report-dispatcher-0', 'report-dispatcher-1'})
+
+    def test_throttled_flush(self):
+        settings = make_settings(throttleInterval='0.05')
+        sender = DummyReportSender(make_crcs('sender'), settings)
+        dispatcher = ReportDispatcher(settings)
+        dispatcher.start([sender])
+        crc1, crc2 = sender.caseRunConfigurations
+        report(sender, crc1, 'running')
+        flushed = threading.Event()
+        sender.flush = lambda: flushed.set() or True
+        self.assertTrue(flushed.wait(5))
+        report(sender, crc1, 'complete', 'PASS', True)
+        report(sender, crc2, 'complete', 'PASS', True)
+        dispatcher.join()
+        self.assertEqual(sender.calls[-1], ('finished',))
+        self.assertNotIn(('final', crc1.id), sender.calls)
+
+    def test_exception(self):
+        settings = make_settings()
+        sender = DummyReportSender(make_crcs('sender'), settings)
+        sender.processTestRunStarted = lambda: 1/0
+        dispatcher = ReportDispatcher(settings)
+        dispatcher.start([sender])
+        dispatcher.join()
+        self.assertIsNotNone(sender.exception)
+
+    def test_threads(self):
+        settings = make_settings(dispatcher_workers='0')
+        sender = DummyReportSender(make_crcs('sender'), settings)
+        dispatcher = ReportDispatcher(settings)
+        dispatcher.start([sender])
+        self.assertTrue(sender.is_alive())
+        for crc in sender.caseRunConfigurations:
+            report(sender, crc, 'complete', 'PASS', True)
+        dispatcher.join()
+        self.assertFalse(sender.is_alive())
+        self.assertEqual(sender.calls[-1], ('finished',))
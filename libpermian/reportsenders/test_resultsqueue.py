@@ -0,0 +1,77 @@
+import queue
+import unittest
+
+from libpermian.caserunconfiguration import CaseRunConfiguration
+from libpermian.reportsenders.resultsqueue import CoalescingResultsQueue
+from libpermian.result import Result
+
+
+class DummyTestCase():
+    def __init__(self, name):
+        self.name = name
+        self.id = name
+
+
+def update(crc, *args, **kwargs):
+    crcUpdate = crc.copy()
+    crcUpdate.updateResult(Result(*args, **kwargs))
+    return crcUpdate.readOnlyCopy()
+
+
+class TestCoalescingResultsQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = CoalescingResultsQueue()
+        self.crc1 = CaseRunConfiguration(DummyTestCase('testcase1'), {}, [])
+        self.crc2 = CaseRunConfiguration(DummyTestCase('testcase2'), {}, [])
+
+    def test_latest_wins(self):
+        self.queue.put(update(self.crc1, 'started'))
+        self.queue.put(update(self.crc2, 'started'))
+        self.queue.put(update(self.crc1, 'running', progress=1))
+        self.queue.put(update(self.crc1, 'running', progress=2))
+        self.assertEqual(self.queue.depth, 2)
+        self.assertEqual(self.queue.coalesced, 2)
+        first = self.queue.get()
+        self.assertEqual(first.id, self.crc1.id)
+        self.assertEqual(first.result.extra_fields, {'progress': 2})
+        self.assertEqual(self.queue.get().id, self.crc2.id)
+        self.assertTrue(self.queue.empty())
+        with self.assertRaises(queue.Empty):
+            self.queue.get(timeout=0)
+
+    def test_final_in_order(self):
+        self.queue.put(update(self.crc1, 'running'))
+        self.queue.put(update(self.crc2, 'complete', 'PASS', True))
+        self.queue.put(update(self.crc1, 'complete', 'FAIL', True))
+        self.assertEqual(self.queue.depth, 2)
+        self.assertEqual(self.queue.get().id, self.crc2.id)
+        final = self.queue.get()
+        self.assertEqual(final.id, self.crc1.id)
+        self.assertEqual(final.result, Result('complete', 'FAIL', True))
+        self.assertTrue(self.queue.empty())
+
+    def test_final_not_coalesced(self):
+        self.queue.put(update(self.crc1, 'complete', 'PASS', True))
+        self.queue.put(update(self.crc1, 'canceled', None, True))
+        self.assertEqual(self.queue.depth, 2)
+        self.assertEqual(self.queue.coalesced, 0)
+
+    def test_batches(self):
+        self.queue.put((update(self.crc1, 'running'), update(self.crc2, 'running')))
+        self.queue.put(update(self.crc2, 'running', progress=1))
+        self.queue.put((update(self.crc1, 'complete', 'PASS', True),))
+        batch = self.queue.get()
+        self.assertIsInstance(batch, tuple)
+        self.assertEqual(len(batch), 1)
+        self.assertEqual(batch[0].result.extra_fields, {'progress': 1})
+        batch = self.queue.get()
+        self.assertEqual(batch[0].result.final, True)
+        self.assertTrue(self.queue.empty())
+
+    def test_lag(self):
+        self.assertEqual(self.queue.lag, 0)
+        self.queue.put(update(self.crc1, 'running'))
+        self.assertGreaterEqual(self.queue.lag, 0)
+        self.queue.get()
+        self.assertEqual(self.queue.lag, 0)
+        self.assertGreaterEqual(self.queue.lastLag, 0)
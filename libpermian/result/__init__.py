@@ -1,6 +1,8 @@
+import itertools
 from collections import OrderedDict
+from types import MappingProxyType
 
-from ..exceptions import StateChangeError
+from ..exceptions import StateChangeError, ReadOnlyChangeError
 
 UNSET = object()
 
@@ -22,43 +24,198 @@ RESULTS = OrderedDict((
     ('ERROR', 'There was an error during the execution.'),
 ))
 
+STATE_NAMES = tuple(STATES)
+STATE_ORDINALS = { state:i for i, state in enumerate(STATE_NAMES) }
+RESULT_NAMES = tuple(RESULTS)
+RESULT_ORDINALS = { result:i for i, result in enumerate(RESULT_NAMES) }
+
+NO_EXTRA_FIELDS = MappingProxyType({})
+
+SUMMARY_FIELDS = ('state', 'result', 'final', 'dirty')
+VERSIONED_FIELDS = ('state', 'result', 'final', 'extra_fields')
+
+_VERSIONS = itertools.count(1)
+
 class Result():
+    """
+    State and result of a caseRunConfiguration.
+
+    The state and result are stored as ordinals of the values in STATES and
+    RESULTS and the extra fields are stored only when some are provided to
+    keep the instances small as there's at least one instance per
+    caseRunConfiguration and its copies.
+
+    Each change of state, result, final or extra fields assigns new version
+    to the result. Copies and snapshots keep the version and updating result
+    by a snapshot takes the version of the snapshot, so results of the same
+    version have the same content.
+
+    The extra fields dict is never changed in place, it's replaced on change,
+    so it's shared by copies and snapshots of the result.
+    """
+    __slots__ = ('_state', '_result', 'final', 'dirty', '_extra_fields', '_owner', 'version')
+
     def __init__(self, state=None, result=None, final=False, dirty=True, **kwargs):
         if state not in STATES:
             raise ValueError('Unknown state: "%s"' % state)
         if result not in RESULTS:
             raise ValueError('Unknown result: "%s"' % result)
-        self.state = state
-        self.result = result
+        # the owner has to be set first, it's used by __setattr__
+        object.__setattr__(self, '_owner', None)
+        self._state = STATE_ORDINALS[state]
+        self._result = RESULT_ORDINALS[result]
         self.final = final
-        self.extra_fields = kwargs
         self.dirty = dirty
+        self._extra_fields = kwargs or None
+        self.version = next(_VERSIONS)
+
+    @property
+    def state(self):
+        return STATE_NAMES[self._state]
+
+    @state.setter
+    def state(self, state):
+        self._state = STATE_ORDINALS[state]
+
+    @property
+    def result(self):
+        return RESULT_NAMES[self._result]
+
+    @result.setter
+    def result(self, result):
+        self._result = RESULT_ORDINALS[result]
+
+    @property
+    def extra_fields(self):
+        """Read-only mapping of additional information about the result"""
+        if self._extra_fields is None:
+            return NO_EXTRA_FIELDS
+        return MappingProxyType(self._extra_fields)
+
+    @extra_fields.setter
+    def extra_fields(self, extra_fields):
+        self._extra_fields = dict(extra_fields) if extra_fields else None
+
+    def setOwner(self, owner):
+        """
+        Register object which should be notified (by calling its
+        _resultChanged method) when any of the summary fields (state, result,
+        final, dirty) changes. Only one owner can be registered, None removes
+        the owner.
+        """
+        self._owner = owner
+
+    @property
+    def summary(self):
+        """Tuple of state, result, final and dirty values of this result"""
+        return (self.state, self.result, self.final, self.dirty)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in VERSIONED_FIELDS:
+            super().__setattr__('version', next(_VERSIONS))
+        if name in SUMMARY_FIELDS and self._owner is not None:
+            self._owner._resultChanged()
 
     def update(self, result):
         if self.final:
             raise StateChangeError('Cannot update status of already ended instance.')
-        self.final = result.final
-        if list(STATES).index(result.state) < list(STATES).index(self.state):
-            raise StateChangeError(f'Cannot change state from "{self.state}" to "{result.state}".')
-        self.state = result.state
-        if list(RESULTS).index(result.result) > list(RESULTS).index(self.result):
-            self.result = result.result
-        self.extra_fields.update(result.extra_fields)
-        self.dirty = True
+        # Set the slots directly to notify the owner only once for the
+        # whole update.
+        setfield = object.__setattr__
+        try:
+            setfield(self, 'final', result.final)
+            if result._state < self._state:
+                raise StateChangeError(f'Cannot change state from "{self.state}" to "{result.state}".')
+            setfield(self, '_state', result._state)
+            if result._result > self._result:
+                setfield(self, '_result', result._result)
+            extra_fields = result._extra_fields
+            if extra_fields and extra_fields is not self._extra_fields:
+                # share the dict of the other result if it already contains
+                # all the fields of this result, otherwise make merged one
+                if self._extra_fields is not None and not self._extra_fields.items() <= extra_fields.items():
+                    extra_fields = {**self._extra_fields, **extra_fields}
+                setfield(self, '_extra_fields', extra_fields)
+            setfield(self, 'dirty', True)
+        finally:
+            if isinstance(result, ResultSnapshot):
+                setfield(self, 'version', result.version)
+            else:
+                setfield(self, 'version', next(_VERSIONS))
+            if self._owner is not None:
+                self._owner._resultChanged()
 
     def copy(self):
-        return Result(
-            self.state, self.result, self.final, self.dirty, **self.extra_fields
-        )
+        """
+        Provide mutable copy of this result. The copy shares extra fields
+        with this result.
+        """
+        result = Result.__new__(Result)
+        result._copyFrom(self)
+        return result
+
+    def snapshot(self):
+        """
+        Provide immutable snapshot of current state of this result. The
+        snapshot can be shared by reference by all the consumers of the
+        update as it cannot be changed.
+
+        :return: Read-only snapshot of this result
+        :rtype: ResultSnapshot
+        """
+        snapshot = ResultSnapshot.__new__(ResultSnapshot)
+        snapshot._copyFrom(self)
+        return snapshot
+
+    def _copyFrom(self, other):
+        setfield = object.__setattr__
+        setfield(self, '_owner', None)
+        setfield(self, '_state', other._state)
+        setfield(self, '_result', other._result)
+        setfield(self, 'final', other.final)
+        setfield(self, 'dirty', other.dirty)
+        setfield(self, '_extra_fields', other._extra_fields)
+        setfield(self, 'version', other.version)
+
+    def __getstate__(self):
+        # the owner is not part of the state, copies have no owner
+        return (self._state, self._result, self.final, self.dirty, self._extra_fields, self.version)
+
+    def __setstate__(self, state):
+        setfield = object.__setattr__
+        setfield(self, '_owner', None)
+        for name, value in zip(('_state', '_result', 'final', 'dirty', '_extra_fields', 'version'), state):
+            setfield(self, name, value)
 
     def __eq__(self, other):
         if not isinstance(other, Result):
             raise NotImplementedError()
         return (
-            self.state == other.state and
-            self.result == other.result and
+            self._state == other._state and
+            self._result == other._result and
             self.final == other.final
         )
 
     def __repr__(self):
         return f'<Result({self.state}, {self.result}, {self.final}>'
+
+class ResultSnapshot(Result):
+    """
+    Immutable snapshot of a result, see Result.snapshot. Use copy method to
+    get mutable result out of the snapshot.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise ReadOnlyChangeError(f'Cannot change result snapshot: {self}')
+
+    def setOwner(self, owner):
+        # the snapshot never changes, so there's nothing to notify the owner about
+        pass
+
+    def update(self, result):
+        raise ReadOnlyChangeError(f'Cannot change result snapshot: {self}')
+
+    def snapshot(self):
+        return self
@@ -0,0 +1,131 @@
+import copy
+import pickle
+import unittest
+import unittest.mock
+
+from . import Result, ResultSnapshot
+from ..exceptions import StateChangeError, ReadOnlyChangeError
+
+
+class TestResult(unittest.TestCase):
+    def test_update(self):
+        result = Result('queued', None, dirty=False)
+        result.update(Result('running', 'PASS', foo='bar'))
+        self.assertEqual(result.state, 'running')
+        self.assertEqual(result.result, 'PASS')
+        self.assertFalse(result.final)
+        self.assertTrue(result.dirty)
+        self.assertEqual(result.extra_fields, {'foo': 'bar'})
+
+    def test_update_keeps_worse_result(self):
+        result = Result('running', 'FAIL')
+        result.update(Result('complete', 'PASS', True))
+        self.assertEqual(result.state, 'complete')
+        self.assertEqual(result.result, 'FAIL')
+        self.assertTrue(result.final)
+
+    def test_update_state_back(self):
+        result = Result('running')
+        with self.assertRaises(StateChangeError):
+            result.update(Result('queued'))
+
+    def test_update_final(self):
+        result = Result('complete', 'PASS', True)
+        with self.assertRaises(StateChangeError):
+            result.update(Result('complete', 'FAIL', True))
+
+    def test_unknown_values(self):
+        with self.assertRaises(ValueError):
+            Result('unknown')
+        with self.assertRaises(ValueError):
+            Result('running', 'unknown')
+
+    def test_extra_fields_not_shared(self):
+        result1 = Result('running')
+        result2 = Result('running')
+        self.assertEqual(result1.extra_fields, {})
+        result1.update(Result('running', foo='bar'))
+        self.assertEqual(result1.extra_fields, {'foo': 'bar'})
+        self.assertEqual(result2.extra_fields, {})
+
+    def test_copy(self):
+        result = Result('running', 'PASS', foo='bar')
+        result_copy = result.copy()
+        self.assertEqual(result, result_copy)
+        self.assertEqual(result_copy.extra_fields, {'foo': 'bar'})
+        result_copy.update(Result('running', foo='baz'))
+        self.assertEqual(result.extra_fields, {'foo': 'bar'})
+
+    def test_copy_module_and_pickle(self):
+        owner = unittest.mock.Mock()
+        result = Result('running', 'PASS', dirty=False, foo='bar')
+        result.setOwner(owner)
+        for result_copy in (copy.copy(result), copy.deepcopy(result), pickle.loads(pickle.dumps(result))):
+            self.assertIs(type(result_copy), Result)
+            self.assertEqual(result_copy, result)
+            self.assertEqual(result_copy.summary, result.summary)
+            self.assertEqual(result_copy.extra_fields, {'foo': 'bar'})
+            self.assertEqual(result_copy.version, result.version)
+            # the copy is independent and has no owner
+            result_copy.update(Result('complete', 'FAIL', True))
+            self.assertEqual(result.state, 'running')
+        owner._resultChanged.assert_not_called()
+
+class TestResultSnapshot(unittest.TestCase):
+    def test_copy_module_and_pickle(self):
+        snapshot = Result('running', 'PASS', foo='bar').snapshot()
+        for snapshot_copy in (copy.copy(snapshot), copy.deepcopy(snapshot), pickle.loads(pickle.dumps(snapshot))):
+            self.assertIs(type(snapshot_copy), ResultSnapshot)
+            self.assertEqual(snapshot_copy, snapshot)
+            self.assertEqual(snapshot_copy.version, snapshot.version)
+            self.assertEqual(snapshot_copy.extra_fields, {'foo': 'bar'})
+            with self.assertRaises(ReadOnlyChangeError):
+                snapshot_copy.state = 'complete'
+
+    def test_snapshot_shared(self):
+        result = Result('running', 'PASS', foo='bar')
+        snapshot = result.snapshot()
+        self.assertIs(snapshot, snapshot.snapshot())
+        self.assertEqual(snapshot, result)
+        self.assertEqual(snapshot.version, result.version)
+        self.assertEqual(snapshot.extra_fields, {'foo': 'bar'})
+
+    def test_snapshot_keeps_state(self):
+        result = Result('running', 'PASS')
+        snapshot = result.snapshot()
+        result.update(Result('complete', 'FAIL', True, foo='bar'))
+        new_snapshot = result.snapshot()
+        self.assertNotEqual(snapshot.version, new_snapshot.version)
+        self.assertEqual(snapshot.state, 'running')
+        self.assertEqual(snapshot.extra_fields, {})
+        self.assertEqual(new_snapshot.state, 'complete')
+        self.assertEqual(new_snapshot.extra_fields, {'foo': 'bar'})
+
+    def test_snapshot_read_only(self):
+        snapshot = Result('running').snapshot()
+        with self.assertRaises(ReadOnlyChangeError):
+            snapshot.state = 'complete'
+        with self.assertRaises(ReadOnlyChangeError):
+            snapshot.dirty = False
+        with self.assertRaises(ReadOnlyChangeError):
+            snapshot.update(Result('complete'))
+        with self.assertRaises(TypeError):
+            snapshot.extra_fields['foo'] = 'bar'
+
+    def test_update_by_snapshot(self):
+        master = Result('queued')
+        local = master.copy()
+        master.update(Result('running', 'PASS', foo='bar'))
+        local.update(master.snapshot())
+        self.assertEqual(local, master)
+        self.assertEqual(local.version, master.version)
+        self.assertEqual(local.extra_fields, {'foo': 'bar'})
+        master.update(Result('running', baz='qux'))
+        local.update(master.snapshot())
+        self.assertEqual(local.extra_fields, {'foo': 'bar', 'baz': 'qux'})
+        # local changes are not propagated back
+        local.dirty = False
+        self.assertTrue(master.dirty)
+        local.update(Result('complete', 'FAIL', True))
+        self.assertEqual(master.state, 'running')
+        self.assertNotEqual(local.version, master.version)
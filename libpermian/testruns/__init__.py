@@ -1,14 +1,23 @@
 import logging
+import queue
 
 from ..exceptions import StateChangeError
 from ..workflows.factory import WorkflowFactory
+from ..workflows.scheduler import WorkflowScheduler
+from ..workflows.asynchronous import WorkflowEventLoop
 from ..reportsenders.factory import ReportSenderFactory
+from ..reportsenders.dispatcher import ReportDispatcher
 from ..issueanalyzer.proxy import IssueAnalyzerProxy
 from ..caserunconfiguration import CaseRunConfigurationsList
 from ..result import Result
+from .. import hooks
+from .columns import ResultColumns
 
 LOGGER = logging.getLogger(__name__)
 
+WORKFLOW_CHECK_INTERVAL = 1
+"""Seconds between checks of workflows which ended without notifying TestRuns"""
+
 class TestRuns():
     """Collection of case-run-configurations based on the Test Plans, Requirements and Test Cases from tplib provided library.
 
@@ -20,11 +29,41 @@ class TestRuns():
         self.event = event
         self.settings = settings
         self.caseRunConfigurations = []
+        self.finishedWorkflows = queue.Queue()
+        """Workflows which have finished their execution, see workflowFinished"""
         self.issueAnalyzerProxy = IssueAnalyzerProxy(self.settings)
         """List of CaseRunConfigurations taking part in this execution"""
         self.populateCaseRunConfigurations(library, event)
+        self.resultColumns = ResultColumns(self.caseRunConfigurations)
+        """Columnar store of results of the caseRunConfigurations used for aggregations"""
+        self.workflowEventLoop = WorkflowEventLoop()
+        """Event loop executing asynchronous workflows"""
         self.assignWorkflows(event, settings)
+        self.workflowScheduler = WorkflowScheduler(self.settings)
+        """Scheduler starting the workflows under limits of the resources they need"""
         self.reportSenders = list(ReportSenderFactory.assign(self))
+        self.reportDispatcher = ReportDispatcher(self.settings)
+        """Dispatcher driving the ReportSenders"""
+        self.reportSenderRoutes = self.routeReportSenders(self.reportSenders)
+        """Mapping of crcId to ReportSenders interested in updates of the crc"""
+
+    @staticmethod
+    def routeReportSenders(reportSenders):
+        """
+        Build routing table of updates to ReportSenders so that the update
+        is provided only to the ReportSenders which report the updated
+        caseRunConfiguration.
+
+        :param reportSenders: ReportSenders with assigned caseRunConfigurations
+        :type reportSenders: list of BaseReportSender
+        :return: Mapping of crcId to list of ReportSenders in the order of reportSenders
+        :rtype: dict
+        """
+        routes = {}
+        for reportSender in reportSenders:
+            for crc in reportSender.caseRunConfigurations:
+                routes.setdefault(crc.id, []).append(reportSender)
+        return routes
 
     def populateCaseRunConfigurations(self, library, event):
         """
@@ -61,8 +100,9 @@ class TestRuns():
 
     def start(self):
         """
-        Run start method on all workflows assigned to the CaseRunConfiguration
-        objects.
+        Submit all workflows assigned to the CaseRunConfiguration objects to
+        the workflowScheduler which runs their start method once the
+        resources they need are available.
 
         Note there may be multiple CaseRunConfiguration objects sharing the
         same Workflow object. In such situation, the start method should be
@@ -75,13 +115,32 @@ class TestRuns():
         :return: None
         :rtype: None
         """
-        for reportSender in self.reportSenders:
-            reportSender.start()
-        started_workflows = set()
+        self.reportDispatcher.start(self.reportSenders)
+        for workflow, _ in self.workflows.values():
+            self.workflowScheduler.submit(workflow)
+
+    @property
+    def workflows(self):
+        """
+        Mapping of workflows to caseRunConfigurations they handle. The keys
+        are ids of the workflows and values are tuples of the workflow and
+        list of its caseRunConfigurations.
+        """
+        workflows = {}
         for caserun in self.caseRunConfigurations:
-            if id(caserun.workflow) not in started_workflows:
-                caserun.workflow.start()
-                started_workflows.add(id(caserun.workflow))
+            workflows.setdefault(id(caserun.workflow), (caserun.workflow, []))[1].append(caserun)
+        return workflows
+
+    def workflowFinished(self, workflow):
+        """
+        Notify TestRuns that the workflow has finished its execution. This is
+        called by the workflow from its thread.
+
+        Resources held by the workflow are released, so that waiting
+        workflows can be started.
+        """
+        self.workflowScheduler.release(workflow)
+        self.finishedWorkflows.put(workflow)
 
     def wait(self):
         """
@@ -89,50 +148,112 @@ class TestRuns():
         called after all workflows are finished, nothing should happen and no
         blocking should occur.
 
+        Workflows are processed in the order they finish, see
+        processFinishedWorkflow.
+
         :raises NotReady: When start method was not invoked yet.
         :return: True if all report senders finished without issue
         :rtype: bool
         """
-        for caserun in self.caseRunConfigurations:
-            caserun.workflow.join()
-            if not caserun.result.final:
-                # copy is needed here, so that the final result is not stored
-                # in the crc before self.update is called.
-                self.update(caserun.copy().updateResult(Result('DNF', 'ERROR', True)))
+        pending = self.workflows
+        total = len(pending)
+        while pending:
+            try:
+                finished = [self.finishedWorkflows.get(timeout=WORKFLOW_CHECK_INTERVAL)]
+            except queue.Empty:
+                # workflows not reporting their end (e.g. because of custom
+                # run method) are checked directly, workflows waiting for
+                # resources are not started yet
+                finished = [
+                    workflow for workflow, _ in pending.values()
+                    if workflow.ident is not None and not workflow.is_alive()
+                ]
+            for workflow in finished:
+                try:
+                    _, caseruns = pending.pop(id(workflow))
+                except KeyError:
+                    continue
+                self.processFinishedWorkflow(workflow, caseruns)
+                LOGGER.info('Workflow %s finished (%d/%d)', workflow, total - len(pending), total)
+        self.workflowEventLoop.stop()
+        self.reportDispatcher.join()
         all_ok = True
         for reportSender in self.reportSenders:
-            reportSender.join()
             if reportSender.exception:
                 all_ok = False
         return all_ok
 
-    def update(self, crc):
+    def processFinishedWorkflow(self, workflow, caseruns):
         """
-        Register update in crc provided by workflow and if the update is valid,
-        provide it to ReportSenders.
+        Mark caseRunConfigurations of the finished workflow which don't have
+        final result as DNF and run workflow_finished hook.
+
+        :param workflow: Finished workflow
+        :type workflow: GroupedWorkflow
+        :param caseruns: caseRunConfigurations handled by the workflow
+        :type caseruns: list of CaseRunConfiguration
         """
-        try:
-            crcUpdate = self.caseRunConfigurations[crc.id].updateResult(crc.result).readOnlyCopy()
-        except StateChangeError as e:
-            LOGGER.error('Cannot change state of result: %s', e)
-            return
-        for reportSender in self.reportSenders:
-            reportSender.resultUpdate(crcUpdate)
+        workflow.join()
+        self.workflowScheduler.release(workflow)
+        unfinished = []
+        for caserun in caseruns:
+            if not caserun.result.final:
+                # copy is needed here, so that the final result is not stored
+                # in the crc before self.update is called.
+                unfinished.append(caserun.copy().updateResult(Result('DNF', 'ERROR', True)))
+        if unfinished:
+            self.update(*unfinished)
+        hooks.builtin.workflow_finished(workflow)
+
+    def update(self, *crcs):
+        """
+        Register updates in crcs provided by workflow and if the updates are
+        valid, provide them to ReportSenders. All the ReportSenders get the same
+        read-only copies holding immutable snapshots of the results.
+
+        The updates are provided only to the ReportSenders interested in them,
+        see reportSenderRoutes. When multiple crcs are provided, each
+        ReportSender gets all the updates relevant to it in one batch.
+        """
+        crcUpdates = []
+        for crc in crcs:
+            try:
+                crcUpdates.append(self.caseRunConfigurations[crc.id].updateResult(crc.result).readOnlyCopy())
+            except StateChangeError as e:
+                LOGGER.error('Cannot change state of result: %s', e)
+        batches = {}
+        for crcUpdate in crcUpdates:
+            for reportSender in self.reportSenderRoutes.get(crcUpdate.id, ()):
+                batches.setdefault(id(reportSender), (reportSender, []))[1].append(crcUpdate)
+        for reportSender, batch in batches.values():
+            if len(batch) == 1:
+                reportSender.resultUpdate(batch[0])
+            else:
+                reportSender.resultsUpdate(batch)
 
-    # TODO: consider using functools.lru_cache or functools.cached_property
     @property
     def testPlansMapping(self):
         """
         Mapping of testPlans to caseRunConfigurations. The keys are TestPlan
         ids and values are caseRunConfigurations which belong to the TestPlan.
+        The grouping is maintained by the caseRunConfigurations list, so this
+        doesn't rescan the caseRunConfigurations.
         """
         return self.caseRunConfigurations.by_testplan()
 
+    @property
+    def testPlansSummary(self):
+        """
+        Counts of states and results of caseRunConfigurations of each TestPlan,
+        see ResultColumns.counts. The keys are TestPlan ids.
+        """
+        return {
+            testPlanId: self.resultColumns.counts(mask)
+            for testPlanId, mask in self.resultColumns.testplanMasks().items()
+        }
+
     def __getitem__(self, crcId):
-        for crc in self.caseRunConfigurations:
-            if crc.id == crcId:
-                return crc
-        raise KeyError(f'No caseRunConfiguration of id "{crcId}" found.')
+        return self.caseRunConfigurations[crcId]
 
     def __iter__(self):
         for crc in self.caseRunConfigurations:
@@ -0,0 +1,189 @@
+import threading
+
+from ..caserunconfiguration import CaseRunConfiguration
+from ..result import STATE_NAMES, RESULT_NAMES
+
+
+class ResultColumns():
+    """
+    Columnar store of results of caseRunConfigurations used to aggregate
+    results of large number of caseRunConfigurations (or their selections)
+    without going through the caseRunConfiguration and result objects.
+
+    Each caseRunConfiguration has its position in the columns. State and
+    result ordinals and final and dirty flags are stored in bytearrays, one
+    byte per position. The stored values are shifted by one, so that zero
+    means the position is not selected.
+
+    Selections of caseRunConfigurations (e.g. testplans or workflow types)
+    are represented by masks, ints having 0xff byte on the positions of the
+    selected caseRunConfigurations. Column is masked by single bitwise and
+    and the values are then counted by bytes.count, so the aggregation runs
+    in C regardless of the number of caseRunConfigurations.
+
+    The columns follow changes of results the same way ResultsHistogram
+    does, the store registers itself to the caseRunConfigurations and is
+    notified when their result changes.
+
+    :param caseRunConfigurations: caseRunConfigurations stored in the columns
+    :type caseRunConfigurations: iterable of CaseRunConfiguration
+    """
+    def __init__(self, caseRunConfigurations=()):
+        self._lock = threading.Lock()
+        self._positions = {}
+        """Mapping id(crc) -> position of the crc in the columns"""
+        self.crcs = []
+        self.states = bytearray()
+        self.results = bytearray()
+        self.final = bytearray()
+        self.dirty = bytearray()
+        self._masks = {}
+        """Cached masks of groupings, see groupMasks"""
+        self._testplansVersion = CaseRunConfiguration._runningForVersion
+        for crc in caseRunConfigurations:
+            self.add(crc)
+
+    def add(self, crc):
+        """
+        Add the caseRunConfiguration to the end of the columns, nothing
+        happens if the caseRunConfiguration is already stored.
+        """
+        with self._lock:
+            if id(crc) in self._positions:
+                return
+            self._positions[id(crc)] = len(self.crcs)
+            self.crcs.append(crc)
+            self.states.append(0)
+            self.results.append(0)
+            self.final.append(0)
+            self.dirty.append(0)
+            self._store(len(self.crcs) - 1, crc.result)
+            self._masks = {}
+        crc._addList(self)
+
+    def _store(self, position, result):
+        self.states[position] = result._state + 1
+        self.results[position] = result._result + 1
+        self.final[position] = 2 if result.final else 1
+        self.dirty[position] = 2 if result.dirty else 1
+
+    def _resultChanged(self, crc):
+        """Called by the caseRunConfiguration when its result changes"""
+        with self._lock:
+            try:
+                position = self._positions[id(crc)]
+            except KeyError:
+                return
+            self._store(position, crc.result)
+
+    def __len__(self):
+        return len(self.crcs)
+
+    def mask(self, crcs):
+        """
+        :param crcs: Selected caseRunConfigurations, the ones not stored in the columns are ignored.
+        :type crcs: iterable of CaseRunConfiguration
+        :return: Mask selecting the caseRunConfigurations
+        :rtype: int
+        """
+        selected = bytearray(len(self.crcs))
+        for crc in crcs:
+            try:
+                selected[self._positions[id(crc)]] = 0xff
+            except KeyError:
+                continue
+        return int.from_bytes(selected, 'little')
+
+    def groupMasks(self, grouping, keys_func):
+        """
+        Masks of groups of caseRunConfigurations identified by keys provided
+        by keys_func, see CaseRunConfigurationsList.by_key. The masks are built
+        on the first use under the grouping name.
+
+        :param grouping: Name under which the masks are cached.
+        :type grouping: hashable
+        :param keys_func: Function returning keys of all groups the caseRunConfiguration belongs to.
+        :type keys_func: callable
+        :return: Mapping of group key to mask
+        :rtype: dict
+        """
+        with self._lock:
+            try:
+                return self._masks[grouping]
+            except KeyError:
+                pass
+            groups = {}
+            for position, crc in enumerate(self.crcs):
+                for key in keys_func(crc):
+                    try:
+                        selected = groups[key]
+                    except KeyError:
+                        selected = groups[key] = bytearray(len(self.crcs))
+                    selected[position] = 0xff
+            masks = { key:int.from_bytes(selected, 'little') for key, selected in groups.items() }
+            self._masks[grouping] = masks
+            return masks
+
+    def testplanMasks(self):
+        # testplans of the caseRunConfigurations may change after the masks
+        # were built, rebuild them in such case
+        with self._lock:
+            if self._testplansVersion != CaseRunConfiguration._runningForVersion:
+                self._masks.pop('testplan', None)
+                self._testplansVersion = CaseRunConfiguration._runningForVersion
+        return self.groupMasks('testplan', lambda crc: crc.running_for)
+
+    def workflowTypeMasks(self):
+        return self.groupMasks('workflowType', lambda crc: (crc.testcase.execution.type,))
+
+    def _columns(self, mask, *names):
+        """Copy of columns with positions not selected by the mask set to zero"""
+        with self._lock:
+            columns = [ getattr(self, name) for name in names ]
+            if mask is None:
+                return [bytes(column) for column in columns]
+            return [
+                (int.from_bytes(column, 'little') & mask).to_bytes(len(column), 'little')
+                for column in columns
+            ]
+
+    def counts(self, mask=None):
+        """
+        Count states and results of caseRunConfigurations selected by the mask.
+
+        :param mask: Mask selecting the caseRunConfigurations, all of them are counted if not provided.
+        :type mask: int, optional
+        :return: Counts of states, results, final and dirty results and total count of the selected caseRunConfigurations
+        :rtype: dict
+        """
+        states, results, final, dirty = self._columns(mask, 'states', 'results', 'final', 'dirty')
+        stateCounts = { state:states.count(i + 1) for i, state in enumerate(STATE_NAMES) }
+        return {
+            'states': stateCounts,
+            'results': { result:results.count(i + 1) for i, result in enumerate(RESULT_NAMES) },
+            'final': final.count(2),
+            'dirty': dirty.count(2),
+            'total': sum(stateCounts.values()),
+        }
+
+    def status(self, mask=None):
+        """
+        :return: Lowest state of caseRunConfigurations selected by the mask or None if nothing is selected.
+        :rtype: str or None
+        """
+        states, = self._columns(mask, 'states')
+        for i, state in enumerate(STATE_NAMES):
+            if i + 1 in states:
+                return state
+        return None
+
+    def result(self, mask=None):
+        """
+        :return: Highest result of caseRunConfigurations selected by the mask, None if nothing is selected.
+        :rtype: str or None
+        """
+        results, = self._columns(mask, 'results')
+        for i, result in reversed(list(enumerate(RESULT_NAMES))):
+            if i + 1 in results:
+                return result
+        return None
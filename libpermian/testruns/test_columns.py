@@ -0,0 +1,93 @@
+import unittest
+
+from libpermian.caserunconfiguration import CaseRunConfiguration
+from libpermian.testruns.columns import ResultColumns
+from libpermian.result import Result
+
+
+class DummyExecution():
+    def __init__(self, type):
+        self.type = type
+
+
+class DummyTestCase():
+    def __init__(self, name, workflow='test'):
+        self.name = name
+        self.id = name
+        self.execution = DummyExecution(workflow)
+
+
+class DummyTestPlan():
+    def __init__(self, name):
+        self.name = name
+        self.id = name
+
+
+class TestResultColumns(unittest.TestCase):
+    def setUp(self):
+        planA = DummyTestPlan('A')
+        planB = DummyTestPlan('B')
+        testcase1 = DummyTestCase('testcase1')
+        testcase2 = DummyTestCase('testcase2', 'manual')
+        self.crc11 = CaseRunConfiguration(testcase1, {'conf': 1}, [planA])
+        self.crc12 = CaseRunConfiguration(testcase1, {'conf': 2}, [planA, planB])
+        self.crc21 = CaseRunConfiguration(testcase2, {'conf': 1}, [planB])
+        self.crc11.result = Result('running', 'PASS', False)
+        self.crc12.result = Result('complete', 'FAIL', True)
+        self.crc21.result = Result('queued', None, False, False)
+        self.columns = ResultColumns([self.crc11, self.crc12, self.crc21])
+
+    def test_counts(self):
+        counts = self.columns.counts()
+        self.assertEqual(counts['total'], 3)
+        self.assertEqual(counts['final'], 1)
+        self.assertEqual(counts['dirty'], 2)
+        self.assertEqual(counts['states']['running'], 1)
+        self.assertEqual(counts['states']['complete'], 1)
+        self.assertEqual(counts['states']['queued'], 1)
+        self.assertEqual(counts['states']['DNF'], 0)
+        self.assertEqual(counts['results'], {None: 1, 'PASS': 1, 'FAIL': 1, 'ERROR': 0})
+
+    def test_testplan_masks(self):
+        masks = self.columns.testplanMasks()
+        self.assertEqual(set(masks), {'A', 'B'})
+        self.assertEqual(self.columns.counts(masks['A'])['total'], 2)
+        self.assertEqual(self.columns.status(masks['A']), 'running')
+        self.assertEqual(self.columns.result(masks['A']), 'FAIL')
+        self.assertEqual(self.columns.status(masks['B']), 'queued')
+        self.assertEqual(self.columns.result(masks['B']), 'FAIL')
+
+    def test_testplan_masks_follow_running_for(self):
+        self.columns.testplanMasks()
+        self.crc21.running_for = {'C': True}
+        masks = self.columns.testplanMasks()
+        self.assertEqual(set(masks), {'A', 'B', 'C'})
+        self.assertEqual(self.columns.status(masks['C']), 'queued')
+
+    def test_workflow_type_masks(self):
+        masks = self.columns.workflowTypeMasks()
+        self.assertEqual(self.columns.counts(masks['test'])['total'], 2)
+        combined = masks['manual'] & self.columns.testplanMasks()['B']
+        self.assertEqual(self.columns.counts(combined)['states']['queued'], 1)
+        self.assertEqual(self.columns.counts(combined)['total'], 1)
+
+    def test_follows_results(self):
+        mask = self.columns.mask([self.crc11, self.crc21])
+        self.assertEqual(self.columns.status(mask), 'queued')
+        self.crc21.updateResult(Result('running', 'PASS'))
+        self.assertEqual(self.columns.status(mask), 'running')
+        self.crc11.updateResult(Result('complete', 'ERROR', True))
+        self.assertEqual(self.columns.result(mask), 'ERROR')
+        self.assertEqual(self.columns.counts()['final'], 2)
+
+    def test_empty_selection(self):
+        self.assertIsNone(self.columns.status(0))
+        self.assertIsNone(self.columns.result(0))
+        self.assertEqual(self.columns.counts(0)['total'], 0)
+
+    def test_add(self):
+        crc = CaseRunConfiguration(DummyTestCase('testcase3'), {}, [DummyTestPlan('A')])
+        self.columns.add(crc)
+        self.columns.add(crc)
+        self.assertEqual(len(self.columns), 4)
+        self.assertEqual(self.columns.status(self.columns.testplanMasks()['A']), 'not started')
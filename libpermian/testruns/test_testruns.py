@@ -1,4 +1,6 @@
 import unittest
+import queue
+import threading
 from tplib import library
 from libpermian.settings import Settings
 from libpermian.events.base import Event
@@ -7,6 +9,7 @@ from libpermian.workflows.isolated import IsolatedWorkflow, GroupedWorkflow
 from libpermian.workflows.builtin import UnknownWorkflow, ManualWorkflow
 from libpermian.testruns import TestRuns
 from libpermian.result import Result
+from libpermian.caserunconfiguration import CaseRunConfiguration, CaseRunConfigurationsList
 
 
 class TestWorkflowIsolated(IsolatedWorkflow):
@@ -137,3 +140,139 @@ class TestAssignWorkflows2(unittest.TestCase):
         self.assertIsInstance(workflow3, TestWorkflowGrouped)
         self.assertEqual(workflow1, workflow2)
         self.assertNotEqual(workflow2, workflow3)
+
+
+class DummyTestCase():
+    def __init__(self, name):
+        self.name = name
+        self.id = name
+
+
+class DummyReportSender():
+    def __init__(self, caseRunConfigurations):
+        self.caseRunConfigurations = caseRunConfigurations
+        self.resultUpdate = unittest.mock.Mock()
+        self.resultsUpdate = unittest.mock.Mock()
+
+
+class TestReportSenderRoutes(unittest.TestCase):
+    def setUp(self):
+        self.crc1 = CaseRunConfiguration(DummyTestCase('testcase 1'), {}, [])
+        self.crc2 = CaseRunConfiguration(DummyTestCase('testcase 2'), {}, [])
+        self.crc3 = CaseRunConfiguration(DummyTestCase('testcase 3'), {}, [])
+        self.sender1 = DummyReportSender(CaseRunConfigurationsList([self.crc1, self.crc2]))
+        self.sender2 = DummyReportSender(CaseRunConfigurationsList([self.crc2]))
+        self.testruns = unittest.mock.create_autospec(TestRuns, instance=True)
+        self.testruns.caseRunConfigurations = CaseRunConfigurationsList([self.crc1, self.crc2, self.crc3])
+        self.testruns.reportSenderRoutes = TestRuns.routeReportSenders([self.sender1, self.sender2])
+
+    def test_routes(self):
+        self.assertEqual(self.testruns.reportSenderRoutes, {
+            self.crc1.id: [self.sender1],
+            self.crc2.id: [self.sender1, self.sender2],
+        })
+
+    def test_update_routed(self):
+        TestRuns.update(self.testruns, self.crc1.withResult(Result('queued')))
+        self.sender1.resultUpdate.assert_called_once()
+        self.sender2.resultUpdate.assert_not_called()
+        TestRuns.update(self.testruns, self.crc3.withResult(Result('queued')))
+        self.assertEqual(self.sender1.resultUpdate.call_count, 1)
+        self.sender2.resultUpdate.assert_not_called()
+
+    def test_update_batch(self):
+        TestRuns.update(
+            self.testruns,
+            self.crc1.withResult(Result('queued')),
+            self.crc2.withResult(Result('queued')),
+            self.crc3.withResult(Result('queued')),
+        )
+        self.sender1.resultsUpdate.assert_called_once()
+        self.assertEqual(
+            [crc.id for crc in self.sender1.resultsUpdate.call_args.args[0]],
+            [self.crc1.id, self.crc2.id]
+        )
+        self.sender2.resultsUpdate.assert_not_called()
+        self.sender2.resultUpdate.assert_called_once()
+        self.assertEqual(self.crc3.result.state, 'queued')
+
+
+class DummyWorkflow(threading.Thread):
+    def __init__(self, testRuns):
+        super().__init__()
+        self.testRuns = testRuns
+        self.release = threading.Event()
+
+    def run(self):
+        self.release.wait()
+        TestRuns.workflowFinished(self.testRuns, self)
+
+
+class TestWait(unittest.TestCase):
+    def setUp(self):
+        self.testruns = unittest.mock.create_autospec(TestRuns, instance=True)
+        self.testruns.finishedWorkflows = queue.Queue()
+        self.testruns.reportSenders = []
+        self.testruns.workflowScheduler = unittest.mock.Mock()
+        self.testruns.workflowEventLoop = unittest.mock.Mock()
+        self.testruns.reportDispatcher = unittest.mock.Mock()
+        self.crc1 = CaseRunConfiguration(DummyTestCase('testcase 1'), {}, [])
+        self.crc2 = CaseRunConfiguration(DummyTestCase('testcase 2'), {}, [])
+        self.workflow1 = DummyWorkflow(self.testruns)
+        self.workflow2 = DummyWorkflow(self.testruns)
+        self.testruns.workflows = {
+            id(self.workflow1): (self.workflow1, [self.crc1]),
+            id(self.workflow2): (self.workflow2, [self.crc2]),
+        }
+
+    def test_wait_in_finish_order(self):
+        self.workflow1.start()
+        self.workflow2.start()
+        self.testruns.processFinishedWorkflow.side_effect = lambda workflow, caseruns: self.workflow1.release.set()
+        self.workflow2.release.set()
+        self.assertTrue(TestRuns.wait(self.testruns))
+        self.assertEqual(self.testruns.processFinishedWorkflow.call_args_list, [
+            unittest.mock.call(self.workflow2, [self.crc2]),
+            unittest.mock.call(self.workflow1, [self.crc1]),
+        ])
+
+    @unittest.mock.patch('libpermian.testruns.WORKFLOW_CHECK_INTERVAL', new=0.01)
+    def test_wait_without_notification(self):
+        # workflows which don't notify are picked up as well once they end
+        self.workflow1.run = lambda: None
+        self.workflow2.run = lambda: None
+        self.workflow1.start()
+        self.workflow2.start()
+        self.assertTrue(TestRuns.wait(self.testruns))
+        self.assertEqual(self.testruns.processFinishedWorkflow.call_count, 2)
+
+    @unittest.mock.patch('libpermian.testruns.WORKFLOW_CHECK_INTERVAL', new=0.01)
+    def test_wait_for_scheduled(self):
+        # workflow waiting for resources is not considered finished
+        self.workflow1.release.set()
+        self.workflow1.start()
+        self.testruns.processFinishedWorkflow.side_effect = lambda workflow, caseruns: (
+            self.workflow2.start() if workflow is self.workflow1 else None
+        )
+        self.workflow2.release.set()
+        self.assertTrue(TestRuns.wait(self.testruns))
+        self.assertEqual(self.testruns.processFinishedWorkflow.call_args_list, [
+            unittest.mock.call(self.workflow1, [self.crc1]),
+            unittest.mock.call(self.workflow2, [self.crc2]),
+        ])
+        self.assertEqual(self.testruns.workflowScheduler.release.call_count, 2)
+
+    @unittest.mock.patch('libpermian.hooks.builtin.workflow_finished')
+    def test_processFinishedWorkflow(self, workflow_finished):
+        self.crc1.updateResult(Result('complete', 'PASS', True))
+        self.crc2.updateResult(Result('running'))
+        self.workflow1.release.set()
+        self.workflow1.start()
+        TestRuns.processFinishedWorkflow(self.testruns, self.workflow1, [self.crc1, self.crc2])
+        self.testruns.update.assert_called_once()
+        dnf, = self.testruns.update.call_args.args
+        self.assertEqual(dnf.id, self.crc2.id)
+        self.assertEqual(dnf.result, Result('DNF', 'ERROR', True))
+        # the result is changed by the update only
+        self.assertEqual(self.crc2.result.state, 'running')
+        workflow_finished.assert_called_once_with(self.workflow1)
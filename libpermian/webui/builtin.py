@@ -55,6 +55,31 @@ def pipeline_data():
 
     return jsonify(caseRuns)
 
+@main.route('/facets')
+def facets():
+    """ Provides counts of states and results of caseRunConfigurations
+    selected by optional testplan and workflow filters
+
+    :return: json data
+    :rtype: flask.Response
+    """
+    pipeline = currentPipeline()
+
+    if not pipeline.testRuns:
+        return jsonify({})
+
+    columns = pipeline.testRuns.resultColumns
+    mask = None
+    for name, masks in (('testplan', columns.testplanMasks), ('workflow', columns.workflowTypeMasks)):
+        value = request.args.get(name)
+        if value:
+            selected = masks().get(value, 0)
+            mask = selected if mask is None else mask & selected
+    counts = columns.counts(mask)
+    # None result is not valid json key
+    counts['results'] = { str(result): count for result, count in counts['results'].items() }
+    return jsonify(counts)
+
 @main.route('/logs/<crcid>/<path:name>')
 def logs(crcid, name):
     pipeline = currentPipeline()
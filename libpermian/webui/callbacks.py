@@ -2,10 +2,10 @@ import logging
 import requests
 import time
 import json
-import requests
 import libxml2
 from os import path, mkdir, makedirs
 
+from ..httpclient import client
 from ..hooks.builtin import pipeline_ended
 from ..hooks.register import run_on, run_threaded_on
 from . import hooks
@@ -65,6 +65,7 @@ def render_static(pipeline):
     LOGGER.info('Generating static WebUI')
 
     webui_url = pipeline.webUI.baseurl
+    httpClient = client(pipeline.settings)
     webui_path = pipeline.settings.get('WebUI', 'static_webui_dir')
     local_logs_dir = path.join(webui_path, 'local_logs')
     static_dir = path.join(webui_path, 'static')
@@ -78,13 +79,13 @@ def render_static(pipeline):
         makedirs(local_logs_dir)
 
     # Modify pipeline data
-    response = requests.get(webui_url + 'pipeline_data')
+    response = httpClient.get(webui_url + 'pipeline_data')
     pipline_data = json.loads(response.text)
     for crc in pipline_data:
         # Download local and resolve external logs
         new_logs = dict()
         for log in crc['logs']:
-            r = requests.get(
+            r = httpClient.get(
                 f'{webui_url}logs/{crc["id"]}/{log}',
                 allow_redirects=False,
             )
@@ -118,12 +119,12 @@ def render_static(pipeline):
 
     def download_static(static_path):
         # Download static files
-        r = requests.get(webui_url + static_path.lstrip('/'))
+        r = httpClient.get(webui_url + static_path.lstrip('/'))
         with open(path.join(static_dir, r.url.split('/')[-1]), 'w') as fo:
             fo.write(r.text)
 
     # Modify WebUI page
-    response = requests.get(webui_url)
+    response = httpClient.get(webui_url)
     doc = libxml2.parseDoc(response.text)
     for elem in doc.xpathEval('/html/head/*[@href or @src]'):
         href = elem.prop('href')
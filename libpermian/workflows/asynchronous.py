@@ -0,0 +1,184 @@
+import abc
+import asyncio
+import concurrent.futures
+import logging
+import threading
+
+from ..exception_dump import dump_exception
+from ..result import Result
+from .grouped import GroupedWorkflow
+from .isolated import IsolatedWorkflow
+
+try:
+    _current_task = asyncio.current_task
+except AttributeError:
+    # Python < 3.7
+    _current_task = asyncio.Task.current_task # pylint: disable=no-member
+
+LOGGER = logging.getLogger(__name__)
+
+
+class WorkflowEventLoop():
+    """
+    Event loop running in its own thread which executes all asynchronous
+    workflows of TestRuns, see AsyncGroupedWorkflow. The thread is started
+    when the first coroutine is submitted.
+    """
+    def __init__(self):
+        self.loop = None
+        self.thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def ident(self):
+        return None if self.thread is None else self.thread.ident
+
+    def _start(self):
+        with self._lock:
+            if self.thread is not None:
+                return
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(target=self._run, name='workflow-event-loop', daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def submit(self, coroutine):
+        """
+        Schedule the coroutine in the event loop, this can be called from any
+        thread.
+
+        :return: Future of the coroutine result
+        :rtype: concurrent.futures.Future
+        """
+        self._start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self):
+        """Stop the event loop once the currently running callbacks finish"""
+        with self._lock:
+            if self.thread is None:
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.thread = None
+
+
+class AsyncGroupedWorkflow(GroupedWorkflow):
+    """
+    Variant of GroupedWorkflow which setup, execute, dry_execute and teardown
+    methods are coroutines. Instead of running in its own thread, the
+    workflow is executed as a task in event loop shared by all asynchronous
+    workflows of TestRuns (TestRuns.workflowEventLoop), which scales to
+    thousands of workflows waiting for subprocesses or network.
+
+    The workflow still provides the start, is_alive and join methods of
+    threading.Thread and all the reporting and logging methods of
+    GroupedWorkflow, which can be called from the coroutines as they don't
+    block.
+
+    Coroutines of the workflow must not block the event loop, use asyncio
+    subprocesses and streams or runBlocking for blocking calls.
+    groupTerminate and groupDisplayStatus are still called from other
+    threads, use cancelExecution or loop.call_soon_threadsafe to interact
+    with the running workflow.
+    """
+    def __init__(self, testRuns, crcList):
+        super().__init__(testRuns, crcList)
+        self.future = None
+        """Future of the workflow task once the workflow is started"""
+        self.task = None
+        """asyncio task executing the workflow once it's running"""
+
+    def start(self):
+        if self.future is not None:
+            raise RuntimeError('workflow can be started only once')
+        self.future = self.testRuns.workflowEventLoop.submit(self.run())
+
+    def is_alive(self):
+        return self.future is not None and not self.future.done()
+
+    def join(self, timeout=None):
+        if self.future is not None:
+            concurrent.futures.wait([self.future], timeout)
+
+    @property
+    def ident(self):
+        if self.future is None:
+            return None
+        return self.testRuns.workflowEventLoop.ident
+
+    def cancelExecution(self):
+        """
+        Cancel the workflow task, CancelledError is raised in the currently
+        awaited coroutine of the workflow. The teardown is still executed.
+        This can be called from any thread.
+
+        :return: True if the task was canceled
+        :rtype: bool
+        """
+        if self.future is None:
+            return False
+        if self.task is None:
+            # not running yet
+            return self.future.cancel()
+        self.testRuns.workflowEventLoop.loop.call_soon_threadsafe(self.task.cancel)
+        return True
+
+    async def runBlocking(self, func, *args):
+        """Run blocking func in the event loop executor and wait for its return value"""
+        return await asyncio.get_event_loop().run_in_executor(None, func, *args)
+
+    async def run(self):
+        """
+        Asynchronous variant of GroupedWorkflow.run executing setup, execute
+        (or dry_execute) and teardown coroutines in sequence.
+        """
+        self.task = _current_task()
+        try:
+            await self.setup()
+            await (self.execute() if not self.dryRun else self.dry_execute())
+        except self.silent_exceptions as e:
+            self.groupLog(f'Workflow raised silent exception: {e}')
+            self.groupReportResult(self.crcList, Result('DNF', 'ERROR', True))
+        except Exception as e:
+            self.exceptions.append(dump_exception(e, self))
+            self.groupReportResult(self.crcList, Result('DNF', 'ERROR', True))
+            # reraise the exception so that it's exposed for unit tests
+            raise
+        finally:
+            try:
+                await self.teardown()
+            except Exception as e:
+                self.exceptions.append(dump_exception(e, self))
+                # reraise the exception so that it's exposed for unit tests
+                raise
+            finally:
+                self.testRuns.workflowFinished(self)
+
+    async def setup(self):
+        pass
+
+    @abc.abstractmethod
+    async def execute(self):
+        pass
+
+    async def dry_execute(self):
+        pass
+
+    async def teardown(self):
+        pass
+
+
+class AsyncIsolatedWorkflow(AsyncGroupedWorkflow, IsolatedWorkflow):
+    """
+    Variant of IsolatedWorkflow executed in the event loop, see
+    AsyncGroupedWorkflow. The processBackend is not available for
+    asynchronous workflows.
+    """
+    processBackend = False
@@ -17,6 +17,12 @@ class GroupedWorkflow(threading.Thread, metaclass=abc.ABCMeta):
     which should handle creation of the workflow instances.
     """
     silent_exceptions = tuple()
+    resources = tuple()
+    """
+    Names of resources needed by the workflow during its whole execution. The
+    workflow is not started until all of them are available, see
+    WorkflowScheduler.
+    """
 
     @classmethod
     @abc.abstractmethod
@@ -57,6 +63,9 @@ class GroupedWorkflow(threading.Thread, metaclass=abc.ABCMeta):
         separate thread once the workflow.start method is invoked. For more
         information see Threading.Thread.start.
 
+        When the execution ends, the testRuns is notified that the workflow
+        has finished.
+
         :return: None
         :rtype: None
         """
@@ -78,6 +87,8 @@ class GroupedWorkflow(threading.Thread, metaclass=abc.ABCMeta):
                 self.exceptions.append(dump_exception(e, self))
                 # reraise the exception so that it's exposed for unit tests
                 raise
+            finally:
+                self.testRuns.workflowFinished(self)
 
     def setup(self):
         """
@@ -144,7 +155,8 @@ class GroupedWorkflow(threading.Thread, metaclass=abc.ABCMeta):
         self.groupLog(f'Changing state to: "{result.state}" with result: "{result.result}"', crcList=crcList)
         for crc in crcList:
             crc.updateResult(result)
-            self.testRuns.update(crc)
+        # report all the updates at once, so that the ReportSenders get them in one batch
+        self.testRuns.update(*crcList)
 
     @abc.abstractmethod
     def groupDisplayStatus(self, crcId):
@@ -215,7 +227,13 @@ class GroupedWorkflow(threading.Thread, metaclass=abc.ABCMeta):
         message = self.formatLogMessage(message)
         if crcList is None:
             crcList = self.crcList
+        # crcs may share the logfile, write the message only once to each of them
+        logfiles = {}
         for crc in crcList:
-            with crc.openLogfile(name, 'a', True, filename=f"{name}.txt") as fo:
+            logfiles.setdefault(crc.logPath(name, filename=f"{name}.txt"), []).append(crc)
+        for log_path, crcs in logfiles.items():
+            with crcs[0].openLogfile(name, 'a', True, filename=f"{name}.txt") as fo:
                 fo.write(message)
                 fo.write("\n")
+            for crc in crcs[1:]:
+                crc.addLog(name, log_path)
@@ -1,5 +1,6 @@
 import abc
 from .grouped import GroupedWorkflow
+from .process import WorkflowProcess
 
 class IsolatedWorkflow(GroupedWorkflow):
     """
@@ -13,6 +14,16 @@ class IsolatedWorkflow(GroupedWorkflow):
     Workflow instances should not be directly created, use the factory method
     which should handle creation of the workflow instances.
     """
+    processBackend = False
+    """
+    Execute the workflow in a child process instead of the workflow thread, see
+    WorkflowProcess. The workflow then also needs the process resource, which
+    limits number of such child processes. Note that the workflow in the child
+    process is a copy, changes of its attributes are not visible in the main
+    process and the other way around, terminate and displayStatus are called
+    on the copy.
+    """
+
     @classmethod
     def factory(cls, testRuns, crcList):
         """
@@ -35,6 +46,16 @@ class IsolatedWorkflow(GroupedWorkflow):
         assert len(crcList) == 1 # make sure that only one crc was actually passed
         self.crc = crcList[0]
         super().__init__(testRuns, crcList)
+        self.workflowProcess = None
+        """WorkflowProcess executing the workflow if processBackend is used"""
+        if self.processBackend:
+            self.resources = (*self.resources, 'process')
+
+    def run(self):
+        if not self.processBackend:
+            return super().run()
+        self.workflowProcess = WorkflowProcess(self)
+        self.workflowProcess.run(super().run)
 
     def _check_caseConfigurations(self, crcIds):
         """
@@ -56,6 +77,8 @@ class IsolatedWorkflow(GroupedWorkflow):
         :rtype: bool
         """
         self._check_caseConfigurations(crcIds)
+        if self.workflowProcess is not None and self.workflowProcess.running:
+            return bool(self.workflowProcess.request('terminate'))
         return self.terminate()
 
     @abc.abstractmethod
@@ -86,6 +109,10 @@ class IsolatedWorkflow(GroupedWorkflow):
         :rtype: str
         """
         self._check_caseConfigurations([crcId])
+        if self.workflowProcess is not None and self.workflowProcess.running:
+            status = self.workflowProcess.request('displayStatus')
+            if status is not None:
+                return status
         return self.displayStatus()
 
     @abc.abstractmethod
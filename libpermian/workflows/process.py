@@ -0,0 +1,279 @@
+import itertools
+import logging
+import multiprocessing
+import sys
+import threading
+import weakref
+
+from ..caserunconfiguration import CaseRunConfigurationsList
+from ..exception_dump import make_pickleable
+from ..exceptions import StateChangeError
+from ..result import Result
+
+LOGGER = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = 10
+"""Seconds to wait for reply of the workflow process to a request"""
+
+_SHARED_MODULE_LOCKS = (
+    # module, lock, registry of shared objects guarded by the lock
+    ('libpermian.httpclient', '_clientsLock', '_clients'),
+    ('libpermian.issueanalyzer.lookupcache', '_cachesLock', '_caches'),
+    ('libpermian.plugins.compose.metadata_cache', '_cachesLock', '_caches'),
+    ('libpermian.plugins.koji.client', '_clientsLock', '_clients'),
+    ('libpermian.plugins.bugzilla', '_API_SINGLETON_LOCK', None),
+)
+"""Module level locks used by threads of the parent process"""
+
+_SHARED_CLASS_LOCKS = (
+    # module, class, lock
+    ('libpermian.caserunconfiguration', 'CaseRunConfigurationsList', '_histogramLock'),
+    ('libpermian.events.structures.factory', 'EventStructuresFactory', '_graph_lock'),
+    ('libpermian.plugins.compose.compose_diff', 'ComposeDiff', '_component_names_lock'),
+)
+"""Class level locks used by threads of the parent process"""
+
+
+def _resetLocksAfterFork():
+    """
+    Replace locks which could have been held by other threads of the parent
+    process at the time of fork, the threads don't exist in the child process
+    so the locks would never be released.
+
+    Locks of the logging module and its handlers are recreated as well as the
+    locks listed in _SHARED_MODULE_LOCKS and _SHARED_CLASS_LOCKS. Registries
+    of shared objects (e.g. HTTP clients) are emptied so that the child
+    process creates its own objects instead of using connections and locks of
+    the parent process. Modules which were not imported are skipped.
+    """
+    logging._lock = threading.RLock()
+    for handlerRef in list(logging._handlerList):
+        handler = handlerRef()
+        if handler is not None:
+            handler.createLock()
+    for moduleName, lock, registry in _SHARED_MODULE_LOCKS:
+        module = sys.modules.get(moduleName)
+        if module is None:
+            continue
+        setattr(module, lock, threading.Lock())
+        if registry is not None:
+            setattr(module, registry, weakref.WeakKeyDictionary())
+    for moduleName, className, lock in _SHARED_CLASS_LOCKS:
+        module = sys.modules.get(moduleName)
+        if module is not None:
+            setattr(getattr(module, className), lock, threading.Lock())
+
+
+class WorkflowProcess():
+    """
+    Process backend of workflows. The workflow is executed in a child process
+    forked from the workflow thread, so that computation intensive work of the
+    workflow doesn't hold the GIL shared with other workflows, WebUI and
+    ReportSenders. The workflow thread stays in the parent process and relays
+    messages of the child process to the TestRuns.
+
+    The child process works with its own copy of the workflow. Result updates
+    and log registrations of the workflow are sent over a pipe to the parent
+    process where they're applied to the caseRunConfigurations and provided
+    to TestRuns. Terminate and display status requests are sent the other way
+    and are processed by the workflow copy in the child process.
+
+    The fork start method is used because the workflow (including its
+    TestRuns, event and caseRunConfigurations) is not pickleable, so it
+    couldn't be passed to a spawned process. Forking a multithreaded process
+    is hazardous as only the forking thread exists in the child process and
+    locks held by the other threads at the time of fork stay locked forever.
+    The child process therefore replaces the shared locks (see
+    _resetLocksAfterFork) and detaches caseRunConfigurations of the workflow
+    from the lists of the parent process (e.g. of TestRuns or ReportSenders)
+    whose result histograms are locked by the other threads, the workflow
+    gets its own list instead. Locks of other objects shared with the other
+    threads (e.g. locks guarding conversion of event structures) are not
+    replaced, the workflow should prefer the objects it owns in the child
+    process.
+
+    :param workflow: Workflow executed by this backend
+    :type workflow: IsolatedWorkflow
+    """
+    context = multiprocessing.get_context('fork')
+
+    def __init__(self, workflow):
+        self.workflow = workflow
+        self.connection, self.childConnection = self.context.Pipe()
+        self.process = None
+        self._sendLock = threading.Lock()
+        self._requestIds = itertools.count()
+        self._replies = {}
+        """Mapping of request id -> [threading.Event, reply] of pending requests"""
+
+    @property
+    def running(self):
+        return self.process is not None and self.process.is_alive()
+
+    def send(self, *message):
+        with self._sendLock:
+            self.connection.send(message)
+
+    def run(self, target):
+        """
+        Run the target in the child process and relay its messages until the
+        child process ends. This is called from the workflow thread.
+
+        :param target: Run method of the workflow executed in the child process
+        :type target: callable
+        """
+        self.process = self.context.Process(
+            target=self._runChild,
+            args=(target,),
+            name=f'{self.workflow.name}-process',
+            daemon=True,
+        )
+        self.process.start()
+        self.childConnection.close()
+        try:
+            while True:
+                try:
+                    message = self.connection.recv()
+                except EOFError:
+                    break
+                if not self.processMessage(*message):
+                    break
+        finally:
+            self.process.join()
+            self.connection.close()
+            for event, _ in list(self._replies.values()):
+                event.set()
+            self.workflow.testRuns.workflowFinished(self.workflow)
+
+    def processMessage(self, kind, *args):
+        """
+        Process message of the child process in the parent process.
+
+        :return: False if the child process finished
+        :rtype: bool
+        """
+        if kind == 'update':
+            crcs = []
+            for crcId, fields, extra_fields in args[0]:
+                crc = self.workflow.crcList[crcId]
+                try:
+                    crc.updateResult(Result(*fields, **extra_fields))
+                except StateChangeError as e:
+                    LOGGER.error('Cannot change state of result: %s', e)
+                    continue
+                crcs.append(crc)
+            self.workflow.testRuns.update(*crcs)
+        elif kind == 'log':
+            crcId, name, log_path = args
+            self.workflow.crcList[crcId].addLog(name, log_path)
+        elif kind == 'reply':
+            requestId, reply = args
+            try:
+                self._replies[requestId][1] = reply
+                self._replies[requestId][0].set()
+            except KeyError:
+                pass
+        elif kind == 'finished':
+            self.workflow.exceptions.extend(args[0])
+            return False
+        else:
+            LOGGER.error('Unknown message from workflow process %s: %s', self.workflow, kind)
+        return True
+
+    def request(self, method, *args):
+        """
+        Call method of the workflow in the child process and wait for its
+        reply.
+
+        :param method: Name of the workflow method
+        :type method: str
+        :return: Value returned by the method or None if the child process is not running or doesn't reply in time
+        """
+        if not self.running or threading.current_thread() is self.workflow:
+            # the replies are received by the workflow thread, so it can't
+            # wait for them
+            return None
+        requestId = next(self._requestIds)
+        reply = self._replies[requestId] = [threading.Event(), None]
+        try:
+            self.send('request', requestId, method, args)
+            if not reply[0].wait(REQUEST_TIMEOUT):
+                LOGGER.warning('Workflow process %s did not reply to %s request', self.workflow, method)
+            return reply[1]
+        except (OSError, ValueError):
+            # the child process has ended in the meantime
+            return None
+        finally:
+            del self._replies[requestId]
+
+    def _runChild(self, target):
+        """Body of the child process"""
+        _resetLocksAfterFork()
+        self._sendLock = threading.Lock()
+        self.connection.close()
+        self.connection = self.childConnection
+        self.workflow.testRuns = _TestRunsProxy(self, self.workflow.testRuns)
+        for crc in self.workflow.crcList:
+            crc.detachLists()
+            crc.logs = _ForwardedLogs(self, crc.id, crc.logs)
+        self.workflow.crcList = CaseRunConfigurationsList(self.workflow.crcList)
+        if getattr(self.workflow, 'crc', None) is not None:
+            self.workflow.crc.detachLists()
+        threading.Thread(target=self._serveRequests, daemon=True).start()
+        try:
+            target()
+        except Exception:
+            # the exception is already recorded by the workflow
+            pass
+
+    def _serveRequests(self):
+        """Process requests of the parent process in the child process"""
+        while True:
+            try:
+                _, requestId, method, args = self.connection.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                reply = getattr(self.workflow, method)(*args)
+            except Exception:
+                LOGGER.exception('Workflow %s failed to process %s request', self.workflow, method)
+                reply = None
+            self.send('reply', requestId, reply)
+
+
+class _TestRunsProxy():
+    """
+    TestRuns used by the workflow in the child process, updates of results
+    and the end of the workflow are sent to the parent process.
+    """
+    def __init__(self, workflowProcess, testRuns):
+        self._workflowProcess = workflowProcess
+        self._testRuns = testRuns
+
+    def __getattr__(self, name):
+        return getattr(self._testRuns, name)
+
+    def update(self, *crcs):
+        self._workflowProcess.send('update', [
+            (
+                crc.id,
+                (crc.result.state, crc.result.result, crc.result.final, crc.result.dirty),
+                dict(crc.result.extra_fields),
+            )
+            for crc in crcs
+        ])
+
+    def workflowFinished(self, workflow):
+        self._workflowProcess.send('finished', [make_pickleable(e) for e in workflow.exceptions])
+
+
+class _ForwardedLogs(dict):
+    """Logs of caseRunConfiguration in the child process, new logs are registered in the parent process as well"""
+    def __init__(self, workflowProcess, crcId, logs):
+        super().__init__(logs)
+        self._workflowProcess = workflowProcess
+        self._crcId = crcId
+
+    def __setitem__(self, name, log_path):
+        super().__setitem__(name, log_path)
+        self._workflowProcess.send('log', self._crcId, name, log_path)
@@ -0,0 +1,195 @@
+import logging
+import threading
+import collections
+
+LOGGER = logging.getLogger(__name__)
+
+
+class WorkflowScheduler():
+    """
+    Starts workflows so that the number of running workflows needing the same
+    resource doesn't exceed limit of the resource class.
+
+    Workflows declare the resources they need in their resources attribute,
+    see GroupedWorkflow.resources. Resource is identified by name of its class
+    (e.g. 'vm', 'hypervisor', 'download' or 'cpu') optionally followed by
+    @ and name of the specific instance of the resource (e.g.
+    'hypervisor@localhost'). Limit of the resource class is read from the
+    workflowResources settings section and applies to each instance of the
+    resource separately, limit of the specific instance may be set using the
+    full name of the resource. Resources without limit or with limit 0 are not
+    limited. Total number of running workflows is limited by
+    max_running_workflows option in workflows section (0 means no limit).
+
+    Workflows are started in the order they were submitted, workflow waiting
+    for an exhausted resource doesn't block workflows which don't need it.
+    Resources are held by the workflow until it's released, which is done by
+    TestRuns once the workflow finishes.
+
+    Running workflows may also hold resources only for part of their
+    execution (e.g. while their VM is running) using acquire and
+    releaseResource, such resources are counted in the same way.
+
+    :param settings: Settings providing the limits
+    :type settings: Settings
+    """
+    def __init__(self, settings):
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        """Notified when any resource is released"""
+        self._limits = {}
+        """Cache of limits of resources, see limit"""
+        self._limitOverrides = {}
+        """Limits of resources set by setLimit"""
+        self._usage = collections.Counter()
+        """Number of running workflows holding the resource"""
+        self._pending = []
+        """Submitted workflows waiting for their resources in submission order"""
+        self._running = {}
+        """Mapping of id(workflow) to resources held by running workflows"""
+        self._submitted = set()
+        """ids of all workflows submitted to the scheduler"""
+        try:
+            self.maxRunning = self.settings.getint('workflows', 'max_running_workflows')
+        except KeyError:
+            self.maxRunning = 0
+
+    def limit(self, resource):
+        """
+        :param resource: Name of the resource, optionally followed by @ and name of the resource instance
+        :type resource: str
+        :return: Maximal number of running workflows which can hold the resource, 0 if not limited
+        :rtype: int
+        """
+        try:
+            return self._limits[resource]
+        except KeyError:
+            pass
+        limit = 0
+        for name in (resource, resource.split('@', 1)[0]):
+            try:
+                limit = self._limitOverrides[name]
+                break
+            except KeyError:
+                pass
+            try:
+                limit = self.settings.getint('workflowResources', name)
+                break
+            except KeyError:
+                continue
+        self._limits[resource] = limit
+        return limit
+
+    def setLimit(self, resource, limit):
+        """
+        Set limit of the resource class or resource instance overriding the
+        one from workflowResources settings section.
+
+        :param resource: Name of the resource class or instance
+        :type resource: str
+        :param limit: Maximal number of holders of the resource, 0 if not limited
+        :type limit: int
+        """
+        with self._lock:
+            self._limitOverrides[resource] = limit
+            self._limits = {}
+            self._dispatch()
+            self._released.notify_all()
+
+    def acquire(self, resource, timeout=None):
+        """
+        Wait until the resource is available and hold it until it's released
+        by releaseResource. This is meant to be used by running workflows
+        needing the resource only for part of their execution.
+
+        :param resource: Name of the resource, optionally followed by @ and name of the resource instance
+        :type resource: str
+        :param timeout: Maximal number of seconds to wait, None = no limit
+        :type timeout: float, optional
+        :return: True if the resource was acquired, False on timeout
+        :rtype: bool
+        """
+        with self._lock:
+            if not self._released.wait_for(lambda: self._available((resource,)), timeout):
+                return False
+            self._usage[resource] += 1
+            return True
+
+    def releaseResource(self, resource):
+        """
+        Release resource acquired by acquire and start workflows waiting for
+        it.
+
+        :param resource: Name of the resource
+        :type resource: str
+        """
+        with self._lock:
+            self._usage[resource] -= 1
+            self._dispatch()
+            self._released.notify_all()
+
+    def submit(self, workflow):
+        """
+        Start the workflow as soon as the resources it needs are available.
+        Submitting the same workflow again has no effect.
+
+        :param workflow: Workflow which is not started yet
+        :type workflow: GroupedWorkflow
+        """
+        with self._lock:
+            if id(workflow) in self._submitted:
+                return
+            self._submitted.add(id(workflow))
+            self._pending.append(workflow)
+            self._dispatch()
+
+    def release(self, workflow):
+        """
+        Release resources held by the finished workflow and start workflows
+        waiting for them. Releasing workflow which doesn't hold any resources
+        (e.g. already released one) has no effect.
+
+        :param workflow: Finished workflow
+        :type workflow: GroupedWorkflow
+        """
+        with self._lock:
+            try:
+                resources = self._running.pop(id(workflow))
+            except KeyError:
+                return
+            self._usage.subtract(resources)
+            self._dispatch()
+            self._released.notify_all()
+
+    @property
+    def pending(self):
+        """Workflows waiting for their resources"""
+        with self._lock:
+            return list(self._pending)
+
+    @property
+    def usage(self):
+        """Mapping of resources to number of running workflows holding them"""
+        with self._lock:
+            return { resource:count for resource, count in self._usage.items() if count }
+
+    def _available(self, resources):
+        return all(
+            not self.limit(resource) or self._usage[resource] < self.limit(resource)
+            for resource in resources
+        )
+
+    def _dispatch(self):
+        """Start pending workflows whose resources are available, called with the lock held"""
+        waiting = []
+        for workflow in self._pending:
+            resources = set(workflow.resources)
+            if (self.maxRunning and len(self._running) >= self.maxRunning) or not self._available(resources):
+                waiting.append(workflow)
+                continue
+            self._running[id(workflow)] = resources
+            self._usage.update(resources)
+            LOGGER.debug('Starting workflow %s holding resources %s', workflow, resources)
+            workflow.start()
+        self._pending = waiting
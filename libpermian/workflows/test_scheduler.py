@@ -0,0 +1,122 @@
+import threading
+import unittest
+
+from libpermian.settings import Settings
+from libpermian.workflows.scheduler import WorkflowScheduler
+
+
+class DummyWorkflow():
+    def __init__(self, *resources):
+        self.resources = resources
+        self.started = False
+
+    def start(self):
+        self.started = True
+
+
+def make_scheduler(resources=None, max_running=0):
+    settings = Settings(
+        cmdline_overrides={
+            'workflows': {'max_running_workflows': str(max_running)},
+            'workflowResources': resources or {},
+        },
+        environment={},
+        settings_locations=[],
+    )
+    return WorkflowScheduler(settings)
+
+
+class TestWorkflowScheduler(unittest.TestCase):
+    def test_unlimited(self):
+        scheduler = make_scheduler()
+        workflows = [DummyWorkflow('slot') for _ in range(10)]
+        for workflow in workflows:
+            scheduler.submit(workflow)
+        self.assertTrue(all(workflow.started for workflow in workflows))
+        self.assertEqual(scheduler.usage, {'slot': 10})
+
+    def test_resource_limit(self):
+        scheduler = make_scheduler({'slot': '2'})
+        workflows = [DummyWorkflow('slot') for _ in range(3)]
+        for workflow in workflows:
+            scheduler.submit(workflow)
+        self.assertEqual([workflow.started for workflow in workflows], [True, True, False])
+        self.assertEqual(scheduler.pending, [workflows[2]])
+        scheduler.release(workflows[0])
+        self.assertTrue(workflows[2].started)
+        self.assertEqual(scheduler.usage, {'slot': 2})
+
+    def test_waiting_workflow_does_not_block_others(self):
+        scheduler = make_scheduler({'slot': '1'})
+        slot1, slot2, disk = DummyWorkflow('slot'), DummyWorkflow('slot', 'disk'), DummyWorkflow('disk')
+        for workflow in (slot1, slot2, disk):
+            scheduler.submit(workflow)
+        self.assertFalse(slot2.started)
+        self.assertTrue(disk.started)
+
+    def test_resource_instances(self):
+        scheduler = make_scheduler({'host': '1', 'host@big': '2'})
+        workflows = [
+            DummyWorkflow('host@small'), DummyWorkflow('host@small'),
+            DummyWorkflow('host@big'), DummyWorkflow('host@big'),
+            DummyWorkflow('host@other'),
+        ]
+        for workflow in workflows:
+            scheduler.submit(workflow)
+        self.assertEqual([workflow.started for workflow in workflows], [True, False, True, True, True])
+        self.assertEqual(scheduler.limit('host@small'), 1)
+        self.assertEqual(scheduler.limit('host@big'), 2)
+        self.assertEqual(scheduler.limit('unknown'), 0)
+
+    def test_max_running(self):
+        scheduler = make_scheduler(max_running=1)
+        workflow1, workflow2 = DummyWorkflow(), DummyWorkflow()
+        scheduler.submit(workflow1)
+        scheduler.submit(workflow2)
+        self.assertFalse(workflow2.started)
+        scheduler.release(workflow1)
+        self.assertTrue(workflow2.started)
+
+    def test_submit_and_release_once(self):
+        scheduler = make_scheduler({'slot': '1'})
+        workflow1, workflow2 = DummyWorkflow('slot'), DummyWorkflow('slot')
+        scheduler.submit(workflow1)
+        scheduler.submit(workflow1)
+        scheduler.submit(workflow2)
+        scheduler.release(workflow1)
+        scheduler.release(workflow1)
+        scheduler.release(workflow2)
+        self.assertEqual(scheduler.usage, {})
+        self.assertEqual(scheduler.pending, [])
+
+    def test_acquire_release_resource(self):
+        scheduler = make_scheduler({'vm': '1'})
+        self.assertTrue(scheduler.acquire('vm@host'))
+        self.assertFalse(scheduler.acquire('vm@host', timeout=0.01))
+        self.assertTrue(scheduler.acquire('vm@other', timeout=0.01))
+        # workflows needing the resource wait as well
+        workflow = DummyWorkflow('vm@host')
+        scheduler.submit(workflow)
+        self.assertFalse(workflow.started)
+        scheduler.releaseResource('vm@host')
+        self.assertTrue(workflow.started)
+        self.assertEqual(scheduler.usage, {'vm@host': 1, 'vm@other': 1})
+
+    def test_acquire_waits_for_release(self):
+        scheduler = make_scheduler({'vm': '1'})
+        scheduler.acquire('vm')
+        acquired = []
+        thread = threading.Thread(target=lambda: acquired.append(scheduler.acquire('vm', timeout=10)))
+        thread.start()
+        self.assertFalse(acquired)
+        scheduler.releaseResource('vm')
+        thread.join(10)
+        self.assertEqual(acquired, [True])
+
+    def test_set_limit(self):
+        scheduler = make_scheduler({'vm': '1'})
+        scheduler.setLimit('vm', 2)
+        self.assertEqual(scheduler.limit('vm@host'), 2)
+        self.assertTrue(scheduler.acquire('vm@host', timeout=0.01))
+        self.assertTrue(scheduler.acquire('vm@host', timeout=0.01))
+        self.assertFalse(scheduler.acquire('vm@host', timeout=0.01))
@@ -1,8 +1,15 @@
 import unittest
+import os
+import asyncio
+import tempfile
+import threading
+import time
+from libpermian import httpclient
 from libpermian.settings import Settings
 from libpermian.workflows.factory import WorkflowFactory
 from libpermian.workflows.grouped import GroupedWorkflow
 from libpermian.workflows.isolated import IsolatedWorkflow
+from libpermian.workflows.asynchronous import AsyncIsolatedWorkflow, WorkflowEventLoop
 from libpermian.workflows.builtin import UnknownWorkflow
 from libpermian.result import Result
 from libpermian.caserunconfiguration import CaseRunConfiguration, CaseRunConfigurationsList
@@ -91,3 +98,231 @@ class TestWorkflowExceptions(unittest.TestCase):
         with self.assertRaises(ZeroDivisionError):
             workflow.run()
         self.assertEqual(workflow.crcList[0].result, Result('DNF', 'ERROR', True))
+
+class GroupWorkflow(GroupedWorkflow):
+    def execute(self):
+        pass
+    def factory(self):
+        pass
+    def groupDisplayStatus(self):
+        pass
+    def groupTerminate(self):
+        pass
+
+class TestWorkflowGroupReporting(unittest.TestCase):
+    @unittest.mock.patch('libpermian.testruns.TestRuns', autospec=True)
+    def setUp(self, MockTestRuns):
+        self.logsdir = tempfile.TemporaryDirectory(prefix="testlogs_")
+        self.mock_testrun = MockTestRuns(None, None, None)
+        self.mock_testrun.settings = Settings({'workflows': {'local_logs_dir': self.logsdir.name}}, {}, [])
+        self.crc1 = CaseRunConfiguration(DummyTestCase(), {'conf': 1}, [])
+        self.crc2 = CaseRunConfiguration(DummyTestCase(), {'conf': 2}, [])
+        for crc in (self.crc1, self.crc2):
+            crc.testrun = self.mock_testrun
+        self.mock_testrun.caseRunConfigurations = CaseRunConfigurationsList([self.crc1, self.crc2])
+        self.mock_testrun.event = None
+        self.workflow = GroupWorkflow(self.mock_testrun, self.mock_testrun.caseRunConfigurations)
+
+    def tearDown(self):
+        self.logsdir.cleanup()
+
+    def test_groupReportResult_batch(self):
+        self.workflow.groupReportResult(self.workflow.crcList, Result('started'))
+        self.mock_testrun.update.assert_called_once_with(*self.workflow.crcList)
+        for crc in self.workflow.crcList:
+            self.assertEqual(crc.result, Result('started'))
+
+    def test_groupLog_separate_logfiles(self):
+        self.workflow.groupLog('message')
+        self.assertNotEqual(self.crc1.logs['workflow'], self.crc2.logs['workflow'])
+        for crc in (self.crc1, self.crc2):
+            with crc.openLogfile('workflow') as logfile:
+                self.assertIn('message', logfile.read())
+
+    def test_groupLog_shared_logfile(self):
+        shared_log = os.path.join(self.logsdir.name, 'shared.txt')
+        self.workflow.groupAddLog('workflow', shared_log)
+        self.workflow.groupLog('message')
+        with open(shared_log) as logfile:
+            self.assertEqual(logfile.read().count('message'), 1)
+
+class ProcessWorkflow(IsolatedWorkflow):
+    processBackend = True
+
+    def __init__(self, testRuns, crcList):
+        super().__init__(testRuns, crcList)
+        self.terminated = threading.Event()
+
+    def execute(self):
+        self.reportResult(Result('running', None, False, pid=os.getpid()))
+        self.log('message')
+        self.terminated.wait(10)
+        self.reportResult(Result('complete', 'PASS', True))
+
+    def terminate(self):
+        self.terminated.set()
+        return True
+
+    def displayStatus(self):
+        return f'Running in {os.getpid()}'
+
+class LockingProcessWorkflow(ProcessWorkflow):
+    def execute(self):
+        # the lock is held by the parent process while the child is forked
+        with httpclient._clientsLock:
+            self.log('message')
+        self.reportResult(Result('complete', 'PASS', True))
+
+class TestWorkflowProcess(unittest.TestCase):
+    @unittest.mock.patch('libpermian.testruns.TestRuns', autospec=True)
+    def setUp(self, MockTestRuns):
+        self.logsdir = tempfile.TemporaryDirectory(prefix="testlogs_")
+        self.mock_testrun = MockTestRuns(None, None, None)
+        self.mock_testrun.settings = Settings({'workflows': {'local_logs_dir': self.logsdir.name}}, {}, [])
+        self.crc = CaseRunConfiguration(DummyTestCase(), {}, [])
+        self.crc.testrun = self.mock_testrun
+        self.mock_testrun.caseRunConfigurations = CaseRunConfigurationsList([self.crc])
+        self.mock_testrun.event = None
+        self.workflow = ProcessWorkflow(self.mock_testrun, self.mock_testrun.caseRunConfigurations)
+
+    def tearDown(self):
+        self.logsdir.cleanup()
+
+    def test_resources(self):
+        self.assertIn('process', self.workflow.resources)
+
+    def test_run_in_process(self):
+        self.workflow.start()
+        # terminate the workflow once it reports its start
+        self.mock_testrun.update.side_effect = lambda *crcs: threading.Thread(
+            target=self.workflow.groupTerminate, args=([self.crc.id],)
+        ).start()
+        self.workflow.join(10)
+        self.assertFalse(self.workflow.is_alive())
+        crc = self.workflow.crcList[0]
+        self.assertEqual(crc.result, Result('complete', 'PASS', True))
+        self.assertNotEqual(crc.result.extra_fields['pid'], os.getpid())
+        self.assertEqual(self.mock_testrun.update.call_count, 2)
+        self.mock_testrun.workflowFinished.assert_called_once_with(self.workflow)
+        # log registered in the child process is known to the parent process
+        with self.crc.openLogfile('workflow') as logfile:
+            self.assertIn('message', logfile.read())
+        self.assertEqual(self.workflow.exceptions, [])
+
+    def test_display_status(self):
+        self.assertEqual(self.workflow.groupDisplayStatus(self.crc.id), f'Running in {os.getpid()}')
+        self.workflow.start()
+        try:
+            # wait for the workflow to report its start from the child process
+            for _ in range(100):
+                if self.mock_testrun.update.called:
+                    break
+                self.workflow.join(0.1)
+            self.assertNotEqual(self.workflow.groupDisplayStatus(self.crc.id), f'Running in {os.getpid()}')
+        finally:
+            self.workflow.groupTerminate([self.crc.id])
+            self.workflow.join(10)
+
+    def test_locks_reset_in_child(self):
+        workflow = LockingProcessWorkflow(self.mock_testrun, self.mock_testrun.caseRunConfigurations)
+        with httpclient._clientsLock:
+            workflow.start()
+            workflow.join(10)
+        if workflow.is_alive():
+            # the child process is deadlocked
+            workflow.workflowProcess.process.terminate()
+            workflow.join(10)
+            self.fail('Workflow process did not finish')
+        self.assertEqual(workflow.crcList[0].result, Result('complete', 'PASS', True))
+
+    def test_crcs_detached_in_child(self):
+        workflow = LockingProcessWorkflow(self.mock_testrun, self.mock_testrun.caseRunConfigurations)
+        # other list of the parent process counting results of the workflow
+        crcList = CaseRunConfigurationsList(workflow.crcList)
+        self.assertEqual(crcList.status, 'not started')
+        # the histogram is locked by other thread of the parent process until
+        # the child process finishes
+        with crcList.histogram._lock:
+            workflow.start()
+            for _ in range(100):
+                process = getattr(workflow.workflowProcess, 'process', None)
+                if process is not None and process.pid is not None:
+                    break
+                time.sleep(0.1)
+            process.join(10)
+            deadlocked = process.is_alive()
+            if deadlocked:
+                process.terminate()
+        workflow.join(10)
+        self.assertFalse(deadlocked)
+        # the histogram is updated by the parent process
+        self.assertEqual(crcList.status, 'complete')
+
+class AsyncWorkflow(AsyncIsolatedWorkflow):
+    async def execute(self):
+        self.reportResult(Result('running'))
+        self.log('message')
+        await asyncio.sleep(0.01)
+        self.reportResult(Result('complete', 'PASS', True))
+
+    def terminate(self):
+        return self.cancelExecution()
+
+    def displayStatus(self):
+        return 'Test'
+
+class SleepingAsyncWorkflow(AsyncWorkflow):
+    async def execute(self):
+        self.reportResult(Result('running'))
+        await asyncio.sleep(10)
+
+    async def teardown(self):
+        self.log('teardown')
+
+class TestAsyncWorkflow(unittest.TestCase):
+    @unittest.mock.patch('libpermian.testruns.TestRuns', autospec=True)
+    def setUp(self, MockTestRuns):
+        self.logsdir = tempfile.TemporaryDirectory(prefix="testlogs_")
+        self.mock_testrun = MockTestRuns(None, None, None)
+        self.mock_testrun.settings = Settings({'workflows': {'local_logs_dir': self.logsdir.name}}, {}, [])
+        self.mock_testrun.workflowEventLoop = WorkflowEventLoop()
+        self.mock_testrun.event = None
+        self.crcs = [CaseRunConfiguration(DummyTestCase(), {'conf': i}, []) for i in range(50)]
+        for crc in self.crcs:
+            crc.testrun = self.mock_testrun
+        self.mock_testrun.caseRunConfigurations = CaseRunConfigurationsList(self.crcs)
+
+    def tearDown(self):
+        self.mock_testrun.workflowEventLoop.stop()
+        self.logsdir.cleanup()
+
+    def test_run_in_event_loop(self):
+        threads = threading.active_count()
+        AsyncWorkflow.factory(self.mock_testrun, self.mock_testrun.caseRunConfigurations)
+        workflows = [crc.workflow for crc in self.crcs]
+        self.assertFalse(any(workflow.is_alive() for workflow in workflows))
+        for workflow in workflows:
+            workflow.start()
+        # all the workflows share one thread
+        self.assertLessEqual(threading.active_count(), threads + 1)
+        for workflow in workflows:
+            workflow.join(10)
+            self.assertFalse(workflow.is_alive())
+            self.assertIsNotNone(workflow.ident)
+            self.assertEqual(workflow.crcList[0].result, Result('complete', 'PASS', True))
+            self.assertIsNotNone(workflow.crc.logs.get('workflow'))
+        self.assertEqual(self.mock_testrun.update.call_count, 100)
+        self.assertEqual(self.mock_testrun.workflowFinished.call_count, 50)
+
+    def test_terminate(self):
+        SleepingAsyncWorkflow.factory(self.mock_testrun, CaseRunConfigurationsList(self.crcs[:1]))
+        workflow = self.crcs[0].workflow
+        workflow.start()
+        while not self.mock_testrun.update.called:
+            workflow.join(0.01)
+        self.assertTrue(workflow.groupTerminate([self.crcs[0].id]))
+        workflow.join(10)
+        self.assertFalse(workflow.is_alive())
+        with self.crcs[0].openLogfile('workflow') as logfile:
+            self.assertIn('teardown', logfile.read())
+        self.mock_testrun.workflowFinished.assert_called_once_with(workflow)
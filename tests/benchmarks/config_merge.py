@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Measure merging of testplan configurations with testcase configurations.
+
+The benchmark creates matrix testplan configurations (architecture x variant
+x storage x locale) and merges them with configurations of synthetic
+testcases the same way the event does. The indexed ConfigurationsList.merge
+is compared with merge comparing each pair of configurations and both must
+provide the same configurations.
+
+Run from the repository root directory::
+
+    ./tests/benchmarks/config_merge.py [number of testcases]
+"""
+
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from libpermian.caserunconfiguration import ConfigurationsList
+
+
+ARCHES = ('x86_64', 'aarch64', 'ppc64le', 's390x')
+VARIANTS = ('BaseOS', 'AppStream', 'Server')
+STORAGES = ('lvm', 'btrfs', 'xfs', 'ext4')
+LOCALES = ('en_US', 'cs_CZ', 'de_DE', 'ja_JP', 'fr_FR')
+
+
+def make_testplan_configurations():
+    return [
+        {'arch': arch, 'variant': variant, 'storage': storage, 'locale': locale}
+        for arch, variant, storage, locale
+        in itertools.product(ARCHES, VARIANTS, STORAGES, LOCALES)
+    ]
+
+
+def make_testcase_configurations(count):
+    shapes = (
+        lambda i: [{'arch': arch} for arch in ARCHES],
+        lambda i: [{'arch': ARCHES[i % 4], 'variant': VARIANTS[i % 3]}],
+        lambda i: [{'storage': STORAGES[i % 4], 'firmware': firmware} for firmware in ('bios', 'uefi')],
+        lambda i: [{'arch': arch, 'locale': LOCALES[i % 5], 'storage': STORAGES[i % 4], 'variant': VARIANTS[i % 3]} for arch in ARCHES],
+        lambda i: None,
+    )
+    return [shapes[i % len(shapes)](i) for i in range(count)]
+
+
+def nested_merge(configurations, other):
+    if other is None:
+        other = [{}]
+    return [
+        config.merge(other_config)
+        for config in configurations
+        for other_config in other
+        if config.compatible_with(other_config)
+    ]
+
+
+def measure(merge, configurations, testcases):
+    start = time.perf_counter()
+    merged = [merge(configurations, testcase) for testcase in testcases]
+    return time.perf_counter() - start, merged
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    testplan_configurations = make_testplan_configurations()
+    testcases = make_testcase_configurations(count)
+    print(f'testplan configurations: {len(testplan_configurations)}, testcases: {count}')
+    for merge_method in ('extension', 'intersection'):
+        configurations = ConfigurationsList(testplan_configurations, merge_method)
+        nested_time, nested = measure(nested_merge, configurations, testcases)
+        indexed_time, indexed = measure(ConfigurationsList.merge, configurations, testcases)
+        if nested != indexed:
+            raise RuntimeError(f'Indexed merge differs from nested merge for {merge_method}')
+        merged = sum(len(configs) for configs in indexed)
+        print(f'{merge_method}: {merged} merged configurations, nested loop: {nested_time:.3f}s, indexed: {indexed_time:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""
+Measure memory used by CaseRunConfiguration instances.
+
+The benchmark creates caseRunConfigurations the same way the event does,
+simulates result updates (which make copies of the caseRunConfigurations as
+TestRuns.update does) and reports number of bytes retained per
+caseRunConfiguration once the copies are no longer referenced.
+
+Run from the repository root directory::
+
+    ./tests/benchmarks/crc_memory.py [number of caseRunConfigurations]
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+
+from libpermian.caserunconfiguration import CaseRunConfiguration, CaseRunConfigurationsList
+from libpermian.result import Result
+
+
+class DummyTestCase():
+    def __init__(self, name):
+        self.name = name
+        self.id = name
+
+
+class DummyTestPlan():
+    def __init__(self, name):
+        self.name = name
+        self.id = name
+
+
+def make_crcs(count, testplans):
+    testcases = [DummyTestCase(f'testcase {i}') for i in range(count // 4)]
+    crcList = CaseRunConfigurationsList()
+    for testcase in testcases:
+        for arch in ('x86_64', 'aarch64', 'ppc64le', 's390x'):
+            crcList.append(CaseRunConfiguration(testcase, {'architecture': arch}, testplans))
+    return testcases, crcList
+
+
+def simulate_updates(crcList):
+    for state in ('queued', 'started', 'running', 'complete'):
+        for crc in crcList:
+            update = crc.copy()
+            update.updateResult(Result(state, 'PASS' if state == 'complete' else None, state == 'complete'))
+            crcList[update.id].updateResult(update.result).readOnlyCopy().id
+
+
+def measure(count):
+    testplans = [DummyTestPlan(f'testplan {i}') for i in range(3)]
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    testcases, crcList = make_crcs(count, testplans)
+    gc.collect()
+    created = tracemalloc.get_traced_memory()[0] - baseline
+    simulate_updates(crcList)
+    del testcases
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return len(crcList), created, retained
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    crcs, created, retained = measure(count)
+    print(f'caseRunConfigurations: {crcs}')
+    print(f'bytes per crc after creation: {created / crcs:.0f}')
+    print(f'bytes per crc after updates: {retained / crcs:.0f}')
+
+
+if __name__ == '__main__':
+    main()